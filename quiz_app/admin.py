@@ -3,10 +3,87 @@ Admin configuration for the Quiz application.
 
 This module registers the quiz application models with Django's admin site
 and customizes their admin interfaces for better usability.
+
+Every changelist fetches the related rows it displays with its own query
+(select_related or annotations), so rendering a page costs the same
+number of queries however many rows it shows. The attempt and response
+tables grow without bound, so their changelists also use
+EstimatedCountPaginator, which avoids counting or skipping over millions
+of rows.
 """
 
 from django.contrib import admin
-from .models import Category, Question, Choice, QuizAttempt, QuizResponse, UserProfile
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import Category, Question, Choice, QuizAttempt, QuizResponse, UserProfile, UserStats
+
+
+def estimate_row_count(model):
+    """
+    Return a cheap estimate of the number of rows of a model's table.
+
+    PostgreSQL's planner statistics are used where available; on SQLite the
+    largest primary key (an index lookup) stands in for the row count.
+
+    Returns:
+        int or None: The estimate, or None if the database cannot give one
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 (or 0) until the table has been analyzed
+        return row[0] if row and row[0] > 0 else None
+    if connection.vendor == 'sqlite':
+        return model._default_manager.aggregate(largest=Max('pk'))['largest'] or 0
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for changelists of very large tables.
+
+    The unfiltered count is estimated (see estimate_row_count) once the
+    table is larger than ``count_limit``, and filtered counts stop counting
+    at ``count_limit``, so the count never reads more than count_limit rows.
+    Pages of a list ordered by primary key are fetched with a seek: the
+    page's first key is found by skipping over the primary key index alone,
+    and only the page's rows are read (and joined) in full.
+    """
+    # Rows counted exactly before the count is estimated or capped
+    count_limit = 100000
+
+    @cached_property
+    def count(self):
+        """Return the exact or estimated number of objects."""
+        queryset = self.object_list
+        limit = self.count_limit
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model)
+            if estimate is not None and estimate > limit:
+                return estimate
+        return queryset.order_by()[:limit].count()
+
+    def page(self, number):
+        """Return a Page, seeking to it through the primary key if possible."""
+        number = self.validate_number(number)
+        ordering = self.object_list.query.order_by
+        if number == 1 or tuple(ordering) not in (('pk',), ('-pk',)):
+            return super().page(number)
+
+        offset = (number - 1) * self.per_page
+        boundary = self.object_list.values_list('pk', flat=True)[offset:offset + 1].first()
+        if boundary is None:
+            return self._get_page([], number, self)
+        seek = {'pk__lte' if ordering[0] == '-pk' else 'pk__gte': boundary}
+        return self._get_page(self.object_list.filter(**seek)[:self.per_page], number, self)
 
 
 class ChoiceInline(admin.TabularInline):
@@ -29,6 +106,7 @@ class QuestionAdmin(admin.ModelAdmin):
     """
     list_display = ['text_short', 'category', 'difficulty', 'created_at']
     list_filter = ['category', 'difficulty', 'created_at']
+    list_select_related = ['category']
     search_fields = ['text', 'explanation']
     inlines = [ChoiceInline]
     date_hierarchy = 'created_at'
@@ -48,6 +126,16 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'question_count', 'created_at']
     search_fields = ['name', 'description']
     date_hierarchy = 'created_at'
+    
+    def get_queryset(self, request):
+        """Count every category's questions in the changelist query."""
+        return super().get_queryset(request).annotate(num_questions=Count('question'))
+    
+    def question_count(self, obj):
+        """Return the number of questions in the category."""
+        return obj.num_questions
+    question_count.short_description = 'Questions'
+    question_count.admin_order_field = 'num_questions'
 
 
 class QuizResponseInline(admin.TabularInline):
@@ -61,6 +149,35 @@ class QuizResponseInline(admin.TabularInline):
     fields = ['question', 'selected_choice', 'is_correct']
     readonly_fields = ['question', 'selected_choice', 'is_correct']
     can_delete = False
+    
+    def get_queryset(self, request):
+        """Fetch the displayed question and choice with the responses."""
+        return super().get_queryset(request).select_related('question', 'selected_choice')
+
+
+class AttemptStatusFilter(admin.SimpleListFilter):
+    """Filter quiz attempts by status, comparing deadline_at to the current time in SQL."""
+    title = 'status'
+    parameter_name = 'status'
+    
+    def lookups(self, request, model_admin):
+        """Return the available statuses."""
+        return [
+            ('running', 'In progress'),
+            ('expired', 'Expired, not closed yet'),
+            ('completed', 'Completed'),
+        ]
+    
+    def queryset(self, request, queryset):
+        """Restrict the attempts to the selected status."""
+        now = timezone.now()
+        if self.value() == 'running':
+            return queryset.filter(completed_at__isnull=True).exclude(deadline_at__lte=now)
+        if self.value() == 'expired':
+            return queryset.filter(completed_at__isnull=True, deadline_at__lte=now)
+        if self.value() == 'completed':
+            return queryset.filter(completed_at__isnull=False)
+        return queryset
 
 
 @admin.register(QuizAttempt)
@@ -68,11 +185,14 @@ class QuizAttemptAdmin(admin.ModelAdmin):
     """
     Admin interface for the QuizAttempt model.
     """
-    list_display = ['id', 'user_display', 'category', 'score', 'total_questions', 'score_percentage', 'started_at', 'is_complete']
-    list_filter = ['category', 'started_at', 'completed_at']
+    list_display = ['id', 'user_display', 'category', 'score', 'total_questions', 'score_percentage', 'started_at', 'deadline_at', 'is_complete']
+    list_filter = [AttemptStatusFilter, 'category', 'started_at', 'completed_at']
     search_fields = ['user__username', 'category__name']
     date_hierarchy = 'started_at'
     inlines = [QuizResponseInline]
+    list_select_related = ['user', 'category']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     def user_display(self, obj):
         """Return the username or 'Anonymous' if no user."""
@@ -100,7 +220,13 @@ class QuizResponseAdmin(admin.ModelAdmin):
     list_display = ['quiz_attempt', 'question_short', 'selected_choice_short', 'is_correct', 'response_time']
     list_filter = ['is_correct', 'response_time', 'quiz_attempt__category']
     search_fields = ['question__text', 'selected_choice__text']
-    date_hierarchy = 'response_time'
+    # No date_hierarchy: its year links are a DISTINCT over the whole table
+    list_select_related = [
+        'quiz_attempt__user', 'quiz_attempt__category', 'question', 'selected_choice'
+    ]
+    ordering = ['-pk']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     def question_short(self, obj):
         """Return a shortened version of the question text."""
@@ -124,4 +250,25 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_filter = ['favorite_category', 'created_at']
     search_fields = ['user__username', 'user__email', 'bio']
     raw_id_fields = ['user', 'favorite_category']
-    date_hierarchy = 'created_at' 
\ No newline at end of file
+    date_hierarchy = 'created_at'
+
+
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the UserStats model.
+    
+    The rows are maintained automatically, so they are shown read-only.
+    """
+    list_display = ['user', 'category', 'attempts', 'perfect_count', 'last_attempt_at']
+    list_filter = ['category']
+    search_fields = ['user__username']
+    list_select_related = ['user', 'category']
+    
+    def has_add_permission(self, request):
+        """Statistics rows are created automatically."""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        """Statistics rows are maintained automatically."""
+        return False
@@ -0,0 +1,207 @@
+"""
+Analytics and plotting for the Quiz application.
+
+This module holds all code that needs pandas, matplotlib or seaborn. Those
+libraries take several hundred milliseconds and tens of megabytes to load,
+so nothing imports this module at startup: the chart service
+(quiz_app.charts) imports it inside the functions that actually draw a
+chart.
+
+Charts are drawn with matplotlib's object-oriented Figure API, so no global
+pyplot state is touched and every figure is released once it is saved.
+All renderers take plain data (no model instances), so they can run in the
+chart worker pool's processes without Django being set up.
+
+Quiz history is loaded with values_list() straight into DataFrame columns
+and percentages and groupings are computed as vectorized operations, so no
+model instance is built and no per-row Python method is called.
+"""
+
+from io import BytesIO
+
+import matplotlib as mpl
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.dates import DateFormatter
+from matplotlib.figure import Figure
+
+
+# QuizAttempt columns loaded for the statistics charts, and their frame names
+ATTEMPT_FIELDS = {
+    'completed_at': 'date',
+    'category__name': 'category',
+    'score': 'score',
+    'total_questions': 'total_questions',
+}
+
+
+def score_percentages(scores, totals):
+    """
+    Vectorized QuizAttempt.score_percentage().
+
+    Args:
+        scores (array-like): Attempt scores
+        totals (array-like): Attempt question counts
+
+    Returns:
+        numpy.ndarray: Percentages (0-100), 0 where an attempt has no questions
+    """
+    scores = np.asarray(scores, dtype=float)
+    totals = np.asarray(totals, dtype=float)
+    percentages = np.zeros_like(scores)
+    np.divide(scores, totals, out=percentages, where=totals > 0)
+    return percentages * 100
+
+
+def attempt_frame(quiz_attempts):
+    """
+    Load quiz attempts into a DataFrame for the statistics charts.
+
+    Args:
+        quiz_attempts (QuerySet): The QuizAttempt rows to load
+
+    Returns:
+        pandas.DataFrame: Columns 'date', 'category', 'score',
+        'total_questions' and 'score_percentage', one row per attempt
+    """
+    rows = quiz_attempts.order_by().values_list(*ATTEMPT_FIELDS)
+    df = pd.DataFrame.from_records(list(rows), columns=list(ATTEMPT_FIELDS.values()))
+    df['score_percentage'] = score_percentages(df['score'], df['total_questions'])
+    return df
+
+
+def figure_to_png(fig, **kwargs):
+    """Return the PNG bytes of a matplotlib Figure."""
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight', **kwargs)
+    return buffer.getvalue()
+
+
+def render_results_chart(rows):
+    """
+    Render the performance-by-difficulty bar chart of a quiz attempt.
+
+    Args:
+        rows (list): (difficulty, is_correct) pairs, one per response
+
+    Returns:
+        bytes: The PNG image
+    """
+    df = pd.DataFrame(rows, columns=['difficulty', 'is_correct'])
+    difficulty_performance = df.groupby('difficulty')['is_correct'].mean() * 100
+
+    fig = Figure(figsize=(8, 4))
+    ax = fig.subplots()
+    sns.barplot(x=difficulty_performance.index, y=difficulty_performance.values, ax=ax)
+    ax.set_title('Performance by Question Difficulty')
+    ax.set_xlabel('Difficulty Level')
+    ax.set_ylabel('Correct Answers (%)')
+    ax.set_ylim(0, 100)
+    return figure_to_png(fig)
+
+
+# Shared styling of the user statistics charts
+STATS_CHART_STYLE = {
+    'font.size': 12,
+    'axes.labelsize': 14,
+    'axes.titlesize': 16,
+    'xtick.labelsize': 12,
+    'ytick.labelsize': 12,
+    'legend.fontsize': 12,
+    'figure.titlesize': 18
+}
+
+
+def render_time_chart(data):
+    """
+    Render the performance-over-time line chart, one line per category.
+
+    Args:
+        data (DataFrame): Columns 'date', 'category' and 'score_percentage'
+
+    Returns:
+        bytes: The PNG image
+    """
+    df = data.sort_values('date')
+    with sns.axes_style('whitegrid'), mpl.rc_context(STATS_CHART_STYLE):
+        fig = Figure(figsize=(12, 6))
+        ax = fig.subplots()
+        sns.lineplot(data=df, x='date', y='score_percentage', hue='category',
+                     marker='o', linewidth=2.5, ax=ax)
+        ax.set_title('Quiz Performance Over Time', fontweight='bold', pad=20)
+        ax.set_xlabel('Date', fontweight='bold')
+        ax.set_ylabel('Score (%)', fontweight='bold')
+        ax.set_ylim(0, 100)
+        ax.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d"))
+        for label in ax.get_xticklabels():
+            label.set_rotation(45)
+            label.set_horizontalalignment('right')
+        ax.grid(True, alpha=0.3)
+        ax.legend(title='Category', title_fontsize=12, loc='upper left', bbox_to_anchor=(1, 1))
+        fig.tight_layout()
+        return figure_to_png(fig, dpi=100)
+
+
+def render_category_chart(data):
+    """
+    Render the average-performance-by-category bar chart.
+
+    Args:
+        data (DataFrame): Columns 'category' and 'score_percentage'
+
+    Returns:
+        bytes: The PNG image
+    """
+    category_perf = data.groupby('category')['score_percentage'].mean().sort_values(ascending=False)
+    overall_avg = data['score_percentage'].mean()
+    with sns.axes_style('whitegrid'), mpl.rc_context(STATS_CHART_STYLE):
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
+        sns.barplot(x=category_perf.index, y=category_perf.values, hue=category_perf.index,
+                    palette='viridis', legend=False, ax=ax)
+        for i, v in enumerate(category_perf.values):
+            ax.text(i, v + 2, f"{v:.1f}%", ha='center', fontweight='bold')
+        ax.set_title('Average Performance by Category', fontweight='bold', pad=20)
+        ax.set_xlabel('Category', fontweight='bold')
+        ax.set_ylabel('Average Score (%)', fontweight='bold')
+        ax.set_ylim(0, 105)  # Extended to fit value labels
+        for label in ax.get_xticklabels():
+            label.set_rotation(45)
+            label.set_horizontalalignment('right')
+        ax.axhline(y=overall_avg, color='red', linestyle='--', label=f'Overall Avg: {overall_avg:.1f}%')
+        ax.legend()
+        ax.grid(True, axis='y', alpha=0.3)
+        fig.tight_layout()
+        return figure_to_png(fig, dpi=100)
+
+
+def render_question_dist_chart(data):
+    """
+    Render the quiz-length distribution pie chart.
+
+    Args:
+        data (DataFrame): Column 'total_questions'
+
+    Returns:
+        bytes: The PNG image
+    """
+    question_counts = data['total_questions'].value_counts().sort_index()
+    with mpl.rc_context(STATS_CHART_STYLE):
+        fig = Figure(figsize=(8, 6))
+        ax = fig.subplots()
+        ax.pie(question_counts, labels=[f"{count} questions" for count in question_counts.index],
+               autopct='%1.1f%%', startangle=90, shadow=True,
+               wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
+               textprops={'fontsize': 12, 'fontweight': 'bold'})
+        ax.set_title('Quiz Length Distribution', fontweight='bold', pad=20)
+        ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+        return figure_to_png(fig, dpi=100)
+
+
+# The user statistics charts, by the name used in their URLs
+STATS_CHARTS = {
+    'time': render_time_chart,
+    'category': render_category_chart,
+    'question_dist': render_question_dist_chart,
+}
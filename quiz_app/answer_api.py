@@ -0,0 +1,146 @@
+"""
+Client for the answer generation API used by fix_placeholder_questions.
+
+The API is sent a question and its category as JSON and answers with a
+correct answer and a list of incorrect ones:
+
+    POST QUIZ_ANSWER_API_URL
+    {"question": "What does CPU stand for?", "category": "Technology"}
+
+    200 OK
+    {"correct": "Central Processing Unit", "incorrect": ["...", "...", "..."]}
+
+Requests may be made from several threads at once. They share one
+TokenBucket, so together they never exceed the API's rate limit, and
+requests that fail with a connection error, a timeout, 429 or a 5xx status
+are retried with exponential backoff (honoring Retry-After when given).
+"""
+
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+
+# HTTP statuses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AnswerAPIError(Exception):
+    """The API did not return valid answers, even after retrying."""
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket rate limiter.
+
+    Tokens are added at ``rate`` per second, up to ``capacity``; each
+    acquire() takes one token, waiting for it if the bucket is empty.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class AnswerClient:
+    """
+    Fetch answers for questions from the answer generation API.
+
+    Attributes:
+        url (str): The API endpoint
+        bucket (TokenBucket): Rate limiter shared by every request
+        retries (int): Extra attempts made after a retryable failure
+        backoff (float): Delay (in seconds) before the first retry; it
+            doubles with every further retry
+    """
+
+    def __init__(self, url=None, api_key=None, rate=None, timeout=None, retries=3, backoff=0.5):
+        self.url = url or settings.QUIZ_ANSWER_API_URL
+        self.api_key = api_key if api_key is not None else settings.QUIZ_ANSWER_API_KEY
+        self.timeout = timeout or settings.QUIZ_ANSWER_API_TIMEOUT
+        self.bucket = TokenBucket(rate or settings.QUIZ_ANSWER_API_RATE)
+        self.retries = retries
+        self.backoff = backoff
+
+    def get_answers(self, question_text, category_name):
+        """
+        Return the answers to a question.
+
+        Returns:
+            dict: {'correct': str, 'incorrect': [str, ...]}
+
+        Raises:
+            AnswerAPIError: If no valid answers could be fetched
+        """
+        payload = json.dumps({'question': question_text, 'category': category_name}).encode()
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f'Bearer {self.api_key}'
+
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            request = urllib.request.Request(self.url, data=payload, headers=headers, method='POST')
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return self._parse(response.read())
+            except urllib.error.HTTPError as e:
+                if e.code not in RETRY_STATUSES or attempt == self.retries:
+                    raise AnswerAPIError(f'HTTP {e.code} from answer API') from e
+                delay = self._retry_after(e) or self._backoff_delay(attempt)
+            except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+                if attempt == self.retries:
+                    raise AnswerAPIError(f'Answer API unreachable: {e}') from e
+                delay = self._backoff_delay(attempt)
+            time.sleep(delay)
+
+    def _parse(self, body):
+        """Validate a response body and return its answers."""
+        try:
+            answers = json.loads(body)
+        except ValueError as e:
+            raise AnswerAPIError('Answer API returned invalid JSON') from e
+        if (
+            not isinstance(answers, dict)
+            or not isinstance(answers.get('correct'), str)
+            or not isinstance(answers.get('incorrect'), list)
+            or not answers['incorrect']
+        ):
+            raise AnswerAPIError('Answer API returned no usable answers')
+        return {'correct': answers['correct'], 'incorrect': [str(text) for text in answers['incorrect']]}
+
+    def _backoff_delay(self, attempt):
+        """Return the delay before retry number attempt + 1, with jitter."""
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    @staticmethod
+    def _retry_after(error):
+        """Return the delay requested by a Retry-After header, if any."""
+        value = error.headers.get('Retry-After') if error.headers else None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
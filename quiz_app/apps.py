@@ -0,0 +1,20 @@
+"""
+Application configuration for the Quiz application.
+"""
+
+from django.apps import AppConfig
+
+
+class QuizAppConfig(AppConfig):
+    """
+    Configuration for the quiz_app application.
+
+    Connects the cache-maintenance signal handlers and the database
+    connection tuning once the app registry is ready.
+    """
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'quiz_app'
+
+    def ready(self):
+        """Import the signal handlers so they get registered."""
+        from . import db, signals  # noqa: F401
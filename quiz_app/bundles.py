@@ -0,0 +1,207 @@
+"""
+Prefetched quiz bundles for the Quiz application.
+
+A quiz bundle holds every question and choice of a quiz attempt. It is
+loaded in two queries when the quiz starts and cached under the attempt's
+ID, so rendering a question or checking a submitted choice does not need
+to query the Question and Choice tables again.
+
+If a bundle is missing from the cache (evicted, or the cache was cleared)
+it is rebuilt from the question IDs stored in the session.
+
+Answers are graded against a separate, much smaller answer key (the choice
+IDs of each question and which one is correct), so recording an answer
+does not have to load the bundle or any Choice row.
+"""
+
+from django.core.cache import cache
+
+from .models import Question, Choice
+
+# Cache key template for the bundle of a quiz attempt
+BUNDLE_KEY = 'quiz_app:bundle:{attempt_id}'
+
+# Cache key template for the answer key of a quiz attempt
+ANSWER_KEY = 'quiz_app:answer_key:{attempt_id}'
+
+# How long (in seconds) a bundle stays cached after the quiz starts
+BUNDLE_TIMEOUT = 60 * 60 * 6
+
+
+class QuizBundle:
+    """
+    The questions and choices of a single quiz attempt.
+
+    Attributes:
+        question_ids (list): Question IDs in the order they are asked
+        questions (dict): Question instances keyed by ID
+        choices (dict): Lists of Choice instances keyed by question ID
+    """
+
+    def __init__(self, question_ids, questions, choices):
+        self.question_ids = list(question_ids)
+        self.questions = questions
+        self.choices = choices
+
+    @classmethod
+    def load(cls, question_ids):
+        """
+        Load a bundle from the database in two queries.
+
+        Args:
+            question_ids (list): Question IDs in the order they are asked
+
+        Returns:
+            QuizBundle: The loaded bundle
+        """
+        questions = Question.objects.in_bulk(question_ids)
+        choices = {question_id: [] for question_id in questions}
+        for choice in Choice.objects.filter(question_id__in=question_ids):
+            choices[choice.question_id].append(choice)
+        return cls(question_ids, questions, choices)
+
+    def get_question(self, question_id):
+        """Return the Question with the given ID, or None if it is not in the bundle."""
+        return self.questions.get(question_id)
+
+    def get_choices(self, question_id):
+        """Return the choices of a question in display order."""
+        return self.choices.get(question_id, [])
+
+    def get_choice(self, question_id, choice_id):
+        """
+        Return a choice of the given question.
+
+        Returns:
+            Choice or None: The choice, or None if choice_id does not belong
+            to the question
+        """
+        for choice in self.get_choices(question_id):
+            if str(choice.id) == str(choice_id):
+                return choice
+        return None
+
+
+class AnswerKey:
+    """
+    The choice IDs and correct answers of a quiz attempt's questions.
+
+    Attributes:
+        question_ids (list): Question IDs in the order they are asked
+        choice_ids (dict): Sets of choice IDs keyed by question ID
+        correct (dict): The correct choice ID keyed by question ID
+    """
+
+    def __init__(self, question_ids, choice_ids, correct):
+        self.question_ids = list(question_ids)
+        self.choice_ids = choice_ids
+        self.correct = correct
+
+    @classmethod
+    def load(cls, question_ids):
+        """Load an answer key from the database in one query."""
+        choice_ids = {question_id: set() for question_id in question_ids}
+        correct = {}
+        rows = Choice.objects.filter(question_id__in=question_ids).values_list(
+            'question_id', 'id', 'question__correct_choice_id'
+        )
+        for question_id, choice_id, correct_choice_id in rows:
+            choice_ids[question_id].add(choice_id)
+            correct[question_id] = correct_choice_id
+        return cls(question_ids, choice_ids, correct)
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        """Derive the answer key of a loaded bundle without querying."""
+        return cls(
+            bundle.question_ids,
+            {
+                question_id: {choice.id for choice in bundle.get_choices(question_id)}
+                for question_id in bundle.question_ids
+            },
+            {
+                question_id: question.correct_choice_id
+                for question_id, question in bundle.questions.items()
+            },
+        )
+
+    def grade(self, question_id, choice_id):
+        """
+        Check a submitted choice against the answer key.
+
+        Args:
+            question_id (int): The question being answered
+            choice_id (int or str): The submitted choice ID
+
+        Returns:
+            bool or None: Whether the choice is correct, or None if it does
+            not belong to the question
+        """
+        try:
+            choice_id = int(choice_id)
+        except (TypeError, ValueError):
+            return None
+        if choice_id not in self.choice_ids.get(question_id, ()):
+            return None
+        return choice_id == self.correct.get(question_id)
+
+
+def _bundle_key(attempt_id):
+    """Return the cache key holding the bundle of a quiz attempt."""
+    return BUNDLE_KEY.format(attempt_id=attempt_id)
+
+
+def _answer_key_key(attempt_id):
+    """Return the cache key holding the answer key of a quiz attempt."""
+    return ANSWER_KEY.format(attempt_id=attempt_id)
+
+
+def build_quiz_bundle(attempt_id, question_ids):
+    """
+    Load the bundle for a quiz attempt and store it in the cache.
+
+    Args:
+        attempt_id (int): The quiz attempt the bundle belongs to
+        question_ids (list): Question IDs in the order they are asked
+
+    Returns:
+        QuizBundle: The cached bundle
+    """
+    bundle = QuizBundle.load(question_ids)
+    cache.set_many({
+        _bundle_key(attempt_id): bundle,
+        _answer_key_key(attempt_id): AnswerKey.from_bundle(bundle),
+    }, BUNDLE_TIMEOUT)
+    return bundle
+
+
+def get_quiz_bundle(attempt_id, question_ids):
+    """
+    Return the cached bundle for a quiz attempt, rebuilding it if needed.
+
+    A cached bundle whose question list does not match question_ids is
+    treated as missing.
+    """
+    bundle = cache.get(_bundle_key(attempt_id))
+    if bundle is None or bundle.question_ids != list(question_ids):
+        bundle = build_quiz_bundle(attempt_id, question_ids)
+    return bundle
+
+
+def get_answer_key(attempt_id, question_ids):
+    """
+    Return the cached answer key for a quiz attempt, reloading it if needed.
+
+    A cached answer key whose question list does not match question_ids is
+    treated as missing.
+    """
+    answer_key = cache.get(_answer_key_key(attempt_id))
+    if answer_key is None or answer_key.question_ids != list(question_ids):
+        answer_key = AnswerKey.load(question_ids)
+        cache.set(_answer_key_key(attempt_id), answer_key, BUNDLE_TIMEOUT)
+    return answer_key
+
+
+def discard_quiz_bundle(attempt_id):
+    """Remove the bundle and answer key of a finished quiz attempt from the cache."""
+    cache.delete_many([_bundle_key(attempt_id), _answer_key_key(attempt_id)])
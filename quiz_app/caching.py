@@ -0,0 +1,58 @@
+"""
+Versioned caching of read-mostly data for the Quiz application.
+
+Cached values are grouped into namespaces, and each namespace has a version
+number stored in the cache. The version is part of every key in the
+namespace, so bumping it (from the signal handlers in quiz_app.signals)
+makes all of the namespace's cached values unreachable at once, without
+having to know or delete their keys. The stale entries simply expire.
+
+A version starts from the current time rather than 1, so if the version
+key itself is evicted, the new version cannot collide with an old one.
+
+A bump only reaches the processes that share the cache it was made in. With
+the default local-memory backend that is the current process alone, so
+deployments with more than one process need a shared backend
+(QUIZ_CACHE_BACKEND = 'file' or 'redis'); otherwise the other processes
+serve stale values until they expire.
+"""
+
+import time
+
+from django.core.cache import cache
+
+# Cache key template for the version of a namespace
+VERSION_KEY = 'quiz_app:version:{namespace}'
+
+# Cache key template for a value in a namespace
+VERSIONED_KEY = 'quiz_app:{namespace}:{version}:{name}'
+
+# Namespace of the category catalogue (see quiz_app.catalogue)
+CATEGORIES = 'categories'
+
+
+def namespace_version(namespace):
+    """Return the current version of a cache namespace."""
+    key = VERSION_KEY.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_namespace(namespace):
+    """Invalidate every cached value of a namespace."""
+    key = VERSION_KEY.format(namespace=namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # No version yet: the next read starts a fresh one
+        pass
+
+
+def versioned_key(namespace, name):
+    """Return the cache key of a value in the current version of a namespace."""
+    return VERSIONED_KEY.format(
+        namespace=namespace, version=namespace_version(namespace), name=name
+    )
@@ -0,0 +1,95 @@
+"""
+Category catalogue for the Quiz application.
+
+The catalogue is one cached structure holding the categories that have
+questions and how many questions each of them has per difficulty. The
+quiz selection form (its choices, its category lookup and its question
+count check), the index and category pages and QuizStartView all read it,
+so none of them has to query or count the Category and Question tables.
+
+The catalogue is cached under the 'categories' namespace of
+quiz_app.caching, which the signal handlers bump whenever a question or
+category changes.
+"""
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .caching import CATEGORIES, versioned_key
+from .models import Category, Question
+
+# How long (in seconds) the catalogue stays cached
+CATALOGUE_TIMEOUT = 60 * 60
+
+
+class CategoryCatalogue:
+    """
+    The categories that have questions, with their question counts.
+
+    Attributes:
+        categories (list): Category instances ordered by name, each
+            annotated with ``num_questions``
+        counts (dict): Question counts per difficulty, keyed by category ID
+    """
+
+    def __init__(self, categories, counts):
+        self.categories = categories
+        self.counts = counts
+
+    @classmethod
+    def load(cls):
+        """Load the catalogue from the database in one query."""
+        difficulties = [value for value, _ in Question.DIFFICULTY_CHOICES]
+        categories = Category.objects.annotate(**{
+            difficulty: Count('question', filter=Q(question__difficulty=difficulty))
+            for difficulty in difficulties
+        })
+
+        listed, counts = [], {}
+        for category in categories:
+            category_counts = {
+                difficulty: getattr(category, difficulty)
+                for difficulty in difficulties if getattr(category, difficulty)
+            }
+            if category_counts:
+                category.num_questions = sum(category_counts.values())
+                counts[category.id] = category_counts
+                listed.append(category)
+        return cls(listed, counts)
+
+    def get_category(self, category_id):
+        """Return the category with the given ID, or None if it has no questions."""
+        for category in self.categories:
+            if category.id == category_id:
+                return category
+        return None
+
+    def question_count(self, category_id, difficulty=None):
+        """
+        Return the number of questions of a category.
+
+        Args:
+            category_id (int): The category
+            difficulty (str): Only count questions of this difficulty
+
+        Returns:
+            int: The question count (0 for unknown categories)
+        """
+        counts = self.counts.get(category_id, {})
+        if difficulty is not None:
+            return counts.get(difficulty, 0)
+        return sum(counts.values())
+
+    def choices(self):
+        """Return (id, name) choices for the categories, ordered by name."""
+        return [(category.id, str(category)) for category in self.categories]
+
+
+def get_catalogue():
+    """Return the cached category catalogue, loading it if needed."""
+    key = versioned_key(CATEGORIES, 'catalogue')
+    catalogue = cache.get(key)
+    if catalogue is None:
+        catalogue = CategoryCatalogue.load()
+        cache.set(key, catalogue, CATALOGUE_TIMEOUT)
+    return catalogue
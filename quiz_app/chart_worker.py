@@ -0,0 +1,186 @@
+"""
+Off-request chart rendering for the Quiz application.
+
+Rendering the user statistics charts takes long enough with a few hundred
+attempts that doing it inside the request thread holds up the response.
+This module runs the chart renderers in a process pool: UserStatsView
+returns at once with placeholders, and UserStatsChartView submits each
+chart and serves the image when its job finishes.
+
+Finished images are cached under a hash of the chart name and its input
+data, so any process can serve a chart another process rendered, and a
+chart is only rendered again once the user's data has changed. The input
+data itself is cached briefly by get_stats_frame(), so the chart requests
+of one stats page load the user's attempt history once between them.
+
+Settings:
+    QUIZ_CHART_WORKERS: Size of the process pool. 0 renders charts in the
+        requesting thread instead.
+    QUIZ_CHART_TIMEOUT: Seconds to wait for a chart before giving up.
+"""
+
+import hashlib
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .charts import CHART_TIMEOUT, RenderedChart, render_stats_chart
+
+# Cache key template for a rendered user statistics chart
+STATS_CHART_KEY = 'quiz_app:chart:stats:{name}:{digest}'
+
+# Cache key template for the chart data of a user's attempts
+STATS_FRAME_KEY = 'quiz_app:chart:frame:{user_id}:{digest}'
+
+# How long (in seconds) the chart data of a user stays cached
+STATS_FRAME_TIMEOUT = 60
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Jobs submitted by this process that have not finished yet, by cache key
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+class ChartRenderError(Exception):
+    """Raised when a chart renderer fails."""
+
+
+def get_executor():
+    """
+    Return the shared chart rendering process pool, creating it on first use.
+
+    Returns:
+        ProcessPoolExecutor or None: The pool, or None if QUIZ_CHART_WORKERS is 0
+    """
+    global _executor
+    workers = getattr(settings, 'QUIZ_CHART_WORKERS', 2)
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def shutdown_executor():
+    """Shut the process pool down; a new one is created on next use."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def stats_chart_key(name, data):
+    """Return the cache key of a statistics chart rendered from data."""
+    digest = hashlib.sha256(pickle.dumps((name, data))).hexdigest()
+    return STATS_CHART_KEY.format(name=name, digest=digest)
+
+
+def get_stats_frame(user_id, version, load):
+    """
+    Return the chart data of a user's attempts, loading it once per version.
+
+    Args:
+        user_id (int): The user the data belongs to
+        version (tuple): Changes whenever the user's completed attempts do
+        load (callable): Loads the data (see charts.load_attempt_frame())
+
+    Returns:
+        DataFrame: The attempt data
+    """
+    digest = hashlib.sha256(pickle.dumps(version)).hexdigest()
+    key = STATS_FRAME_KEY.format(user_id=user_id, digest=digest)
+    data = cache.get(key)
+    if data is None:
+        data = load()
+        cache.set(key, data, STATS_FRAME_TIMEOUT)
+    return data
+
+
+def _store(key, future):
+    """Cache the image of a finished job and forget the job."""
+    with _pending_lock:
+        _pending.pop(key, None)
+    if not future.cancelled() and future.exception() is None:
+        cache.set(key, RenderedChart(future.result()), CHART_TIMEOUT)
+
+
+def submit_chart(name, data):
+    """
+    Start rendering a statistics chart unless it is cached or already queued.
+
+    Args:
+        name (str): One of quiz_app.charts.STATS_CHART_NAMES
+        data (DataFrame): The attempt data the chart is rendered from
+
+    Returns:
+        Future or None: The rendering job, or None if the chart is cached
+        or rendering happens in the request thread
+    """
+    key = stats_chart_key(name, data)
+    executor = get_executor()
+    if executor is None or cache.get(key) is not None:
+        return None
+    with _pending_lock:
+        if key in _pending:
+            return _pending[key]
+        try:
+            future = executor.submit(render_stats_chart, name, data)
+        except BrokenProcessPool:
+            future = None
+        else:
+            _pending[key] = future
+    if future is None:
+        shutdown_executor()
+        return None
+    # Added outside the lock: it runs at once if the job is already done
+    future.add_done_callback(lambda done: _store(key, done))
+    return future
+
+
+def get_chart(name, data):
+    """
+    Return a rendered statistics chart, waiting for its job if needed.
+
+    Args:
+        name (str): One of quiz_app.charts.STATS_CHART_NAMES
+        data (DataFrame): The attempt data the chart is rendered from
+
+    Returns:
+        RenderedChart: The rendered image
+
+    Raises:
+        concurrent.futures.TimeoutError: If the chart is not ready within
+            QUIZ_CHART_TIMEOUT seconds
+        ChartRenderError: If the renderer failed
+    """
+    key = stats_chart_key(name, data)
+    chart = cache.get(key)
+    if chart is not None:
+        return chart
+
+    try:
+        future = submit_chart(name, data)
+        if future is None:
+            # No pool configured (or it broke): render in this thread
+            png = render_stats_chart(name, data)
+        else:
+            try:
+                png = future.result(timeout=getattr(settings, 'QUIZ_CHART_TIMEOUT', 10))
+            except BrokenProcessPool:
+                shutdown_executor()
+                png = render_stats_chart(name, data)
+    except FuturesTimeoutError:
+        raise
+    except Exception as e:
+        raise ChartRenderError(f"Rendering the {name!r} chart failed: {e}") from e
+    chart = RenderedChart(png)
+    cache.set(key, chart, CHART_TIMEOUT)
+    return chart
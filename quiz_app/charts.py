@@ -0,0 +1,104 @@
+"""
+Chart service for the Quiz application.
+
+The PNG bytes of a quiz attempt's results chart are cached under a key
+derived from the attempt's ID and score counters, so reloading the results
+page of the same attempt does not render the chart again.
+
+The drawing itself lives in quiz_app.analytics, which is only imported when
+a chart actually has to be rendered, so importing this module (and the
+views) does not load pandas, matplotlib or seaborn. This module does not
+import the models either, so chart worker processes can import it without
+setting up Django.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+
+# Cache key template for a rendered results chart
+RESULTS_CHART_KEY = 'quiz_app:chart:results:{digest}'
+
+# How long (in seconds) a rendered chart stays cached
+CHART_TIMEOUT = 60 * 60 * 24
+
+
+class RenderedChart:
+    """
+    The PNG bytes of a rendered chart and their ETag.
+
+    Attributes:
+        png (bytes): The encoded PNG image
+        etag (str): A hash of the image contents
+    """
+
+    def __init__(self, png):
+        self.png = png
+        self.etag = hashlib.sha256(png).hexdigest()
+
+
+def results_chart_key(quiz_attempt):
+    """
+    Return the cache key of a quiz attempt's results chart.
+
+    The key covers everything the chart depends on, so a new answer (which
+    changes the counters) gives a new key rather than a stale image.
+    """
+    source = f'{quiz_attempt.pk}:{quiz_attempt.score}:{quiz_attempt.answered_count}'
+    return RESULTS_CHART_KEY.format(digest=hashlib.sha256(source.encode()).hexdigest())
+
+
+def get_results_chart(quiz_attempt):
+    """
+    Return the results chart of a quiz attempt, rendering it only once.
+
+    Returns:
+        RenderedChart or None: The cached chart, or None if the attempt has
+        no responses
+    """
+    key = results_chart_key(quiz_attempt)
+    chart = cache.get(key)
+    if chart is None:
+        rows = list(quiz_attempt.quizresponse_set.values_list('question__difficulty', 'is_correct'))
+        if not rows:
+            return None
+        from . import analytics
+        chart = RenderedChart(analytics.render_results_chart(rows))
+        cache.set(key, chart, CHART_TIMEOUT)
+    return chart
+
+
+# The user statistics charts, by the name used in their URLs
+# (see quiz_app.analytics.STATS_CHARTS for their renderers)
+STATS_CHART_NAMES = ('time', 'category', 'question_dist')
+
+
+def load_attempt_frame(quiz_attempts):
+    """
+    Load the statistics chart data of some quiz attempts.
+
+    See quiz_app.analytics.attempt_frame().
+
+    Args:
+        quiz_attempts (QuerySet): The QuizAttempt rows to chart
+
+    Returns:
+        pandas.DataFrame: One row per attempt
+    """
+    from . import analytics
+    return analytics.attempt_frame(quiz_attempts)
+
+
+def render_stats_chart(name, data):
+    """
+    Render one of the user statistics charts.
+
+    Args:
+        name (str): One of STATS_CHART_NAMES
+        data (DataFrame): The attempt data from load_attempt_frame()
+
+    Returns:
+        bytes: The PNG image
+    """
+    from . import analytics
+    return analytics.STATS_CHARTS[name](data)
@@ -0,0 +1,41 @@
+"""
+Database connection tuning for the Quiz application.
+
+SQLite's defaults (a rollback journal, FULL synchronous writes and no busy
+timeout beyond the driver's) make concurrent quiz submissions fail with
+"database is locked". When a SQLite connection is opened, the pragmas in
+the QUIZ_SQLITE_PRAGMAS setting are applied to it:
+
+    journal_mode=WAL: readers no longer block the writer, nor it them
+    synchronous=NORMAL: fsync at checkpoints instead of on every commit
+        (safe in WAL mode; a power loss can only drop the latest commits)
+    busy_timeout: milliseconds a writer waits for the lock before failing
+    mmap_size: bytes of the database file read through memory mapping
+
+The receiver is connected in QuizAppConfig.ready(); other database vendors
+are left alone.
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_sqlite_pragmas(connection, pragmas):
+    """
+    Run PRAGMA statements on a SQLite connection.
+
+    Args:
+        connection: A Django database connection wrapper
+        pragmas (dict): Pragma values keyed by pragma name
+    """
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    """Tune each new SQLite connection with QUIZ_SQLITE_PRAGMAS."""
+    if connection.vendor == 'sqlite':
+        apply_sqlite_pragmas(connection, getattr(settings, 'QUIZ_SQLITE_PRAGMAS', {}))
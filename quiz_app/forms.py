@@ -8,7 +8,7 @@ including quiz selection and customization.
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
-from .models import Category, Question
+from .catalogue import get_catalogue
 
 
 class UserRegistrationForm(UserCreationForm):
@@ -63,9 +63,9 @@ class QuizSelectionForm(forms.Form):
     This form allows users to choose which category of questions they want
     to be quizzed on and how many questions they want in their quiz.
     """
-    category = forms.ModelChoiceField(
-        queryset=Category.objects.all(),
-        empty_label="Select a category",
+    category = forms.TypedChoiceField(
+        coerce=int,
+        empty_value=None,
         widget=forms.Select(attrs={'class': 'form-control'}),
         help_text="Choose the topic you want to be quizzed on"
     )
@@ -101,10 +101,16 @@ class QuizSelectionForm(forms.Form):
     def __init__(self, *args, **kwargs):
         """Initialize the form with only categories that have questions."""
         super().__init__(*args, **kwargs)
-        # Get categories that have at least one question
-        self.fields['category'].queryset = Category.objects.filter(
-            question__isnull=False
-        ).distinct()
+        # Categories that have at least one question, from the cached catalogue
+        self.catalogue = get_catalogue()
+        self.fields['category'].choices = [('', "Select a category")] + self.catalogue.choices()
+    
+    def clean_category(self):
+        """Return the selected Category instance from the catalogue."""
+        category_id = self.cleaned_data.get('category')
+        if category_id is None:
+            return None
+        return self.catalogue.get_category(category_id)
     
     def clean(self):
         """Validate the form data."""
@@ -132,7 +138,7 @@ class QuizSelectionForm(forms.Form):
         num_questions = self.cleaned_data.get('num_questions')
         
         if category and num_questions:
-            available_questions = Question.objects.filter(category=category).count()
+            available_questions = self.catalogue.question_count(category.id)
             if num_questions > available_questions:
                 raise forms.ValidationError(
                     f"Only {available_questions} questions available in this category. "
@@ -0,0 +1,300 @@
+"""
+Bulk question importing for the Quiz application.
+
+Creating questions one at a time costs an INSERT per question and per
+choice, plus the correct-choice bookkeeping in Choice.save() for every
+correct choice. QuestionImporter instead builds Question and Choice objects
+in memory and writes them in batches: one bulk INSERT for a batch of
+questions, one for their choices and a single UPDATE that points the
+questions at their correct choices.
+
+bulk_create() does not send post_save signals, so the importer invalidates
+the caches the signal handlers would have invalidated (the question ID
+indexes of the touched categories and the category catalogue) once, when
+the import is finished. The invalidation waits for the surrounding
+transaction to commit, so a request that rebuilds a cache in the meantime
+cannot store the data from before the import.
+
+Usage:
+    importer = QuestionImporter()
+    importer.add(category, 'Question text', [('Right', True), ('Wrong', False)])
+    importer.finish()
+    print(importer.summary())
+
+The module also reads and writes question banks, for the import_questions
+and export_questions commands. A bank is a stream of question records,
+stored one of two ways:
+
+    'jsonl': One JSON object per line:
+        {"category": "Science", "difficulty": "easy", "text": "...",
+         "explanation": "...", "choices": [{"text": "...", "is_correct": true}, ...]}
+    'csv': A header row, then one row per question with the columns
+        category, difficulty, text, explanation, correct (the 1-based
+        position of the correct choice), followed by one column per choice
+
+Both formats are read and written one record at a time, so a bank of any
+size is moved in constant memory.
+"""
+
+import csv
+import json
+import time
+
+from django.db import transaction
+
+from .caching import CATEGORIES, bump_namespace
+from .models import Choice, Question
+from .sampling import invalidate_question_index
+
+# Number of questions written per batch
+DEFAULT_BATCH_SIZE = 500
+
+# Question bank formats
+BANK_FORMATS = ('jsonl', 'csv')
+
+# Leading CSV columns of a question record (the choices follow them)
+CSV_COLUMNS = ['category', 'difficulty', 'text', 'explanation', 'correct']
+
+
+def _invalidate_category_caches(category_ids):
+    """Drop the question ID indexes of categories and the category catalogue."""
+    for category_id in category_ids:
+        invalidate_question_index(category_id)
+    bump_namespace(CATEGORIES)
+
+
+class QuestionImporter:
+    """
+    Buffer new questions and write them to the database in batches.
+
+    Attributes:
+        batch_size (int): Number of questions written per batch
+        questions_created (int): Questions written so far
+        choices_created (int): Choices written so far
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.questions_created = 0
+        self.choices_created = 0
+        self._pending = []
+        self._category_ids = set()
+        self._started = time.perf_counter()
+        self._finished = None
+
+    def add(self, category, text, choices, difficulty='medium', explanation=''):
+        """
+        Queue a question with its choices.
+
+        Args:
+            category (Category): The question's category
+            text (str): The question text
+            choices (list): (text, is_correct) pairs, or dicts with 'text'
+                and 'is_correct' keys
+            difficulty (str): The question difficulty
+            explanation (str): Explanation shown after answering
+        """
+        question = Question(
+            category=category,
+            text=text,
+            difficulty=difficulty,
+            explanation=explanation,
+        )
+        choices = [
+            (choice['text'], choice['is_correct']) if isinstance(choice, dict) else choice
+            for choice in choices
+        ]
+        self._pending.append((question, choices))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the queued questions and their choices."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        with transaction.atomic():
+            questions = Question.objects.bulk_create(
+                [question for question, _ in pending], batch_size=self.batch_size
+            )
+            choices = [
+                Choice(question=question, text=text, is_correct=is_correct)
+                for question, (_, question_choices) in zip(questions, pending)
+                for text, is_correct in question_choices
+            ]
+            Choice.objects.bulk_create(choices, batch_size=self.batch_size)
+            Question.link_correct_choices(
+                Question.objects.filter(pk__in=[question.pk for question in questions])
+            )
+
+        self.questions_created += len(questions)
+        self.choices_created += len(choices)
+        self._category_ids.update(question.category_id for question in questions)
+
+    def finish(self):
+        """Write the remaining questions and invalidate the affected caches."""
+        self.flush()
+        self.invalidate_caches()
+        self._finished = time.perf_counter()
+
+    def invalidate_caches(self):
+        """
+        Invalidate the caches of the categories written to so far.
+
+        Runs when the current transaction commits (straight away outside of
+        one), and not at all if it is rolled back.
+        """
+        category_ids = set(self._category_ids)
+        if category_ids:
+            transaction.on_commit(lambda: _invalidate_category_caches(category_ids))
+
+    @property
+    def elapsed(self):
+        """Seconds spent importing (up to now if not finished)."""
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return end - self._started
+
+    def rows_per_second(self):
+        """Return the number of question and choice rows written per second."""
+        elapsed = self.elapsed
+        rows = self.questions_created + self.choices_created
+        return rows / elapsed if elapsed > 0 else float(rows)
+
+    def summary(self):
+        """Return a one-line report of the import."""
+        return (
+            f'Imported {self.questions_created} questions and {self.choices_created} choices '
+            f'in {self.elapsed:.2f}s ({self.rows_per_second():.0f} rows/s)'
+        )
+
+
+def question_record(question):
+    """Return the bank record of a question with its choices prefetched."""
+    return {
+        'category': question.category.name,
+        'difficulty': question.difficulty,
+        'text': question.text,
+        'explanation': question.explanation,
+        'choices': [
+            {'text': choice.text, 'is_correct': choice.is_correct}
+            for choice in question.choice_set.all()
+        ],
+    }
+
+
+def validate_record(record):
+    """
+    Check a bank record and return it with its defaults filled in.
+
+    Raises:
+        ValueError: If the record is not a valid question
+    """
+    if not isinstance(record, dict):
+        raise ValueError('Record is not an object')
+    for field in ('category', 'text'):
+        if not record.get(field):
+            raise ValueError(f"Missing '{field}'")
+    difficulty = record.get('difficulty') or 'medium'
+    if difficulty not in dict(Question.DIFFICULTY_CHOICES):
+        raise ValueError(f"Unknown difficulty {difficulty!r}")
+    choices = record.get('choices') or []
+    if not isinstance(choices, list):
+        raise ValueError("'choices' is not a list")
+    for choice in choices:
+        if not isinstance(choice, dict):
+            raise ValueError('A choice is not an object')
+        if not choice.get('text'):
+            raise ValueError("A choice is missing 'text'")
+    if len(choices) < 2:
+        raise ValueError('A question needs at least two choices')
+    if sum(bool(choice.get('is_correct')) for choice in choices) != 1:
+        raise ValueError('A question needs exactly one correct choice')
+    return {
+        'category': record['category'],
+        'difficulty': difficulty,
+        'text': record['text'],
+        'explanation': record.get('explanation') or '',
+        'choices': [(choice['text'], bool(choice.get('is_correct'))) for choice in choices],
+    }
+
+
+def _lines(stream):
+    """Yield the lines of a text stream without disabling stream.tell()."""
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        yield line
+
+
+def read_bank(stream, bank_format):
+    """
+    Read the question records of a bank.
+
+    The stream is read line by line and no further than the record being
+    yielded, so calling stream.tell() between records gives a position
+    that stream.seek() can later resume reading from.
+
+    Args:
+        stream: A text stream positioned at the start of a record (or of
+            the CSV header)
+        bank_format (str): 'jsonl' or 'csv'
+
+    Yields:
+        dict: The question records, unvalidated (see validate_record())
+
+    Raises:
+        ValueError: If a JSON Lines record is not valid JSON
+    """
+    if bank_format == 'jsonl':
+        for line in _lines(stream):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f'Invalid JSON: {e}') from e
+    elif bank_format == 'csv':
+        reader = csv.reader(_lines(stream))
+        if stream.tell() == 0:
+            next(reader, None)
+        for row in reader:
+            if not row:
+                continue
+            record = dict(zip(CSV_COLUMNS, row))
+            correct = record.pop('correct', '')
+            record['choices'] = [
+                {'text': text, 'is_correct': str(position) == correct}
+                for position, text in enumerate(row[len(CSV_COLUMNS):], 1)
+                if text
+            ]
+            yield record
+    else:
+        raise ValueError(f"Unknown bank format {bank_format!r}")
+
+
+class BankWriter:
+    """Write question records to a text stream in one of the bank formats."""
+
+    def __init__(self, stream, bank_format):
+        if bank_format not in BANK_FORMATS:
+            raise ValueError(f"Unknown bank format {bank_format!r}")
+        self.stream = stream
+        self.bank_format = bank_format
+        if bank_format == 'csv':
+            self._csv = csv.writer(stream)
+            self._csv.writerow(CSV_COLUMNS + ['choices'])
+
+    def write(self, record):
+        """Write one question record."""
+        if self.bank_format == 'jsonl':
+            self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+            return
+        choices = record['choices']
+        correct = next(
+            (position for position, choice in enumerate(choices, 1) if choice['is_correct']), ''
+        )
+        self._csv.writerow(
+            [record['category'], record['difficulty'], record['text'], record['explanation'], correct]
+            + [choice['text'] for choice in choices]
+        )
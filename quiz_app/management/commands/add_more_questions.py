@@ -8,7 +8,8 @@ without removing the existing questions.
 import random
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from quiz_app.models import Category, Question, Choice
+from quiz_app.importing import DEFAULT_BATCH_SIZE, QuestionImporter
+from quiz_app.models import Category
 
 class Command(BaseCommand):
     """Command to add more questions to existing categories."""
@@ -35,6 +36,12 @@ class Command(BaseCommand):
             default=True,
             help='Use local knowledge base instead of API for answers'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of questions inserted per batch'
+        )
     
     def handle(self, *args, **options):
         """Execute the command."""
@@ -51,81 +58,65 @@ class Command(BaseCommand):
         # Generate questions
         try:
             with transaction.atomic():
+                importer = QuestionImporter(batch_size=options['batch_size'])
                 for category in categories:
                     self.stdout.write(f"Adding {questions_per_category} questions to category: {category.name}")
                     self.generate_questions_for_category(
+                        importer,
                         category, 
                         questions_per_category, 
                         choices_per_question,
                         use_local
                     )
+                importer.finish()
             
             self.stdout.write(self.style.SUCCESS('Successfully added more questions!'))
-            self.stdout.write(f'Added {Question.objects.count() - (categories.count() * 5)} new questions')
+            self.stdout.write(importer.summary())
             
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error adding questions: {str(e)}'))
     
-    def generate_questions_for_category(self, category, count, choices_count, use_local):
-        """Generate questions for a specific category."""
+    def generate_questions_for_category(self, importer, category, count, choices_count, use_local):
+        """Queue generated questions for a specific category on the importer."""
         templates = self.get_question_templates(category.name)
         
         for i in range(count):
             template = random.choice(templates)
             question_text = self.generate_question_text(template, i)
             
-            question = Question.objects.create(
-                category=category,
-                text=question_text,
-                explanation=f"This is an explanation for the question about {category.name}.",
-                difficulty=random.choice(['easy', 'medium', 'hard'])
+            importer.add(
+                category,
+                question_text,
+                self.generate_choices(category, template, choices_count, use_local),
+                difficulty=random.choice(['easy', 'medium', 'hard']),
+                explanation=f"This is an explanation for the question about {category.name}."
             )
-            
-            self.generate_choices(question, template, choices_count, use_local)
     
     def generate_question_text(self, template, index):
         """Generate question text from a template."""
         return f"{template} (Question {index + 1})"
     
-    def generate_choices(self, question, template, count, use_local):
-        """Generate choices for a question."""
+    def generate_choices(self, category, template, count, use_local):
+        """Return (text, is_correct) choices for a question generated from template."""
         # Get AI-generated answers using local knowledge base or API
-        question_text = question.text.split(" (Question")[0]  # Remove the index suffix
-        category_name = question.category.name
+        question_text = template
         
-        new_choices = self.get_answers_local(question_text, category_name)
+        new_choices = self.get_answers_local(question_text, category.name)
         
         if not new_choices or 'correct' not in new_choices or not new_choices['incorrect']:
             self.stdout.write(self.style.WARNING(f'  Failed to get valid answers for question: {question_text}'))
             
             # Fallback to placeholder if AI generation fails
-            Choice.objects.create(
-                question=question,
-                text=f"Correct answer for: {question_text}",
-                is_correct=True
-            )
-            
+            choices = [(f"Correct answer for: {question_text}", True)]
             for i in range(count - 1):
-                Choice.objects.create(
-                    question=question,
-                    text=f"Incorrect answer {i + 1} for: {question_text}",
-                    is_correct=False
-                )
-        else:
-            # Create new correct choice
-            Choice.objects.create(
-                question=question,
-                text=new_choices['correct'],
-                is_correct=True
-            )
-            
-            # Create new incorrect choices
-            for incorrect_text in new_choices['incorrect'][:count-1]:  # Limit to requested number of choices
-                Choice.objects.create(
-                    question=question,
-                    text=incorrect_text,
-                    is_correct=False
-                )
+                choices.append((f"Incorrect answer {i + 1} for: {question_text}", False))
+            return choices
+        
+        # The correct choice, then the incorrect ones (limited to the requested number of choices)
+        choices = [(new_choices['correct'], True)]
+        for incorrect_text in new_choices['incorrect'][:count-1]:
+            choices.append((incorrect_text, False))
+        return choices
     
     def get_answers_local(self, question_text, category_name):
         """
@@ -0,0 +1,59 @@
+"""
+Management command to rebuild the materialized leaderboards.
+
+LeaderboardEntry and LeaderboardBucket rows are normally maintained
+incrementally as quiz attempts are completed. Run this command once after
+migrating to fill them from existing QuizAttempt rows, or any time the
+leaderboards need to be rebuilt. Users are processed in chunks; each
+chunk's entries are replaced in a single transaction (see
+LeaderboardEntry.rebuild). The rank histogram is then recounted from the
+entries.
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from quiz_app.models import LeaderboardBucket, LeaderboardEntry, QuizAttempt
+
+
+class Command(BaseCommand):
+    """Command to rebuild the leaderboards from quiz attempts."""
+
+    help = 'Rebuilds the leaderboards from completed quiz attempts, in chunks of users'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of users processed per transaction'
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        chunk_size = options['chunk_size']
+        completed = QuizAttempt.objects.filter(completed_at__isnull=False, user__isnull=False)
+        # Users with completed attempts, and users whose attempts have all been deleted
+        user_ids = User.objects.filter(
+            Q(pk__in=completed.values('user_id'))
+            | Q(pk__in=LeaderboardEntry.objects.values('user_id'))
+        ).order_by('pk').values_list('pk', flat=True)
+
+        users = rows = 0
+        last_pk = 0
+        while True:
+            chunk = list(user_ids.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1]
+            rows += LeaderboardEntry.rebuild(chunk)
+            users += len(chunk)
+            self.stdout.write(f'Processed {users} users')
+
+        buckets = LeaderboardBucket.recount()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rows} leaderboard entries for {users} users ({buckets} rank buckets)'
+        ))
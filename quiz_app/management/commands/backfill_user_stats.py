@@ -0,0 +1,55 @@
+"""
+Management command to rebuild the materialized UserStats table.
+
+UserStats rows are normally maintained incrementally as quiz attempts are
+completed. Run this command once after migrating to fill the table from
+existing QuizAttempt rows, or any time the statistics need to be rebuilt.
+Users are processed in chunks; each chunk's statistics are aggregated in
+the database and replaced in a single transaction (see UserStats.rebuild).
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from quiz_app.models import QuizAttempt, UserStats
+
+
+class Command(BaseCommand):
+    """Command to rebuild per-user quiz statistics from quiz attempts."""
+
+    help = 'Rebuilds the UserStats table from completed quiz attempts, in chunks of users'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of users processed per transaction'
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        chunk_size = options['chunk_size']
+        completed = QuizAttempt.objects.filter(completed_at__isnull=False, user__isnull=False)
+        user_ids = User.objects.filter(
+            pk__in=completed.values('user_id')
+        ).order_by('pk').values_list('pk', flat=True)
+
+        users = rows = 0
+        last_pk = 0
+        while True:
+            chunk = list(user_ids.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1]
+            rows += UserStats.rebuild(chunk)
+            users += len(chunk)
+            self.stdout.write(f'Processed {users} users')
+
+        # Users whose completed attempts have all been deleted
+        stale, _ = UserStats.objects.exclude(user_id__in=completed.values('user_id')).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rows} statistics rows for {users} users ({stale} stale rows removed)'
+        ))
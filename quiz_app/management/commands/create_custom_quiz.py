@@ -6,7 +6,8 @@ This command creates specified categories and adds questions to each category.
 
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from quiz_app.models import Category, Question, Choice
+from quiz_app.importing import QuestionImporter
+from quiz_app.models import Category
 
 class Command(BaseCommand):
     """Command to create custom categories and questions."""
@@ -1156,7 +1157,8 @@ class Command(BaseCommand):
 
         try:
             with transaction.atomic():
-                # Create categories and questions
+                # Create categories and queue their questions for bulk insertion
+                importer = QuestionImporter()
                 for category_data in categories_data:
                     # Create category
                     category = Category.objects.create(
@@ -1166,24 +1168,20 @@ class Command(BaseCommand):
                     )
                     self.stdout.write(f'Created category: {category.name}')
 
-                    # Create questions for this category
+                    # Queue the questions for this category with their choices
                     for question_data in category_data['questions']:
-                        question = Question.objects.create(
-                            category=category,
-                            text=question_data['text'],
+                        importer.add(
+                            category,
+                            question_data['text'],
+                            question_data['choices'],
                             difficulty=question_data['difficulty'],
                             explanation=question_data['explanation']
                         )
+                        if options['verbosity'] >= 2:
+                            self.stdout.write(f'  Queued question: {question_data["text"][:50]}...')
+                importer.finish()
 
-                        # Create choices for this question
-                        for choice_data in question_data['choices']:
-                            Choice.objects.create(
-                                question=question,
-                                text=choice_data['text'],
-                                is_correct=choice_data['is_correct']
-                            )
-                        self.stdout.write(f'  Created question: {question.text[:50]}...')
-
+            self.stdout.write(importer.summary())
             self.stdout.write(self.style.SUCCESS('Successfully created categories and questions!'))
 
         except Exception as e:
@@ -0,0 +1,59 @@
+"""
+Management command to close timed quiz attempts whose time limit has run out.
+
+QuestionView only enforces a time limit when the user comes back to the
+quiz, so abandoned timed attempts would otherwise stay open forever. This
+command closes them (see QuizAttempt.close_expired): completed_at is set to
+the attempt's deadline, and its score is the answers recorded in time.
+
+Run it from cron, or with --loop as a long-running worker:
+
+    python manage.py expire_quiz_attempts
+    python manage.py expire_quiz_attempts --loop --interval 30
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from quiz_app.models import QuizAttempt
+
+
+class Command(BaseCommand):
+    """Command to complete expired timed quiz attempts."""
+
+    help = 'Completes open timed quiz attempts whose time limit has run out'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of attempts closed per UPDATE'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep sweeping every --interval seconds instead of exiting'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Seconds between sweeps with --loop'
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        while True:
+            started = time.perf_counter()
+            closed = QuizAttempt.close_expired(batch_size=options['batch_size'])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'Closed {closed} expired quiz attempts in {elapsed:.2f}s')
+            if not options['loop']:
+                break
+            # Don't hold a connection the database may time out between sweeps
+            close_old_connections()
+            time.sleep(options['interval'])
@@ -0,0 +1,79 @@
+"""
+Management command to export the question bank as JSON Lines or CSV.
+
+Questions are read in primary key order with Queryset.iterator(), in chunks
+whose choices are prefetched together, and written one record at a time,
+so the memory used does not grow with the size of the bank. The output can
+be loaded into another environment with import_questions.
+"""
+
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Prefetch
+
+from quiz_app.importing import BANK_FORMATS, BankWriter, question_record
+from quiz_app.models import Choice, Question
+
+
+class Command(BaseCommand):
+    """Command to stream the question bank to a file."""
+
+    help = 'Exports questions with their choices as JSON Lines or CSV'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            'output',
+            help="File to write ('-' for standard output)"
+        )
+        parser.add_argument(
+            '--format',
+            choices=BANK_FORMATS,
+            help='Output format (default: from the file extension, else jsonl)'
+        )
+        parser.add_argument(
+            '--category',
+            action='append',
+            default=[],
+            help='Only export questions of this category (repeatable)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Number of questions fetched from the database at a time'
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        output = options['output']
+        bank_format = options['format'] or (
+            'csv' if output.lower().endswith('.csv') else 'jsonl'
+        )
+
+        questions = Question.objects.select_related('category').prefetch_related(
+            Prefetch('choice_set', queryset=Choice.objects.order_by('pk'))
+        ).order_by('pk')
+        if options['category']:
+            questions = questions.filter(category__name__in=options['category'])
+
+        if output == '-':
+            self._export(questions, sys.stdout, bank_format, options['chunk_size'])
+            return
+
+        if os.path.isdir(output):
+            raise CommandError(f'{output} is a directory')
+        with open(output, 'w', encoding='utf-8', newline='') as stream:
+            exported = self._export(questions, stream, bank_format, options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Exported {exported} questions to {output}'))
+
+    def _export(self, questions, stream, bank_format, chunk_size):
+        """Write every question to stream; return the number written."""
+        writer = BankWriter(stream, bank_format)
+        exported = 0
+        for question in questions.iterator(chunk_size=chunk_size):
+            writer.write(question_record(question))
+            exported += 1
+        return exported
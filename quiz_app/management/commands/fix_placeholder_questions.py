@@ -3,15 +3,22 @@ Management command to replace placeholder answers with real answers.
 
 This command identifies questions with placeholder answers and replaces them with 
 real answers using an integrated AI service.
+
+Answers are fetched from the answer API (see quiz_app.answer_api) by a pool
+of worker threads sharing one token-bucket rate limiter, so several requests
+are in flight while the API's rate limit is still respected. Failed requests
+are retried with backoff. The worker threads never touch the database: the
+main thread collects their answers and replaces the choices of a whole batch
+of questions in one transaction.
 """
 
-import json
-import requests
-import time
-import random
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from django.conf import settings
+from django.db.models import Exists, OuterRef
+from quiz_app.answer_api import AnswerAPIError, AnswerClient
 from quiz_app.models import Question, Choice, Category
 
 class Command(BaseCommand):
@@ -36,6 +43,33 @@ class Command(BaseCommand):
             action='store_true',
             help='Use local knowledge base instead of API'
         )
+        parser.add_argument(
+            '--api-url',
+            help='Answer API endpoint (default: QUIZ_ANSWER_API_URL)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of concurrent API requests'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            help='API requests per second (default: QUIZ_ANSWER_API_RATE)'
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=3,
+            help='Retries of a failed API request'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of questions whose choices are replaced per transaction'
+        )
     
     def handle(self, *args, **options):
         """Execute the command."""
@@ -44,106 +78,147 @@ class Command(BaseCommand):
         dry_run = options.get('dry_run', False)
         use_local = options.get('use_local', False)
         
+        placeholder_questions = Question.objects.filter(
+            Exists(Choice.objects.filter(question=OuterRef('pk'), text__contains='Answer '))
+        )
         if category_name:
             try:
                 category = Category.objects.get(name=category_name)
-                placeholder_questions = Question.objects.filter(
-                    category=category,
-                    choice__text__contains='Answer '
-                ).distinct()
             except Category.DoesNotExist:
                 self.stdout.write(self.style.ERROR(f'Category "{category_name}" not found.'))
                 return
-        else:
-            placeholder_questions = Question.objects.filter(
-                choice__text__contains='Answer '
-            ).distinct()
+            placeholder_questions = placeholder_questions.filter(category=category)
         
-        self.stdout.write(f'Found {placeholder_questions.count()} questions with placeholder answers')
+        # Read the questions up front; the choices are rewritten while processing them
+        questions = list(placeholder_questions.annotate(
+            has_correct=Exists(Choice.objects.filter(question=OuterRef('pk'), is_correct=True))
+        ).order_by('pk').values_list('id', 'text', 'category__name', 'has_correct'))
+        total = len(questions)
+        self.stdout.write(f'Found {total} questions with placeholder answers')
         
         if dry_run:
             self.stdout.write('Dry run mode - no changes will be made')
         
-        count = 0
+        # Without a correct choice there is no answer to keep, so don't ask for one
+        for question_id, _, _, has_correct in questions:
+            if not has_correct:
+                self.stdout.write(self.style.WARNING(f'  No correct choice found for question {question_id}'))
+        questions = [question for question in questions if question[3]]
+        
+        if use_local:
+            fetch, workers = self.get_answers_local, 1
+        elif options['api_url'] or settings.QUIZ_ANSWER_API_URL:
+            client = AnswerClient(
+                url=options['api_url'], rate=options['rate'], retries=options['retries']
+            )
+            fetch, workers = client.get_answers, options['workers']
+        else:
+            self.stdout.write(self.style.WARNING(
+                'No answer API configured (QUIZ_ANSWER_API_URL); using the local knowledge base'
+            ))
+            fetch, workers = self.get_answers_local, 1
         
-        # Process questions
-        for question in placeholder_questions:
+        count = updated = failed = 0
+        pending = {}
+        for (question_id, question_text, _, _), new_choices in self.fetch_answers(
+            questions, fetch, workers
+        ):
             count += 1
-            self.stdout.write(f'Processing question {count}/{placeholder_questions.count()}: {question.text}')
-            
-            # Get current choices (to know which one is correct)
-            choices = Choice.objects.filter(question=question)
-            correct_choice = next((c for c in choices if c.is_correct), None)
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'Processing question {count}/{total}: {question_text}')
             
-            if not correct_choice:
-                self.stdout.write(self.style.WARNING(f'  No correct choice found for question {question.id}'))
+            if isinstance(new_choices, AnswerAPIError):
+                self.stdout.write(self.style.ERROR(f'  API error for question {question_id}: {new_choices}'))
+                failed += 1
                 continue
-                
-            if use_local:
-                new_choices = self.get_answers_local(question.text, question.category.name)
-            else:
-                new_choices = self.get_answers_api(question.text, question.category.name)
             
             if not new_choices or 'correct' not in new_choices or not new_choices['incorrect']:
-                self.stdout.write(self.style.ERROR(f'  Failed to get valid answers for question {question.id}'))
+                self.stdout.write(self.style.ERROR(f'  Failed to get valid answers for question {question_id}'))
+                failed += 1
                 continue
             
-            if not dry_run:
-                with transaction.atomic():
-                    # Delete old choices
-                    Choice.objects.filter(question=question).delete()
-                    
-                    # Create new correct choice
-                    Choice.objects.create(
-                        question=question,
-                        text=new_choices['correct'],
-                        is_correct=True
-                    )
-                    
-                    # Create new incorrect choices
-                    for incorrect_text in new_choices['incorrect']:
-                        Choice.objects.create(
-                            question=question,
-                            text=incorrect_text,
-                            is_correct=False
-                        )
-                    
-                self.stdout.write(self.style.SUCCESS(f'  Updated choices for question {question.id}'))
-            else:
-                self.stdout.write(f'  Would update question {question.id} with:')
+            if dry_run:
+                self.stdout.write(f'  Would update question {question_id} with:')
                 self.stdout.write(f'  - Correct: {new_choices["correct"]}')
                 for i, choice in enumerate(new_choices['incorrect']):
                     self.stdout.write(f'  - Incorrect {i+1}: {choice}')
+                continue
             
-            # Sleep to avoid rate limiting if using API
-            if not use_local and count < placeholder_questions.count():
-                time.sleep(1)
+            pending[question_id] = new_choices
+            if len(pending) >= options['batch_size']:
+                updated += self.replace_choices(pending)
+                pending = {}
+                self.stdout.write(f'Updated {updated}/{total} questions')
+        updated += self.replace_choices(pending)
         
         if count == 0:
             self.stdout.write(self.style.SUCCESS('No placeholder questions found.'))
         elif not dry_run:
-            self.stdout.write(self.style.SUCCESS(f'Successfully updated {count} questions.'))
+            self.stdout.write(self.style.SUCCESS(
+                f'Successfully updated {updated} questions ({failed} failed).'
+            ))
         else:
             self.stdout.write(self.style.SUCCESS(f'Dry run completed for {count} questions.'))
     
-    def get_answers_api(self, question_text, category_name):
+    def fetch_answers(self, questions, fetch, workers):
         """
-        Get answers from an external AI API service.
+        Fetch the answers of questions, yielding (question, answers) as they arrive.
         
-        Uses a simplified version without API credentials since this is a demo.
-        In a real implementation, you would use your actual API credentials.
+        With more than one worker the answers are fetched by a thread pool
+        that never has more than twice as many requests queued as it has
+        workers; they are yielded in completion order. A failed fetch
+        yields its exception in place of the answers.
         """
-        try:
-            # Mock API call - in a real implementation, this would call OpenAI or similar
-            # API endpoint
-            self.stdout.write('  Making API call...')
-            
-            # Return a mock response for demo purposes
-            return self.get_answers_local(question_text, category_name)
-            
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'  API error: {str(e)}'))
-            return None
+        def fetch_one(question):
+            try:
+                return fetch(question[1], question[2])
+            except AnswerAPIError as e:
+                return e
+        
+        if workers <= 1:
+            for question in questions:
+                yield question, fetch_one(question)
+            return
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = {}
+            remaining = iter(questions)
+            while True:
+                for question in remaining:
+                    in_flight[executor.submit(fetch_one, question)] = question
+                    if len(in_flight) >= workers * 2:
+                        break
+                if not in_flight:
+                    return
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield in_flight.pop(future), future.result()
+    
+    def replace_choices(self, answers):
+        """
+        Replace the choices of several questions in one transaction.
+        
+        Args:
+            answers (dict): New answers ({'correct': str, 'incorrect': [str]})
+                keyed by question ID
+        
+        Returns:
+            int: The number of questions updated
+        """
+        if not answers:
+            return 0
+        with transaction.atomic():
+            Choice.objects.filter(question_id__in=answers).delete()
+            Choice.objects.bulk_create([
+                Choice(question_id=question_id, text=text, is_correct=is_correct)
+                for question_id, new_choices in answers.items()
+                for text, is_correct in (
+                    [(new_choices['correct'], True)]
+                    + [(text, False) for text in new_choices['incorrect']]
+                )
+            ])
+            Question.link_correct_choices(Question.objects.filter(pk__in=list(answers)))
+        return len(answers)
     
     def get_answers_local(self, question_text, category_name):
         """
@@ -0,0 +1,141 @@
+"""
+Management command to import a question bank from JSON Lines or CSV.
+
+The file is read one record at a time and written through QuestionImporter,
+one transaction per batch, so banks of millions of questions are imported
+in constant memory. Categories are looked up by name and created when
+missing.
+
+After every committed batch the file position of the next record is saved
+to a checkpoint file. If an import stops part way (an invalid record, a
+crash), fix the cause and run the command again with --resume: it seeks
+past the records that were already committed instead of importing them a
+second time. The checkpoint is deleted once the whole file is imported.
+"""
+
+import csv
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz_app.importing import (
+    BANK_FORMATS, DEFAULT_BATCH_SIZE, QuestionImporter, read_bank, validate_record,
+)
+from quiz_app.models import Category
+
+
+class Command(BaseCommand):
+    """Command to stream a question bank into the database."""
+
+    help = 'Imports questions with their choices from JSON Lines or CSV, in resumable batches'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            'input',
+            help='File to read'
+        )
+        parser.add_argument(
+            '--format',
+            choices=BANK_FORMATS,
+            help='Input format (default: from the file extension, else jsonl)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of questions committed per transaction'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Checkpoint file (default: the input file name with .checkpoint appended)'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue after the records committed by a previous run'
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        path = options['input']
+        if not os.path.isfile(path):
+            raise CommandError(f'{path} does not exist or is not a file')
+        bank_format = options['format'] or (
+            'csv' if path.lower().endswith('.csv') else 'jsonl'
+        )
+        checkpoint_path = options['checkpoint'] or f'{path}.checkpoint'
+
+        position, records = 0, 0
+        if os.path.exists(checkpoint_path):
+            if not options['resume']:
+                raise CommandError(
+                    f'A checkpoint from an unfinished import exists at {checkpoint_path}. '
+                    f'Use --resume to continue it, or delete it to start over.'
+                )
+            with open(checkpoint_path, encoding='utf-8') as checkpoint:
+                state = json.load(checkpoint)
+            position, records = state['position'], state['records']
+            self.stdout.write(f'Resuming after {records} imported records')
+
+        importer = QuestionImporter(batch_size=options['batch_size'])
+        categories = {}
+        try:
+            with open(path, encoding='utf-8', newline='') as stream:
+                stream.seek(position)
+                for record in self._read_records(stream, bank_format, path, records):
+                    committed = importer.questions_created
+                    importer.add(
+                        self._get_category(categories, record['category']),
+                        record['text'],
+                        record['choices'],
+                        difficulty=record['difficulty'],
+                        explanation=record['explanation'],
+                    )
+                    records += 1
+                    if importer.questions_created != committed:
+                        # The batch including this record was just committed
+                        self._save_checkpoint(checkpoint_path, stream.tell(), records)
+                        self.stdout.write(f'Imported {records} records')
+            importer.finish()
+        except Exception:
+            # Batches committed before the failure are visible already
+            importer.invalidate_caches()
+            raise
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        self.stdout.write(self.style.SUCCESS(importer.summary()))
+
+    def _read_records(self, stream, bank_format, path, records):
+        """
+        Yield the validated records of a bank.
+
+        Raises:
+            CommandError: If a record cannot be read or is not a valid
+                question, naming the record (counted on from records)
+        """
+        bank = read_bank(stream, bank_format)
+        while True:
+            try:
+                record = validate_record(next(bank))
+            except StopIteration:
+                return
+            except (ValueError, csv.Error) as e:
+                raise CommandError(f'Record {records + 1} of {path}: {e}')
+            records += 1
+            yield record
+
+    def _get_category(self, categories, name):
+        """Return the category called name, creating it if needed."""
+        if name not in categories:
+            categories[name], _ = Category.objects.get_or_create(name=name)
+        return categories[name]
+
+    def _save_checkpoint(self, checkpoint_path, position, records):
+        """Record that the file is imported up to position."""
+        temp_path = f'{checkpoint_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as checkpoint:
+            json.dump({'position': position, 'records': records}, checkpoint)
+        os.replace(temp_path, checkpoint_path)
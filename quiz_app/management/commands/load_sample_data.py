@@ -8,6 +8,7 @@ for testing and demonstration purposes.
 import random
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from quiz_app.importing import QuestionImporter
 from quiz_app.models import Category, Question, Choice
 
 
@@ -340,7 +341,8 @@ class Command(BaseCommand):
             Question.objects.all().delete()
             Choice.objects.all().delete()
             
-            # Create categories and questions
+            # Create categories and queue their questions for bulk insertion
+            importer = QuestionImporter()
             for category_data in categories:
                 category = Category.objects.create(
                     name=category_data['name'],
@@ -349,18 +351,14 @@ class Command(BaseCommand):
                 )
                 
                 for question_data in category_data['questions']:
-                    question = Question.objects.create(
-                        text=question_data['text'],
+                    importer.add(
+                        category,
+                        question_data['text'],
+                        question_data['choices'],
                         difficulty=question_data['difficulty'],
-                        explanation=question_data['explanation'],
-                        category=category
+                        explanation=question_data['explanation']
                     )
-                    
-                    for choice_data in question_data['choices']:
-                        Choice.objects.create(
-                            text=choice_data['text'],
-                            is_correct=choice_data['is_correct'],
-                            question=question
-                        )
+            importer.finish()
             
+            self.stdout.write(importer.summary())
             self.stdout.write(self.style.SUCCESS('Successfully loaded sample quiz data!')) 
\ No newline at end of file
@@ -8,7 +8,8 @@ It creates varied question content and randomizes the correct answers to avoid p
 import random
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from quiz_app.models import Category, Question, Choice
+from quiz_app.importing import DEFAULT_BATCH_SIZE, QuestionImporter
+from quiz_app.models import Category, Question
 
 class Command(BaseCommand):
     """Command to populate quiz questions."""
@@ -29,6 +30,12 @@ class Command(BaseCommand):
             default=4,
             help='Number of choices per question'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of questions inserted per batch'
+        )
     
     def handle(self, *args, **options):
         """Execute the command."""
@@ -44,20 +51,24 @@ class Command(BaseCommand):
         # Generate questions
         try:
             with transaction.atomic():
+                importer = QuestionImporter(batch_size=options['batch_size'])
                 for category in categories:
                     self.generate_questions_for_category(
+                        importer,
                         category, 
                         questions_per_category, 
                         choices_per_question
                     )
+                importer.finish()
                     
+                self.stdout.write(importer.summary())
                 self.stdout.write(self.style.SUCCESS(f'Successfully generated {questions_per_category} questions for each category'))
                 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error generating questions: {str(e)}'))
     
-    def generate_questions_for_category(self, category, count, choices_count):
-        """Generate questions for a specific category."""
+    def generate_questions_for_category(self, importer, category, count, choices_count):
+        """Queue generated questions for a specific category on the importer."""
         self.stdout.write(f'Generating {count} questions for category: {category.name}')
         
         # Get template questions for each category
@@ -79,21 +90,17 @@ class Command(BaseCommand):
             # Generate question text
             question_text = self.generate_question_text(template, i + existing_questions)
             
-            # Create the question
             difficulty = random.choice(['easy', 'medium', 'hard'])
             explanation = f"Explanation for {question_text}"
             
-            question = Question.objects.create(
-                category=category,
-                text=question_text,
-                explanation=explanation,
-                difficulty=difficulty
+            # Queue the question with its choices (correct answer at a random position)
+            importer.add(
+                category,
+                question_text,
+                self.generate_choices(template, choices_count),
+                difficulty=difficulty,
+                explanation=explanation
             )
-            
-            # Generate choices with randomized position for correct answer
-            self.generate_choices(question, template, choices_count)
-            
-            self.stdout.write(f'  Created question: {question_text[:50]}...')
     
     def generate_question_text(self, template, index):
         """Generate question text from a template."""
@@ -112,8 +119,8 @@ class Command(BaseCommand):
             # Just use the template as is
             return template
     
-    def generate_choices(self, question, template, count):
-        """Generate choices for a question, with randomized correct answer position."""
+    def generate_choices(self, template, count):
+        """Return (text, is_correct) choices with a randomized correct answer position."""
         if isinstance(template, dict) and 'choices' in template:
             # Get choices from template
             choices_data = template['choices']
@@ -130,27 +137,17 @@ class Command(BaseCommand):
                 all_choices.append({'text': text, 'is_correct': False})
             
             random.shuffle(all_choices)
-            
-            # Create the choices
-            for choice_data in all_choices:
-                Choice.objects.create(
-                    question=question,
-                    text=choice_data['text'],
-                    is_correct=choice_data['is_correct']
-                )
+            return all_choices
         else:
             # Create generic choices
             correct_position = random.randint(0, count - 1)
             
+            choices = []
             for i in range(count):
                 is_correct = (i == correct_position)
                 choice_text = f"Answer {chr(65 + i)}" + (" (Correct)" if is_correct else "")
-                
-                Choice.objects.create(
-                    question=question,
-                    text=choice_text,
-                    is_correct=is_correct
-                )
+                choices.append((choice_text, is_correct))
+            return choices
     
     def get_question_templates(self, category_name):
         """Get question templates for a specific category."""
@@ -0,0 +1,86 @@
+"""
+Management command to rebuild quiz attempt counters from recorded responses.
+
+QuizAttempt.score and QuizAttempt.answered_count are maintained incrementally
+as responses are recorded. If a process dies between inserting a response
+and incrementing the counters, or responses are edited outside the app,
+the counters can drift. This command recounts them from QuizResponse rows
+and repairs every attempt that does not match. The statistics and
+leaderboard entries of the users whose completed attempts were repaired
+are then rebuilt, as they were computed from the drifted scores.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from quiz_app.models import LeaderboardEntry, QuizAttempt, UserStats
+
+
+class Command(BaseCommand):
+    """Command to check and repair quiz attempt score counters."""
+
+    help = 'Rebuilds QuizAttempt score and answered_count from recorded responses'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of attempts repaired per UPDATE batch'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report inconsistent attempts without repairing them'
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        # Only attempts whose stored counters disagree with their responses
+        mismatched = QuizAttempt.objects.annotate(
+            actual_answered=Count('quizresponse'),
+            actual_score=Count('quizresponse', filter=Q(quizresponse__is_correct=True)),
+        ).exclude(
+            answered_count=F('actual_answered'),
+            score=F('actual_score'),
+        ).order_by('pk').only('pk', 'user_id', 'completed_at', 'score', 'answered_count')
+
+        repaired = 0
+        batch = []
+        user_ids = set()
+        for attempt in mismatched.iterator(chunk_size=batch_size):
+            self.stdout.write(
+                f'Attempt {attempt.pk}: score {attempt.score} -> {attempt.actual_score}, '
+                f'answered {attempt.answered_count} -> {attempt.actual_answered}'
+            )
+            attempt.score = attempt.actual_score
+            attempt.answered_count = attempt.actual_answered
+            batch.append(attempt)
+            if attempt.completed_at is not None and attempt.user_id is not None:
+                user_ids.add(attempt.user_id)
+            if len(batch) >= batch_size:
+                repaired += self._repair(batch, dry_run)
+                batch = []
+        repaired += self._repair(batch, dry_run)
+        if user_ids and not dry_run:
+            user_ids = sorted(user_ids)
+            UserStats.rebuild(user_ids)
+            LeaderboardEntry.rebuild(user_ids)
+            self.stdout.write(f'Rebuilt the statistics of {len(user_ids)} users')
+
+        if dry_run:
+            self.stdout.write(f'Dry run - {repaired} inconsistent attempts found, none repaired')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {repaired} quiz attempts'))
+
+    def _repair(self, attempts, dry_run):
+        """Write the recounted counters of a batch of attempts."""
+        if attempts and not dry_run:
+            with transaction.atomic():
+                QuizAttempt.objects.bulk_update(attempts, ['score', 'answered_count'])
+        return len(attempts)
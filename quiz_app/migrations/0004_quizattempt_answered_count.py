@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:38
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    """Set score and answered_count of existing attempts from their responses."""
+    QuizAttempt = apps.get_model('quiz_app', 'QuizAttempt')
+    QuizResponse = apps.get_model('quiz_app', 'QuizResponse')
+
+    def response_count(**filters):
+        return Coalesce(models.Subquery(
+            QuizResponse.objects.filter(quiz_attempt=models.OuterRef('pk'), **filters)
+            .values('quiz_attempt')
+            .annotate(count=models.Count('id'))
+            .values('count')
+        ), 0)
+
+    QuizAttempt.objects.update(
+        answered_count=response_count(),
+        score=response_count(is_correct=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0003_quizattempt_time_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizattempt',
+            name='answered_count',
+            field=models.IntegerField(default=0, help_text='The number of questions answered so far'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('quiz_app', '0004_quizattempt_answered_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempts', models.IntegerField(default=0, help_text='Number of completed quiz attempts')),
+                ('percentage_sum', models.FloatField(default=0, help_text='Sum of the score percentages of all completed attempts')),
+                ('best_percentage', models.FloatField(blank=True, help_text='Highest score percentage achieved', null=True)),
+                ('worst_percentage', models.FloatField(blank=True, help_text='Lowest score percentage achieved', null=True)),
+                ('perfect_count', models.IntegerField(default=0, help_text='Number of attempts with a 100% score')),
+                ('last_attempt_at', models.DateTimeField(blank=True, help_text='When the most recent attempt was completed', null=True)),
+                ('category', models.ForeignKey(blank=True, help_text='The category these statistics cover (null for all categories)', null=True, on_delete=django.db.models.deletion.CASCADE, to='quiz_app.category')),
+                ('user', models.ForeignKey(help_text='The user these statistics belong to', on_delete=django.db.models.deletion.CASCADE, related_name='quiz_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'User stats',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='userstats',
+            constraint=models.UniqueConstraint(fields=('user', 'category'), name='unique_user_category_stats'),
+        ),
+        migrations.AddConstraint(
+            model_name='userstats',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('user',), name='unique_user_overall_stats'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0005_userstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='choice',
+            index=models.Index(condition=models.Q(('is_correct', True)), fields=['question'], name='choice_correct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['category', 'id'], name='question_category_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(condition=models.Q(('completed_at__isnull', False)), fields=['user', '-started_at'], name='attempt_user_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizresponse',
+            index=models.Index(condition=models.Q(('is_correct', True)), fields=['quiz_attempt'], name='response_correct_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def link_correct_choices(apps, schema_editor):
+    """Point existing questions at their correct choice."""
+    Question = apps.get_model('quiz_app', 'Question')
+    Choice = apps.get_model('quiz_app', 'Choice')
+
+    Question.objects.update(correct_choice=models.Subquery(
+        Choice.objects.filter(question=models.OuterRef('pk'), is_correct=True)
+        .order_by('-pk')
+        .values('pk')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0006_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='correct_choice',
+            field=models.ForeignKey(blank=True, editable=False, help_text='The correct choice (kept in sync by Choice.save)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='quiz_app.choice'),
+        ),
+        migrations.RunPython(link_correct_choices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0007_question_correct_choice'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(condition=models.Q(('completed_at__isnull', True), ('time_limit__gt', 0)), fields=['time_limit', 'started_at'], name='attempt_open_timed_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:15
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def set_deadlines(apps, schema_editor):
+    """Store the deadline of existing timed attempts."""
+    QuizAttempt = apps.get_model('quiz_app', 'QuizAttempt')
+
+    timed = QuizAttempt.objects.filter(time_limit__gt=0)
+    time_limits = timed.order_by('time_limit').values_list('time_limit', flat=True).distinct()
+    for time_limit in list(time_limits):
+        timed.filter(time_limit=time_limit).update(
+            deadline_at=models.F('started_at') + timedelta(seconds=time_limit)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0008_quizattempt_open_timed_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizattempt',
+            name='deadline_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the time limit runs out (null without a time limit; set by save)', null=True),
+        ),
+        migrations.RunPython(set_deadlines, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='quizattempt',
+            name='attempt_open_timed_idx',
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(condition=models.Q(('completed_at__isnull', True), ('deadline_at__isnull', False)), fields=['deadline_at'], name='attempt_open_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('quiz_app', '0009_quizattempt_deadline_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(help_text="'all' for the all-time leaderboard, or an ISO week like '2026-W42'", max_length=10)),
+                ('points', models.IntegerField(help_text='A points value')),
+                ('users', models.IntegerField(default=0, help_text='Number of users on the leaderboard with these points')),
+                ('category', models.ForeignKey(blank=True, help_text='The category of the leaderboard (null for all categories)', null=True, on_delete=django.db.models.deletion.CASCADE, to='quiz_app.category')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(help_text="'all' for the all-time leaderboard, or an ISO week like '2026-W42'", max_length=10)),
+                ('points', models.IntegerField(default=0, help_text='Correct answers in the period and category')),
+                ('updated_at', models.DateTimeField(help_text='When the user reached their current points')),
+                ('category', models.ForeignKey(blank=True, help_text='The category of the leaderboard (null for all categories)', null=True, on_delete=django.db.models.deletion.CASCADE, to='quiz_app.category')),
+                ('user', models.ForeignKey(help_text='The user ranked by this entry', on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Leaderboard entries',
+                'indexes': [models.Index(fields=['period', 'category', '-points', 'updated_at'], name='leaderboard_top_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('user', 'period', 'category'), name='unique_user_leaderboard_entry'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('user', 'period'), name='unique_user_overall_leaderboard_entry'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardbucket',
+            constraint=models.UniqueConstraint(fields=('period', 'category', 'points'), name='unique_leaderboard_bucket'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardbucket',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('period', 'points'), name='unique_overall_leaderboard_bucket'),
+        ),
+    ]
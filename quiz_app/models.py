@@ -8,11 +8,20 @@ This module defines the database models used in the quiz application:
 - QuizAttempt: Record of a user's quiz attempt
 - QuizResponse: Individual answers within a quiz attempt
 - UserProfile: Extended user information
+- UserStats: Materialized per-user (and per-category) quiz statistics
+- LeaderboardEntry: A user's points on an all-time or weekly leaderboard
+- LeaderboardBucket: Number of users per points value of a leaderboard
 """
 
-from django.db import models
+import math
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Cast, Coalesce, Greatest, Least
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -95,20 +104,55 @@ class Question(models.Model):
         auto_now=True,
         help_text="When the question was last updated"
     )
+    correct_choice = models.ForeignKey(
+        'Choice',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        help_text="The correct choice (kept in sync by Choice.save)"
+    )
     
     class Meta:
         ordering = ['category', 'difficulty', 'created_at']
+        indexes = [
+            # Question ID lists of a category (sampling, question index)
+            models.Index(fields=['category', 'id'], name='question_category_id_idx'),
+        ]
     
     def __str__(self):
         """String representation of the question."""
         return f"{self.text[:50]}..." if len(self.text) > 50 else self.text
     
-    def correct_choice(self):
-        """Returns the correct choice for this question."""
-        try:
-            return self.choice_set.get(is_correct=True)
-        except (Choice.DoesNotExist, Choice.MultipleObjectsReturned):
-            return None
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored category so moving the question can be detected."""
+        instance = super().from_db(db, field_names, values)
+        instance._saved_category_id = instance.__dict__.get('category_id', models.DEFERRED)
+        return instance
+    
+    @classmethod
+    def link_correct_choices(cls, questions=None):
+        """
+        Point questions at their correct choice in a single UPDATE.
+        
+        Choices created with bulk_create() skip Choice.save(), so bulk loaders
+        call this once afterwards instead of saving every correct choice.
+        
+        Args:
+            questions (QuerySet): The questions to update (default: all)
+        
+        Returns:
+            int: The number of questions updated
+        """
+        if questions is None:
+            questions = cls.objects.all()
+        correct = Choice.objects.filter(
+            question=models.OuterRef('pk'),
+            is_correct=True
+        ).order_by('-pk').values('pk')[:1]
+        return questions.order_by().update(correct_choice=models.Subquery(correct))
 
 
 class Choice(models.Model):
@@ -134,22 +178,59 @@ class Choice(models.Model):
     
     class Meta:
         ordering = ['question', 'pk']
+        indexes = [
+            # The correct choice of a question
+            models.Index(
+                fields=['question'],
+                condition=models.Q(is_correct=True),
+                name='choice_correct_idx',
+            ),
+        ]
     
     def __str__(self):
         """String representation of the choice."""
         return self.text
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored is_correct flag so save() can detect changes."""
+        instance = super().from_db(db, field_names, values)
+        instance._saved_is_correct = instance.__dict__.get('is_correct', models.DEFERRED)
+        return instance
+    
     def save(self, *args, **kwargs):
         """
-        Override save method to ensure only one choice per question is marked correct.
+        Override save method to keep Question.correct_choice in sync.
+        
+        Marking a choice correct unmarks the question's other correct
+        choices, so only one choice per question is correct. They are found
+        through choice_correct_idx rather than the correct_choice pointer,
+        which is NULL for choices bulk-created without link_correct_choices().
         """
-        if self.is_correct:
-            # Set all other choices for this question to is_correct=False
-            Choice.objects.filter(
-                question=self.question, 
-                is_correct=True
-            ).update(is_correct=False)
-        super().save(*args, **kwargs)
+        was_correct = getattr(self, '_saved_is_correct', False) is True
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if self.is_correct and not was_correct:
+                Choice.objects.filter(
+                    question_id=self.question_id, is_correct=True
+                ).exclude(pk=self.pk).update(is_correct=False)
+                Question.objects.filter(pk=self.question_id).update(correct_choice=self)
+                self._set_question_pointer(self)
+            elif not self.is_correct and was_correct:
+                Question.objects.filter(
+                    pk=self.question_id, correct_choice=self
+                ).update(correct_choice=None)
+                self._set_question_pointer(None)
+        self._saved_is_correct = self.is_correct
+    
+    def _set_question_pointer(self, choice):
+        """Mirror a correct_choice update on the loaded question, if any."""
+        if Choice.question.is_cached(self):
+            self.question.correct_choice = choice
+
+
+class AttemptClosed(Exception):
+    """Raised when responses are added to a quiz attempt that is completed or out of time."""
 
 
 class QuizAttempt(models.Model):
@@ -192,9 +273,91 @@ class QuizAttempt(models.Model):
         default=0,
         help_text="Time limit for the quiz in seconds (0 means no limit)"
     )
+    deadline_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the time limit runs out (null without a time limit; set by save)"
+    )
+    answered_count = models.IntegerField(
+        default=0,
+        help_text="The number of questions answered so far"
+    )
     
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            # A user's completed attempts, newest first (profile, statistics)
+            models.Index(
+                fields=['user', '-started_at'],
+                condition=models.Q(completed_at__isnull=False),
+                name='attempt_user_completed_idx',
+            ),
+            # Open timed attempts by deadline (expiry, admin status filter)
+            models.Index(
+                fields=['deadline_at'],
+                condition=models.Q(completed_at__isnull=True, deadline_at__isnull=False),
+                name='attempt_open_deadline_idx',
+            ),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored completion time so save() can detect completion."""
+        instance = super().from_db(db, field_names, values)
+        instance._saved_completed_at = instance.__dict__.get('completed_at', models.DEFERRED)
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """
+        Override save method to update the user's statistics when the attempt is completed.
+        
+        deadline_at is derived from started_at and time_limit on every save.
+        Completing a stored attempt first claims the completion in the
+        database (see _claim_completion), so an attempt completed elsewhere
+        in the meantime (e.g. by close_expired) keeps its completion time
+        and is not counted twice.
+        """
+        self.deadline_at = self.compute_deadline()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'started_at', 'time_limit'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'deadline_at'}
+        newly_completed = (
+            self.completed_at is not None
+            and getattr(self, '_saved_completed_at', None) is None
+        )
+        with transaction.atomic():
+            if newly_completed and not self._state.adding:
+                newly_completed = self._claim_completion(self.completed_at)
+            super().save(*args, **kwargs)
+            if newly_completed:
+                self._record_completion()
+        self._saved_completed_at = self.completed_at
+    
+    def _claim_completion(self, completed_at):
+        """
+        Set completed_at in the database if the attempt is still open there.
+        
+        Returns:
+            bool: True if this call completed the attempt; otherwise
+            completed_at is reloaded from the database
+        """
+        claimed = QuizAttempt.objects.filter(
+            pk=self.pk, completed_at__isnull=True
+        ).update(completed_at=completed_at)
+        if claimed:
+            self.completed_at = completed_at
+        else:
+            stored = QuizAttempt.objects.filter(pk=self.pk).values_list('completed_at', flat=True).first()
+            self.completed_at = stored or self.completed_at
+        self._saved_completed_at = self.completed_at
+        return bool(claimed)
+    
+    def _record_completion(self):
+        """Add the newly completed attempt to its user's statistics and leaderboards."""
+        if self.user_id is not None:
+            UserStats.record_attempt(self)
+            LeaderboardEntry.record_attempt(self)
     
     def __str__(self):
         """String representation of the quiz attempt."""
@@ -205,21 +368,195 @@ class QuizAttempt(models.Model):
         """Returns whether the quiz attempt has been completed."""
         return self.completed_at is not None
     
+    def compute_deadline(self):
+        """Return when the time limit runs out, or None without a time limit."""
+        if self.time_limit <= 0:
+            return None
+        return self.started_at + timedelta(seconds=self.time_limit)
+    
+    @classmethod
+    def expired(cls, now=None):
+        """Return the open attempts whose deadline has passed, by deadline."""
+        return cls.objects.filter(
+            completed_at__isnull=True, deadline_at__lte=now or timezone.now()
+        ).order_by('deadline_at')
+    
+    @classmethod
+    def expiring(cls, within, now=None):
+        """
+        Return the open attempts whose deadline falls in the coming period.
+        
+        Args:
+            within (timedelta): Length of the period
+            now (datetime): Start of the period (default: timezone.now())
+        """
+        now = now or timezone.now()
+        return cls.objects.filter(
+            completed_at__isnull=True, deadline_at__gt=now, deadline_at__lte=now + within
+        ).order_by('deadline_at')
+    
     def calculate_score(self):
         """
-        Calculates and updates the score based on correct responses.
+        Recounts the score and answered count from the recorded responses.
+        
+        The counters are normally kept current by record_responses(), so this
+        is only needed to repair them (see the rebuild_attempt_counters command).
         
         Returns:
             int: The calculated score
         """
-        correct_count = self.quizresponse_set.filter(
-            is_correct=True
-        ).count()
+        counts = self.quizresponse_set.aggregate(
+            answered=models.Count('id'),
+            correct=models.Count('id', filter=models.Q(is_correct=True)),
+        )
         
-        self.score = correct_count
-        self.save(update_fields=['score'])
+        self.score = counts['correct']
+        self.answered_count = counts['answered']
+        self.save(update_fields=['score', 'answered_count'])
         return self.score
     
+    def record_responses(self, answered, correct):
+        """
+        Atomically adds newly recorded responses to the score and answered count.
+        
+        Uses F-expression increments so concurrent submissions cannot lose
+        updates, and mirrors the change on this instance.
+        
+        Args:
+            answered (int): Number of responses recorded
+            correct (int): How many of them were correct
+        
+        Returns:
+            bool: False if the attempt is completed or past its deadline, in
+            which case the counters are left alone
+        """
+        if not QuizAttempt.add_responses(self.pk, answered, correct):
+            return False
+        self.score += correct
+        self.answered_count += answered
+        return True
+    
+    @classmethod
+    def add_responses(cls, attempt_id, answered, correct):
+        """
+        Like record_responses(), for an attempt that has not been loaded.
+        
+        Only an open attempt within its time limit is updated, so answers
+        cannot change the score of an attempt that has been completed (and
+        added to the statistics and leaderboards) in the meantime.
+        
+        Args:
+            attempt_id (int): The quiz attempt to update
+            answered (int): Number of responses recorded
+            correct (int): How many of them were correct
+        
+        Returns:
+            bool: False if the attempt is completed or past its deadline
+        """
+        updated = cls.objects.filter(
+            models.Q(deadline_at__isnull=True) | models.Q(deadline_at__gt=timezone.now()),
+            pk=attempt_id,
+            completed_at__isnull=True,
+        ).update(
+            score=models.F('score') + correct,
+            answered_count=models.F('answered_count') + answered,
+        )
+        return bool(updated)
+    
+    @classmethod
+    def adjust_counters(cls, attempt_id, answered, correct):
+        """
+        Shift the score and answered count of an attempt, open or not.
+        
+        Used for responses stored outside of a quiz session and for stored
+        responses that are regraded, moved or deleted, so the counters keep
+        matching the stored responses. A completed attempt is already part
+        of its user's statistics and leaderboard entries, so those are
+        rebuilt with the new score.
+        
+        Args:
+            attempt_id (int): The quiz attempt to update
+            answered (int): Change in the number of responses
+            correct (int): Change in the number of correct responses
+        """
+        with transaction.atomic():
+            attempt = cls.objects.select_for_update().filter(
+                pk=attempt_id
+            ).values('user_id', 'completed_at').first()
+            if attempt is None:
+                return
+            cls.objects.filter(pk=attempt_id).update(
+                score=models.F('score') + correct,
+                answered_count=models.F('answered_count') + answered,
+            )
+            if attempt['completed_at'] is not None and attempt['user_id'] is not None:
+                UserStats.rebuild([attempt['user_id']])
+                LeaderboardEntry.rebuild([attempt['user_id']])
+    
+    def complete(self):
+        """
+        Marks the attempt as completed.
+        
+        The score is already current, so this is a single UPDATE, which only
+        applies while the attempt is open. If it was completed elsewhere in
+        the meantime (e.g. by close_expired), its completion time is kept and
+        it is not added to the statistics again.
+        
+        Returns:
+            bool: True if this call completed the attempt
+        """
+        with transaction.atomic():
+            completed = self._claim_completion(timezone.now())
+            if completed:
+                self._record_completion()
+        return completed
+    
+    @classmethod
+    def close_expired(cls, now=None, batch_size=1000):
+        """
+        Complete the open timed attempts whose time limit has run out.
+        
+        Expired attempts are found through attempt_open_deadline_idx. Each
+        batch is closed with one UPDATE that sets completed_at to the
+        deadline; the score needs no work, as it is kept current while
+        answers are recorded. The statistics and leaderboard entries of the
+        batch's users are then rebuilt.
+        
+        Args:
+            now (datetime): The current time (default: timezone.now())
+            batch_size (int): Number of attempts closed per UPDATE
+        
+        Returns:
+            int: The number of attempts closed
+        """
+        expired = cls.expired(now)
+        closed = 0
+        while True:
+            batch = list(expired.values_list('pk', 'user_id')[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                closed += cls.objects.filter(
+                    pk__in=[pk for pk, _ in batch], completed_at__isnull=True
+                ).update(completed_at=models.F('deadline_at'))
+                user_ids = {user_id for _, user_id in batch if user_id is not None}
+                if user_ids:
+                    UserStats.rebuild(user_ids)
+                    LeaderboardEntry.rebuild(user_ids)
+        return closed
+    
+    def results(self):
+        """
+        Return the responses of this attempt for the results page.
+        
+        Each response comes with its question, the question's correct choice
+        and the selected choice joined in, so the whole page is loaded in one
+        query.
+        """
+        return self.quizresponse_set.select_related(
+            'question__correct_choice', 'selected_choice'
+        ).order_by('response_time', 'pk')
+    
     def score_percentage(self):
         """
         Returns the score as a percentage.
@@ -238,14 +575,14 @@ class QuizAttempt(models.Model):
         Returns:
             int: Seconds remaining, or 0 if the time limit has been exceeded
         """
-        if self.time_limit == 0:
+        deadline = self.deadline_at or self.compute_deadline()
+        if deadline is None:
             return 0  # No time limit
             
         if self.is_complete():
             return 0  # Quiz is already complete
             
-        elapsed_seconds = (timezone.now() - self.started_at).total_seconds()
-        remaining_seconds = max(0, self.time_limit - int(elapsed_seconds))
+        remaining_seconds = max(0, math.ceil((deadline - timezone.now()).total_seconds()))
         return remaining_seconds
 
 
@@ -283,18 +620,102 @@ class QuizResponse(models.Model):
     class Meta:
         ordering = ['quiz_attempt', 'response_time']
         unique_together = ['quiz_attempt', 'question']
+        indexes = [
+            # The correct responses of an attempt (scoring)
+            models.Index(
+                fields=['quiz_attempt'],
+                condition=models.Q(is_correct=True),
+                name='response_correct_idx',
+            ),
+        ]
     
     def __str__(self):
         """String representation of the quiz response."""
         return f"Response to {self.question} in {self.quiz_attempt}"
     
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored attempt and grade so save() can adjust the counters."""
+        instance = super().from_db(db, field_names, values)
+        instance._saved_quiz_attempt_id = instance.__dict__.get('quiz_attempt_id')
+        instance._saved_is_correct = instance.__dict__.get('is_correct', models.DEFERRED)
+        return instance
+    
+    def save(self, *args, graded=False, **kwargs):
         """
         Override save method to automatically set is_correct based on the selected choice.
+        
+        New responses are also added to the quiz attempt's score and answered
+        count. Changing a stored response's grade or attempt adjusts the
+        counters of the attempts involved. On a completed attempt, either
+        also rebuilds its user's statistics (see QuizAttempt.adjust_counters).
+        
+        Args:
+            graded (bool): True if is_correct was already set from the quiz's
+                answer key, so the selected choice does not need to be loaded
+        
+        Raises:
+            AttemptClosed: If a graded response (an answer given while taking
+                the quiz) is added to a completed attempt or one past its
+                deadline; it is not saved
         """
         # Determine if the selected choice is correct
-        self.is_correct = self.selected_choice.is_correct
-        super().save(*args, **kwargs)
+        if not graded:
+            self.is_correct = self.selected_choice.is_correct
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                correct = int(self.is_correct)
+                attempt_cached = QuizResponse.quiz_attempt.is_cached(self)
+                if attempt_cached:
+                    recorded = self.quiz_attempt.record_responses(1, correct)
+                else:
+                    recorded = QuizAttempt.add_responses(self.quiz_attempt_id, 1, correct)
+                if not recorded:
+                    if graded:
+                        raise AttemptClosed(f"Quiz attempt {self.quiz_attempt_id} is closed")
+                    # Stored for a closed attempt, e.g. by an admin: still counted
+                    QuizAttempt.adjust_counters(self.quiz_attempt_id, 1, correct)
+                    if attempt_cached:
+                        self.quiz_attempt.score += correct
+                        self.quiz_attempt.answered_count += 1
+            else:
+                self._adjust_counters()
+        self._saved_quiz_attempt_id = self.quiz_attempt_id
+        self._saved_is_correct = self.is_correct
+    
+    def delete(self, *args, **kwargs):
+        """
+        Override delete method to take the response out of its attempt's counters.
+        
+        QuerySet.delete() and cascading deletes skip this, so Django can
+        delete those responses without loading them one by one; run
+        rebuild_attempt_counters afterwards if they leave other attempts
+        behind.
+        """
+        is_correct = getattr(self, '_saved_is_correct', self.is_correct)
+        if is_correct is models.DEFERRED:
+            is_correct = self.is_correct
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            QuizAttempt.adjust_counters(self.quiz_attempt_id, -1, -int(is_correct))
+        return result
+    
+    def _adjust_counters(self):
+        """Move a stored response's grade between attempt counters after an update."""
+        saved_attempt_id = getattr(self, '_saved_quiz_attempt_id', None)
+        saved_is_correct = getattr(self, '_saved_is_correct', models.DEFERRED)
+        if saved_attempt_id is None or saved_is_correct is models.DEFERRED:
+            # Not loaded from the database: the stored values are unknown
+            return
+        if saved_attempt_id != self.quiz_attempt_id:
+            QuizAttempt.adjust_counters(saved_attempt_id, -1, -int(saved_is_correct))
+            QuizAttempt.adjust_counters(self.quiz_attempt_id, 1, int(self.is_correct))
+        elif saved_is_correct != self.is_correct:
+            QuizAttempt.adjust_counters(
+                self.quiz_attempt_id, 0, int(self.is_correct) - int(saved_is_correct)
+            )
 
 
 class UserProfile(models.Model):
@@ -345,17 +766,507 @@ class UserProfile(models.Model):
         """String representation of the user profile."""
         return f"{self.user.username}'s Profile"
     
+    @cached_property
+    def overall_stats(self):
+        """
+        The user's overall UserStats row, or None if no quiz was completed.
+        
+        Loaded once per profile instance, so a page showing several of the
+        statistics below reads the row only once.
+        """
+        return UserStats.objects.filter(user=self.user, category__isnull=True).first()
+    
     def total_quizzes_taken(self):
         """Return the total number of quizzes completed by the user."""
-        return self.user.quizattempt_set.filter(completed_at__isnull=False).count()
+        stats = self.overall_stats
+        return stats.attempts if stats else 0
     
     def average_score(self):
         """Return the user's average score across all quizzes."""
-        completed_quizzes = self.user.quizattempt_set.filter(completed_at__isnull=False)
-        if completed_quizzes.exists():
-            total_score = sum(quiz.score_percentage() for quiz in completed_quizzes)
-            return total_score / completed_quizzes.count()
-        return 0
+        stats = self.overall_stats
+        return stats.average_percentage() if stats else 0
+
+
+class UserStats(models.Model):
+    """
+    Materialized quiz statistics of a user, overall and per category.
+    
+    Each user has one row with category=None summarizing all completed
+    attempts, and one row per category they completed a quiz in. Rows are
+    updated incrementally when an attempt is completed (see
+    QuizAttempt.save), so statistics pages read a few rows instead of
+    scanning the user's quiz history. rebuild() (used by the
+    backfill_user_stats command and by bulk attempt updates that bypass
+    QuizAttempt.save) recomputes them from QuizAttempt rows.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='quiz_stats',
+        help_text="The user these statistics belong to"
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="The category these statistics cover (null for all categories)"
+    )
+    attempts = models.IntegerField(
+        default=0,
+        help_text="Number of completed quiz attempts"
+    )
+    percentage_sum = models.FloatField(
+        default=0,
+        help_text="Sum of the score percentages of all completed attempts"
+    )
+    best_percentage = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Highest score percentage achieved"
+    )
+    worst_percentage = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Lowest score percentage achieved"
+    )
+    perfect_count = models.IntegerField(
+        default=0,
+        help_text="Number of attempts with a 100% score"
+    )
+    last_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the most recent attempt was completed"
+    )
+    
+    class Meta:
+        verbose_name_plural = "User stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'category'],
+                name='unique_user_category_stats',
+            ),
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(category__isnull=True),
+                name='unique_user_overall_stats',
+            ),
+        ]
+    
+    def __str__(self):
+        """String representation of the user statistics."""
+        scope = self.category if self.category_id else "all categories"
+        return f"{self.user.username}'s stats for {scope}"
+    
+    def average_percentage(self):
+        """
+        Returns the average score percentage.
+        
+        Returns:
+            float: Average percentage (0-100)
+        """
+        if self.attempts == 0:
+            return 0
+        return self.percentage_sum / self.attempts
+    
+    @classmethod
+    def rebuild(cls, user_ids):
+        """
+        Replace the statistics of some users with ones computed from their attempts.
+        
+        Args:
+            user_ids (list): The users to rebuild
+        
+        Returns:
+            int: The number of statistics rows written
+        """
+        percentage = models.Case(
+            models.When(total_questions=0, then=models.Value(0.0)),
+            default=Cast('score', models.FloatField()) / models.F('total_questions') * 100,
+            output_field=models.FloatField(),
+        )
+        aggregates = {
+            'attempts': models.Count('id'),
+            'percentage_sum': models.Sum(percentage),
+            'best_percentage': models.Max(percentage),
+            'worst_percentage': models.Min(percentage),
+            'perfect_count': models.Count('id', filter=models.Q(
+                score__gte=models.F('total_questions'), total_questions__gt=0
+            )),
+            'last_attempt_at': models.Max('completed_at'),
+        }
+        attempts = QuizAttempt.objects.filter(user_id__in=user_ids, completed_at__isnull=False)
+        per_category = attempts.values('user_id', 'category_id').annotate(**aggregates).order_by()
+        overall = attempts.values('user_id').annotate(**aggregates).order_by()
+        
+        stats = [cls(**row) for row in per_category]
+        stats += [cls(category_id=None, **row) for row in overall]
+        
+        with transaction.atomic():
+            cls.objects.filter(user_id__in=user_ids).delete()
+            cls.objects.bulk_create(stats)
+        return len(stats)
+    
+    @classmethod
+    def record_attempt(cls, quiz_attempt):
+        """
+        Adds a completed quiz attempt to its user's overall and category rows.
+        
+        Uses F-expression updates so concurrent completions cannot lose updates.
+        
+        Args:
+            quiz_attempt (QuizAttempt): A completed attempt with a user
+        """
+        percentage = quiz_attempt.score_percentage()
+        completed_at = quiz_attempt.completed_at
+        perfect = 1 if percentage >= 100 else 0
+        for category_id in (None, quiz_attempt.category_id):
+            rows = cls.objects.filter(user_id=quiz_attempt.user_id, category_id=category_id)
+            updates = {
+                'attempts': models.F('attempts') + 1,
+                'percentage_sum': models.F('percentage_sum') + percentage,
+                'best_percentage': Greatest(Coalesce('best_percentage', percentage), percentage),
+                'worst_percentage': Least(Coalesce('worst_percentage', percentage), percentage),
+                'perfect_count': models.F('perfect_count') + perfect,
+                'last_attempt_at': Greatest(Coalesce('last_attempt_at', completed_at), completed_at),
+            }
+            if rows.update(**updates):
+                continue
+            # First completed attempt in this scope
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        user_id=quiz_attempt.user_id,
+                        category_id=category_id,
+                        attempts=1,
+                        percentage_sum=percentage,
+                        best_percentage=percentage,
+                        worst_percentage=percentage,
+                        perfect_count=perfect,
+                        last_attempt_at=completed_at,
+                    )
+            except IntegrityError:
+                # A concurrent completion created the row first
+                rows.update(**updates)
+
+
+# A user's position on a leaderboard
+Standing = namedtuple('Standing', ['rank', 'points', 'players'])
+
+
+class LeaderboardEntry(models.Model):
+    """
+    A user's points on one leaderboard.
+    
+    A leaderboard is identified by a period (ALL_TIME or an ISO week such
+    as '2026-W42') and a category (null for all categories); a user's
+    points on it are the correct answers of the attempts they completed in
+    that period and category. Entries are updated incrementally when an
+    attempt is completed (see QuizAttempt.save), together with the
+    LeaderboardBucket histogram that rank lookups read, so neither the top
+    of a leaderboard nor a user's rank has to aggregate QuizAttempt rows.
+    
+    Users with the same points share a rank; on the top list, the user who
+    reached the points first is listed first.
+    """
+    ALL_TIME = 'all'
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        help_text="The user ranked by this entry"
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="The category of the leaderboard (null for all categories)"
+    )
+    period = models.CharField(
+        max_length=10,
+        help_text="'all' for the all-time leaderboard, or an ISO week like '2026-W42'"
+    )
+    points = models.IntegerField(
+        default=0,
+        help_text="Correct answers in the period and category"
+    )
+    updated_at = models.DateTimeField(
+        help_text="When the user reached their current points"
+    )
+    
+    class Meta:
+        verbose_name_plural = "Leaderboard entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'period', 'category'],
+                name='unique_user_leaderboard_entry',
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'period'],
+                condition=models.Q(category__isnull=True),
+                name='unique_user_overall_leaderboard_entry',
+            ),
+        ]
+        indexes = [
+            # The top of a leaderboard, read in order (LeaderboardEntry.top)
+            models.Index(
+                fields=['period', 'category', '-points', 'updated_at'],
+                name='leaderboard_top_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        """String representation of the leaderboard entry."""
+        scope = self.category if self.category_id else "all categories"
+        return f"{self.user.username}: {self.points} points ({self.period}, {scope})"
+    
+    @classmethod
+    def week_period(cls, when):
+        """
+        Returns the weekly period a moment falls in.
+        
+        Args:
+            when (datetime): An aware datetime
+        
+        Returns:
+            str: The ISO week, e.g. '2026-W42'
+        """
+        year, week, _ = timezone.localtime(when).isocalendar()
+        return f"{year}-W{week:02d}"
+    
+    @classmethod
+    def boards_for(cls, category_id, when):
+        """Returns the (period, category_id) leaderboards an attempt counts towards."""
+        week = cls.week_period(when)
+        return [
+            (cls.ALL_TIME, None),
+            (cls.ALL_TIME, category_id),
+            (week, None),
+            (week, category_id),
+        ]
+    
+    @classmethod
+    def record_attempt(cls, quiz_attempt):
+        """
+        Adds a completed quiz attempt's correct answers to its user's entries.
+        
+        Each entry is locked while its points and the histogram buckets of
+        the old and new points are updated, so concurrent completions by the
+        same user are applied one after the other.
+        
+        Args:
+            quiz_attempt (QuizAttempt): A completed attempt with a user
+        """
+        points = quiz_attempt.score
+        completed_at = quiz_attempt.completed_at
+        for period, category_id in cls.boards_for(quiz_attempt.category_id, completed_at):
+            entries = cls.objects.filter(
+                user_id=quiz_attempt.user_id, period=period, category_id=category_id
+            )
+            entry = entries.select_for_update().first()
+            if entry is None:
+                # First completed attempt on this leaderboard
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(
+                            user_id=quiz_attempt.user_id,
+                            period=period,
+                            category_id=category_id,
+                            points=points,
+                            updated_at=completed_at,
+                        )
+                except IntegrityError:
+                    # A concurrent completion created the entry first
+                    entry = entries.select_for_update().get()
+                else:
+                    LeaderboardBucket.adjust(period, category_id, points, 1)
+                    continue
+            if not points:
+                continue
+            entries.update(points=entry.points + points, updated_at=completed_at)
+            LeaderboardBucket.adjust(period, category_id, entry.points, -1)
+            LeaderboardBucket.adjust(period, category_id, entry.points + points, 1)
+    
+    @classmethod
+    def rebuild(cls, user_ids):
+        """
+        Replace the leaderboard entries of some users with ones computed from their attempts.
+        
+        Args:
+            user_ids (list): The users to rebuild
+        
+        Returns:
+            int: The number of entries written
+        """
+        attempts = QuizAttempt.objects.filter(
+            user_id__in=user_ids, completed_at__isnull=False
+        ).values_list('user_id', 'category_id', 'score', 'completed_at').order_by('completed_at')
+        totals = {}
+        for user_id, category_id, score, completed_at in attempts.iterator():
+            for period, board_category_id in cls.boards_for(category_id, completed_at):
+                key = (user_id, period, board_category_id)
+                points, updated_at = totals.get(key, (0, completed_at))
+                if score:
+                    updated_at = completed_at
+                totals[key] = (points + score, updated_at)
+        entries = [
+            cls(user_id=user_id, period=period, category_id=category_id,
+                points=points, updated_at=updated_at)
+            for (user_id, period, category_id), (points, updated_at) in totals.items()
+        ]
+        
+        with transaction.atomic():
+            old = cls.objects.filter(user_id__in=user_ids)
+            removed = old.values('period', 'category_id', 'points').annotate(
+                users=models.Count('id')
+            ).order_by()
+            for row in removed:
+                LeaderboardBucket.adjust(row['period'], row['category_id'], row['points'], -row['users'])
+            old.delete()
+            cls.objects.bulk_create(entries)
+            added = {}
+            for entry in entries:
+                key = (entry.period, entry.category_id, entry.points)
+                added[key] = added.get(key, 0) + 1
+            for (period, category_id, points), users in added.items():
+                LeaderboardBucket.adjust(period, category_id, points, users)
+        return len(entries)
+    
+    @classmethod
+    def top(cls, period=ALL_TIME, category_id=None, limit=10):
+        """
+        Returns the top entries of a leaderboard, read through leaderboard_top_idx.
+        
+        Args:
+            period (str): ALL_TIME or an ISO week
+            category_id (int): The category (None for all categories)
+            limit (int): Maximum number of entries
+        
+        Returns:
+            list: LeaderboardEntry objects with their user and a rank attribute
+        """
+        entries = list(cls.objects.filter(
+            period=period, category_id=category_id
+        ).order_by('-points', 'updated_at').select_related('user')[:limit])
+        for position, entry in enumerate(entries, start=1):
+            previous = entries[position - 2] if position > 1 else None
+            entry.rank = previous.rank if previous and previous.points == entry.points else position
+        return entries
+    
+    @classmethod
+    def standing(cls, user_id, period=ALL_TIME, category_id=None):
+        """
+        Returns a user's rank on a leaderboard.
+        
+        The rank is one more than the number of users with more points, which
+        is summed from the LeaderboardBucket rows above the user's points: the
+        cost depends on the number of distinct points values, not on the
+        number of users.
+        
+        Args:
+            user_id (int): The user
+            period (str): ALL_TIME or an ISO week
+            category_id (int): The category (None for all categories)
+        
+        Returns:
+            Standing: (rank, points, players), or None if the user is not ranked
+        """
+        points = cls.objects.filter(
+            user_id=user_id, period=period, category_id=category_id
+        ).values_list('points', flat=True).first()
+        if points is None:
+            return None
+        counts = LeaderboardBucket.objects.filter(
+            period=period, category_id=category_id
+        ).aggregate(
+            above=Coalesce(models.Sum('users', filter=models.Q(points__gt=points)), 0),
+            players=Coalesce(models.Sum('users'), 0),
+        )
+        return Standing(counts['above'] + 1, points, counts['players'])
+
+
+class LeaderboardBucket(models.Model):
+    """
+    The number of users with a given number of points on a leaderboard.
+    
+    This histogram of LeaderboardEntry.points is kept up to date together
+    with the entries, so a user's rank is a sum over the few buckets above
+    their points instead of a count over every user.
+    """
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="The category of the leaderboard (null for all categories)"
+    )
+    period = models.CharField(
+        max_length=10,
+        help_text="'all' for the all-time leaderboard, or an ISO week like '2026-W42'"
+    )
+    points = models.IntegerField(
+        help_text="A points value"
+    )
+    users = models.IntegerField(
+        default=0,
+        help_text="Number of users on the leaderboard with these points"
+    )
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['period', 'category', 'points'],
+                name='unique_leaderboard_bucket',
+            ),
+            models.UniqueConstraint(
+                fields=['period', 'points'],
+                condition=models.Q(category__isnull=True),
+                name='unique_overall_leaderboard_bucket',
+            ),
+        ]
+    
+    def __str__(self):
+        """String representation of the bucket."""
+        scope = self.category if self.category_id else "all categories"
+        return f"{self.users} users with {self.points} points ({self.period}, {scope})"
+    
+    @classmethod
+    def adjust(cls, period, category_id, points, delta):
+        """
+        Adds delta to the number of users with some points on a leaderboard.
+        
+        Uses F-expression updates so concurrent adjustments cannot lose updates.
+        """
+        buckets = cls.objects.filter(period=period, category_id=category_id, points=points)
+        if buckets.update(users=models.F('users') + delta):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(period=period, category_id=category_id, points=points, users=delta)
+        except IntegrityError:
+            # A concurrent adjustment created the bucket first
+            buckets.update(users=models.F('users') + delta)
+    
+    @classmethod
+    def recount(cls):
+        """
+        Replace every bucket with counts aggregated from the leaderboard entries.
+        
+        Returns:
+            int: The number of buckets written
+        """
+        counts = LeaderboardEntry.objects.values('period', 'category_id', 'points').annotate(
+            users=models.Count('id')
+        ).order_by()
+        with transaction.atomic():
+            cls.objects.all().delete()
+            buckets = cls.objects.bulk_create(
+                (cls(**row) for row in counts.iterator()), batch_size=1000
+            )
+        return len(buckets)
 
 
 @receiver(post_save, sender=User)
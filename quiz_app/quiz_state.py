@@ -0,0 +1,251 @@
+"""
+Quiz state storage for the Quiz application.
+
+The state of a quiz in progress is its attempt ID, its question IDs and the
+index of the current question. The attempt and question IDs never change
+during a quiz, so they are written to the session once when the quiz
+starts. The current question index changes with every answer; storing it
+in the session as well would write the django_session table (and take the
+database write lock on SQLite) on every answer, so it is kept in a
+separate store instead:
+
+    'cache': A Django cache (QUIZ_STATE_CACHE), shared by all processes
+        that share the cache; only use it with a shared cache backend
+        (file or redis) when more than one process serves requests
+    'lru': An in-process LRU dict, for single-process deployments
+    'session': The session itself (the original behavior, and the default)
+
+The session copy is only written when the quiz starts, so it is not to be
+trusted once answers have been given: if the index is missing from the
+store (evicted, or served by another process), the state is marked as not
+synced, and the views correct it from the attempt's answered count (which
+always equals the number of questions answered so far) before using it.
+
+Settings:
+    QUIZ_STATE_BACKEND: 'cache', 'lru' or 'session' (default: 'session')
+    QUIZ_STATE_CACHE: Cache alias used by the 'cache' backend
+    QUIZ_STATE_LRU_SIZE: Number of quizzes the 'lru' backend remembers
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Session keys holding the quiz state
+QUESTIONS_KEY = 'quiz_questions'
+INDEX_KEY = 'current_question_index'
+ATTEMPT_KEY = 'quiz_attempt_id'
+SESSION_KEYS = [QUESTIONS_KEY, INDEX_KEY, ATTEMPT_KEY]
+
+# Store key template for the current question index of a quiz
+STATE_KEY = 'quiz_app:state:{session_key}:{attempt_id}'
+
+# How long (in seconds) the index of an idle quiz is kept
+STATE_TIMEOUT = 60 * 60 * 6
+
+
+class QuizState:
+    """
+    The state of the quiz in progress in a session.
+
+    Attributes:
+        attempt_id (int): The quiz attempt being taken
+        question_ids (list): Question IDs in the order they are asked
+        index (int): Position of the current question in question_ids
+        synced (bool): False if the index was missing from the store, and
+            must be corrected with sync_quiz_state before it is used
+    """
+
+    def __init__(self, attempt_id, question_ids, index=0, synced=True):
+        self.attempt_id = attempt_id
+        self.question_ids = question_ids
+        self.index = index
+        self.synced = synced
+
+    def current_question_id(self):
+        """Return the ID of the current question, or None once all are asked."""
+        if self.index < len(self.question_ids):
+            return self.question_ids[self.index]
+        return None
+
+
+class LRUStore:
+    """A thread-safe in-process store that forgets its least recently used keys."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value stored under key, or None."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        """Store value under key, evicting the oldest entries if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Remove key from the store."""
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class CacheStore:
+    """A store backed by one of the configured Django caches."""
+
+    def __init__(self, alias, timeout=STATE_TIMEOUT):
+        self.alias = alias
+        self.timeout = timeout
+
+    def get(self, key):
+        """Return the value stored under key, or None."""
+        return caches[self.alias].get(key)
+
+    def set(self, key, value):
+        """Store value under key."""
+        caches[self.alias].set(key, value, self.timeout)
+
+    def delete(self, key):
+        """Remove key from the store."""
+        caches[self.alias].delete(key)
+
+
+_lru_store = None
+_lru_lock = threading.Lock()
+
+
+def get_state_store():
+    """
+    Return the store configured by QUIZ_STATE_BACKEND.
+
+    Returns:
+        LRUStore or CacheStore or None: The store, or None if the index is
+        kept in the session
+
+    Raises:
+        ValueError: If QUIZ_STATE_BACKEND is not a known backend
+    """
+    global _lru_store
+    backend = getattr(settings, 'QUIZ_STATE_BACKEND', 'session')
+    if backend == 'session':
+        return None
+    if backend == 'cache':
+        return CacheStore(getattr(settings, 'QUIZ_STATE_CACHE', 'default'))
+    if backend == 'lru':
+        size = getattr(settings, 'QUIZ_STATE_LRU_SIZE', 10000)
+        with _lru_lock:
+            if _lru_store is None or _lru_store.max_entries != size:
+                _lru_store = LRUStore(size)
+            return _lru_store
+    raise ValueError(f"Unknown QUIZ_STATE_BACKEND {backend!r}")
+
+
+def _state_key(session, attempt_id):
+    """Return the store key of a session's quiz, or None if it has no key yet."""
+    if session.session_key is None:
+        return None
+    return STATE_KEY.format(session_key=session.session_key, attempt_id=attempt_id)
+
+
+def start_quiz_state(session, attempt_id, question_ids):
+    """
+    Record a new quiz in a session.
+
+    Args:
+        session: The request's session
+        attempt_id (int): The quiz attempt being started
+        question_ids (list): Question IDs in the order they are asked
+
+    Returns:
+        QuizState: The state of the new quiz
+    """
+    session[QUESTIONS_KEY] = question_ids
+    session[INDEX_KEY] = 0
+    session[ATTEMPT_KEY] = attempt_id
+    state = QuizState(attempt_id, question_ids)
+    store = get_state_store()
+    if store is not None:
+        if session.session_key is None:
+            # The store is keyed by session, so the session needs a key now
+            session.save()
+        store.set(_state_key(session, attempt_id), state.index)
+    return state
+
+
+def get_quiz_state(session):
+    """
+    Return the state of the quiz in progress in a session.
+
+    Returns:
+        QuizState or None: The quiz state, or None if no quiz is in progress
+    """
+    attempt_id = session.get(ATTEMPT_KEY)
+    question_ids = session.get(QUESTIONS_KEY)
+    if attempt_id is None or question_ids is None:
+        return None
+
+    index = session.get(INDEX_KEY, 0)
+    synced = True
+    store = get_state_store()
+    if store is not None:
+        key = _state_key(session, attempt_id)
+        stored = store.get(key) if key is not None else None
+        if stored is None:
+            # The session copy is only as old as the start of the quiz
+            synced = False
+        else:
+            index = stored
+    return QuizState(attempt_id, question_ids, index, synced)
+
+
+def save_quiz_state(session, state):
+    """Store the current question index of a quiz state."""
+    store = get_state_store()
+    key = _state_key(session, state.attempt_id)
+    if store is None or key is None:
+        session[INDEX_KEY] = state.index
+    else:
+        store.set(key, state.index)
+
+
+def sync_quiz_state(session, state, answered_count):
+    """
+    Correct a stale question index from the attempt's answered count.
+
+    Each answer moves the quiz on by one question, so the index must equal
+    the number of recorded responses. A store miss (or a stale entry in
+    another process) can leave it behind; this puts it right, and writes
+    the index back to the store if it was missing.
+
+    Returns:
+        QuizState: The (possibly corrected) state
+    """
+    if state.index != answered_count or not state.synced:
+        state.index = answered_count
+        state.synced = True
+        save_quiz_state(session, state)
+    return state
+
+
+def clear_quiz_state(session, state=None):
+    """Remove the quiz in progress from a session and the state store."""
+    state = state or get_quiz_state(session)
+    if state is not None:
+        store = get_state_store()
+        key = _state_key(session, state.attempt_id)
+        if store is not None and key is not None:
+            store.delete(key)
+    for key in SESSION_KEYS:
+        if key in session:
+            del session[key]
@@ -0,0 +1,96 @@
+"""
+Random question sampling for the Quiz application.
+
+Starting a quiz needs a handful of random question IDs from a category.
+Loading every Question row of the category to pick 5-20 of them gets slow
+once a category holds tens of thousands of questions, so this module keeps
+a compact per-category index of question IDs in the cache and draws from it
+in O(k) time.
+
+When no index is cached yet, it is built (one single-column query over the
+category's questions) and the request samples from it. The index is
+invalidated whenever a question is added to, moved between or removed from
+categories (see quiz_app.signals). Changes that bypass the signals (such as
+QuerySet.update()) or that only reach one process's local-memory cache are
+bounded by INDEX_TIMEOUT.
+"""
+
+import random
+from array import array
+
+from django.core.cache import cache
+
+from .models import Question
+
+# Cache key template for the per-category question ID index
+INDEX_KEY = 'quiz_app:question_ids:{category_id}'
+
+# How long (in seconds) a question ID index stays cached
+INDEX_TIMEOUT = 60 * 60
+
+
+def _index_key(category_id):
+    """Return the cache key holding the question ID index of a category."""
+    return INDEX_KEY.format(category_id=category_id)
+
+
+def build_question_index(category_id):
+    """
+    Build and cache the question ID index for a category.
+
+    Only the primary key column is read, and the IDs are stored as a
+    typed array (8 bytes per ID) rather than a list of Python ints.
+
+    Args:
+        category_id (int): The category to index
+
+    Returns:
+        array: The sorted question IDs of the category
+    """
+    ids = array('q', Question.objects.filter(
+        category_id=category_id
+    ).order_by('id').values_list('id', flat=True))
+    cache.set(_index_key(category_id), ids, INDEX_TIMEOUT)
+    return ids
+
+
+def get_question_index(category_id):
+    """
+    Return the cached question ID index for a category.
+
+    Returns:
+        array or None: The cached question IDs, or None if no index exists
+    """
+    return cache.get(_index_key(category_id))
+
+
+def invalidate_question_index(category_id):
+    """Drop the cached question ID index of a category."""
+    cache.delete(_index_key(category_id))
+
+
+def _sample_from_index(ids, num_questions):
+    """Draw up to num_questions distinct IDs from an index in O(k) time."""
+    if len(ids) <= num_questions:
+        return list(ids)
+    return random.sample(ids, num_questions)
+
+
+def sample_question_ids(category_id, num_questions):
+    """
+    Pick random question IDs from a category.
+
+    Uses the cached ID index, building it first if it is not cached.
+
+    Args:
+        category_id (int): The category to draw questions from
+        num_questions (int): How many questions the quiz should contain
+
+    Returns:
+        list: The selected question IDs (all of them if the category has
+        no more than num_questions questions)
+    """
+    ids = get_question_index(category_id)
+    if ids is None:
+        ids = build_question_index(category_id)
+    return _sample_from_index(ids, num_questions)
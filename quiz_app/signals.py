@@ -0,0 +1,38 @@
+"""
+Signal handlers for the Quiz application.
+
+These handlers keep cached, derived data in sync with the models it is
+derived from. They are connected in QuizAppConfig.ready().
+"""
+
+from django.db.models import DEFERRED
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .caching import CATEGORIES, bump_namespace
+from .models import Category, Question
+from .sampling import invalidate_question_index
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_caches(sender, instance, **kwargs):
+    """
+    Drop the question ID index and the category listings a question is part of.
+    
+    A question moved to another category is dropped from the index of the
+    category it was loaded with as well.
+    """
+    previous_category_id = getattr(instance, '_saved_category_id', None)
+    if previous_category_id not in (None, DEFERRED, instance.category_id):
+        invalidate_question_index(previous_category_id)
+    invalidate_question_index(instance.category_id)
+    instance._saved_category_id = instance.category_id
+    bump_namespace(CATEGORIES)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_caches(sender, instance, **kwargs):
+    """Drop the cached category listings."""
+    bump_namespace(CATEGORIES)
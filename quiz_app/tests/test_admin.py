@@ -0,0 +1,141 @@
+"""
+Tests for the admin changelists of the Quiz application.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from quiz_app.admin import EstimatedCountPaginator
+from quiz_app.models import Category, Choice, Question, QuizAttempt, QuizResponse
+
+
+class AdminChangelistTests(TestCase):
+    """Changelists run a fixed number of queries however many rows they show."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.admin)
+
+    def add_rows(self, count):
+        """Add count categories, questions, attempts and responses."""
+        for _ in range(count):
+            n = Category.objects.count()
+            user = User.objects.create_user(username=f'user{n}', password='password')
+            category = Category.objects.create(name=f'Category {n}')
+            question = Question.objects.create(category=category, text=f'Question {n}')
+            choice = Choice.objects.create(question=question, text=f'Choice {n}', is_correct=True)
+            attempt = QuizAttempt.objects.create(user=user, category=category, total_questions=1)
+            QuizResponse.objects.create(
+                quiz_attempt=attempt, question=question, selected_choice=choice, is_correct=True
+            )
+
+    def changelist_queries(self, model_name):
+        """Return the number of queries run by a changelist page."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(f'admin:quiz_app_{model_name}_changelist'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_independent_of_rows(self):
+        """Adding rows does not add queries to any changelist."""
+        self.add_rows(2)
+        models = ['category', 'question', 'quizattempt', 'quizresponse']
+        before = {model: self.changelist_queries(model) for model in models}
+
+        self.add_rows(8)
+        after = {model: self.changelist_queries(model) for model in models}
+
+        self.assertEqual(after, before)
+
+    def test_category_question_count(self):
+        """The category changelist shows annotated question counts."""
+        self.add_rows(1)
+        category = Category.objects.get()
+        Question.objects.create(category=category, text='Another question')
+
+        response = self.client.get(reverse('admin:quiz_app_category_changelist'))
+
+        self.assertContains(response, '<td class="field-question_count">2</td>', html=True)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    """Tests for EstimatedCountPaginator."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        category = Category.objects.create(name='Category')
+        questions = [Question.objects.create(category=category, text=f'Question {i}') for i in range(5)]
+        choices = [
+            Choice.objects.create(question=question, text='Choice', is_correct=True)
+            for question in questions
+        ]
+        for _ in range(10):
+            attempt = QuizAttempt.objects.create(category=category, total_questions=5)
+            QuizResponse.objects.bulk_create([
+                QuizResponse(
+                    quiz_attempt=attempt, question=question, selected_choice=choice,
+                    is_correct=(question.pk % 2 == 0)
+                )
+                for question, choice in zip(questions, choices)
+            ])
+
+    def test_seek_pages_match_offset_pages(self):
+        """Pages fetched by seeking hold the same rows as offset pages."""
+        for ordering in ['-pk', 'pk']:
+            queryset = QuizResponse.objects.order_by(ordering)
+            paginator = EstimatedCountPaginator(queryset, 7)
+            for number in paginator.page_range:
+                with self.subTest(ordering=ordering, page=number):
+                    expected = list(queryset[(number - 1) * 7:number * 7])
+                    self.assertEqual(list(paginator.page(number).object_list), expected)
+
+    def test_count_capped_and_estimated(self):
+        """Large counts are capped when filtered and estimated when not."""
+        with patch.object(EstimatedCountPaginator, 'count_limit', 10):
+            filtered = EstimatedCountPaginator(QuizResponse.objects.filter(is_correct=True), 5)
+            self.assertEqual(filtered.count, 10)
+
+            with patch('quiz_app.admin.estimate_row_count', return_value=1000000):
+                unfiltered = EstimatedCountPaginator(QuizResponse.objects.all(), 5)
+                with self.assertNumQueries(0):
+                    self.assertEqual(unfiltered.count, 1000000)
+
+        self.assertEqual(EstimatedCountPaginator(QuizResponse.objects.all(), 5).count, 50)
+
+
+class AttemptStatusFilterTests(TestCase):
+    """Tests for the quiz attempt status filter."""
+
+    def test_status_filter(self):
+        """Attempts are filtered by completion and deadline."""
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(admin_user)
+        category = Category.objects.create(name='Category')
+        now = timezone.now()
+        running = QuizAttempt.objects.create(category=category, time_limit=60, started_at=now)
+        untimed = QuizAttempt.objects.create(category=category, started_at=now - timedelta(days=1))
+        expired = QuizAttempt.objects.create(
+            category=category, time_limit=60, started_at=now - timedelta(minutes=5)
+        )
+        completed = QuizAttempt.objects.create(category=category, completed_at=now)
+
+        url = reverse('admin:quiz_app_quizattempt_changelist')
+        for status, expected in [
+            ('running', {running, untimed}),
+            ('expired', {expired}),
+            ('completed', {completed}),
+        ]:
+            with self.subTest(status=status):
+                response = self.client.get(url, {'status': status})
+                self.assertEqual(set(response.context['cl'].result_list), expected)
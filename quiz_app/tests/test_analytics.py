@@ -0,0 +1,45 @@
+"""
+Tests for the vectorized analytics layer.
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from quiz_app.analytics import attempt_frame, score_percentages
+from quiz_app.models import Category, QuizAttempt
+
+
+class AnalyticsTests(TestCase):
+    """Tests for quiz_app.analytics."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.science = Category.objects.create(name='Science')
+        self.history = Category.objects.create(name='History')
+        self.attempts = [
+            QuizAttempt.objects.create(user=self.user, category=category, score=score,
+                                       total_questions=total, completed_at=timezone.now())
+            for category, score, total in [
+                (self.science, 3, 5), (self.science, 10, 10), (self.history, 0, 0)
+            ]
+        ]
+
+    def test_score_percentages_match_model(self):
+        """The vectorized percentages equal QuizAttempt.score_percentage()."""
+        percentages = score_percentages(
+            [a.score for a in self.attempts], [a.total_questions for a in self.attempts]
+        )
+        self.assertEqual(list(percentages), [a.score_percentage() for a in self.attempts])
+
+    def test_attempt_frame_loads_columns_in_one_query(self):
+        """The frame is loaded with a single query and no model instances."""
+        with self.assertNumQueries(1):
+            df = attempt_frame(QuizAttempt.objects.filter(user=self.user))
+
+        self.assertEqual(len(df), 3)
+        self.assertEqual(sorted(df['category']), ['History', 'Science', 'Science'])
+        by_category = df.groupby('category')['score_percentage'].mean()
+        self.assertEqual(by_category['Science'], 80.0)
+        self.assertEqual(by_category['History'], 0.0)
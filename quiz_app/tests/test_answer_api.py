@@ -0,0 +1,164 @@
+"""
+Tests for the answer API client and fix_placeholder_questions.
+
+The client is exercised against a stub HTTP server running in a thread.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from quiz_app.answer_api import AnswerAPIError, AnswerClient, TokenBucket
+from quiz_app.models import Category, Choice, Question
+
+
+class StubAnswerHandler(BaseHTTPRequestHandler):
+    """Answer API stub: fails per the server's failure plan, else echoes answers."""
+
+    def do_POST(self):
+        """Answer a question."""
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        question = body['question']
+        with self.server.lock:
+            self.server.requests.append(question)
+            failures = self.server.failures.get(question, [])
+            status = failures.pop(0) if failures else 200
+
+        if status != 200:
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+        answers = {'correct': f'Right: {question}', 'incorrect': ['Wrong 1', 'Wrong 2', 'Wrong 3']}
+        data = json.dumps(answers).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Keep the test output quiet."""
+
+
+class StubServerMixin:
+    """Run a StubAnswerHandler server for each test."""
+
+    def setUp(self):
+        """Start the stub server."""
+        super().setUp()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubAnswerHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.failures = {}
+        self.url = f'http://127.0.0.1:{self.server.server_port}/answers'
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+
+class TokenBucketTests(SimpleTestCase):
+    """Tests for TokenBucket."""
+
+    def test_waits_for_tokens(self):
+        """Tokens are handed out at the configured rate."""
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=4, capacity=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(6):
+            bucket.acquire()
+
+        # Two tokens are available at once, the rest arrive every 0.25 s
+        self.assertEqual(len(sleeps), 4)
+        self.assertAlmostEqual(now[0], 1.0)
+
+
+class AnswerClientTests(StubServerMixin, SimpleTestCase):
+    """Tests for AnswerClient."""
+
+    def test_get_answers(self):
+        """Answers are parsed from the API response."""
+        client = AnswerClient(url=self.url, rate=100, backoff=0)
+
+        answers = client.get_answers('What is 2 + 2?', 'Math')
+
+        self.assertEqual(answers['correct'], 'Right: What is 2 + 2?')
+        self.assertEqual(len(answers['incorrect']), 3)
+
+    def test_retries_transient_errors(self):
+        """429 and 5xx responses are retried."""
+        self.server.failures['Flaky'] = [503, 429]
+        client = AnswerClient(url=self.url, rate=100, retries=2, backoff=0)
+
+        self.assertEqual(client.get_answers('Flaky', 'Math')['correct'], 'Right: Flaky')
+        self.assertEqual(self.server.requests, ['Flaky'] * 3)
+
+    def test_gives_up(self):
+        """Client errors and exhausted retries raise AnswerAPIError."""
+        self.server.failures['Bad'] = [400]
+        self.server.failures['Down'] = [500, 500]
+        client = AnswerClient(url=self.url, rate=100, retries=1, backoff=0)
+
+        with self.assertRaisesMessage(AnswerAPIError, 'HTTP 400'):
+            client.get_answers('Bad', 'Math')
+        with self.assertRaisesMessage(AnswerAPIError, 'HTTP 500'):
+            client.get_answers('Down', 'Math')
+        self.assertEqual(self.server.requests, ['Bad', 'Down', 'Down'])
+
+
+class FixPlaceholderQuestionsTests(StubServerMixin, TestCase):
+    """Tests for the fix_placeholder_questions command."""
+
+    def setUp(self):
+        """Set up placeholder questions."""
+        super().setUp()
+        category = Category.objects.create(name='General')
+        questions = Question.objects.bulk_create([
+            Question(category=category, text=f'Question {i}') for i in range(25)
+        ])
+        Choice.objects.bulk_create([
+            Choice(question=question, text=f'Answer {letter}', is_correct=(letter == 'A'))
+            for question in questions for letter in 'ABCD'
+        ])
+        Question.link_correct_choices()
+
+    def test_fixes_placeholders_concurrently(self):
+        """Every placeholder question gets the API's answers, in batches."""
+        self.server.failures['Question 3'] = [400]
+        self.server.failures['Question 7'] = [503]
+
+        out = StringIO()
+        call_command(
+            'fix_placeholder_questions', api_url=self.url, workers=4, rate=500,
+            batch_size=10, stdout=out
+        )
+
+        self.assertIn('Successfully updated 24 questions (1 failed)', out.getvalue())
+        self.assertEqual(len(self.server.requests), 26)
+        self.assertEqual(
+            Question.objects.filter(choice__text__startswith='Answer ').distinct().count(), 1
+        )
+        for question in Question.objects.exclude(text='Question 3').select_related('correct_choice'):
+            self.assertEqual(question.correct_choice.text, f'Right: {question.text}')
+            self.assertEqual(question.choice_set.count(), 4)
+
+    def test_dry_run(self):
+        """A dry run fetches answers without changing any choice."""
+        out = StringIO()
+        call_command(
+            'fix_placeholder_questions', api_url=self.url, rate=500, dry_run=True, stdout=out
+        )
+
+        self.assertIn('Dry run completed for 25 questions', out.getvalue())
+        self.assertEqual(Choice.objects.filter(text__startswith='Answer ').count(), 100)
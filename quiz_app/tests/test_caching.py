@@ -0,0 +1,70 @@
+"""
+Tests for the versioned cache and the configurable cache backends.
+"""
+
+import os
+import unittest
+
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCache
+from django.test import SimpleTestCase, TestCase
+
+from quiz_app.caching import CATEGORIES, bump_namespace, namespace_version, versioned_key
+from quiz_app.models import Category
+
+try:
+    import redis  # noqa: F401
+except ImportError:
+    redis = None
+
+# URL of a Redis-protocol server to test against (e.g. a local redis-server,
+# valkey-server or another stand-in speaking the protocol)
+REDIS_URL = os.environ.get('QUIZ_TEST_REDIS_URL')
+
+
+class VersionedCacheTests(TestCase):
+    """Tests for quiz_app.caching."""
+
+    def setUp(self):
+        """Start from an empty cache."""
+        cache.clear()
+
+    def test_bump_changes_keys(self):
+        """Bumping a namespace moves all of its keys."""
+        key = versioned_key(CATEGORIES, 'listing')
+        bump_namespace(CATEGORIES)
+        self.assertNotEqual(versioned_key(CATEGORIES, 'listing'), key)
+
+    def test_lost_version_does_not_reuse_old_keys(self):
+        """A version restarted after eviction differs from the evicted one."""
+        version = namespace_version(CATEGORIES)
+        cache.clear()
+        self.assertNotEqual(namespace_version(CATEGORIES), version)
+
+
+@unittest.skipUnless(redis and REDIS_URL, 'Set QUIZ_TEST_REDIS_URL to a Redis-protocol server')
+class RedisBackendTests(SimpleTestCase):
+    """Run the versioned cache operations against the Redis backend."""
+
+    def setUp(self):
+        """Connect to the test server."""
+        self.cache = RedisCache(REDIS_URL, {'KEY_PREFIX': 'quiz-test'})
+        self.cache.clear()
+
+    def tearDown(self):
+        """Remove the test keys."""
+        self.cache.clear()
+
+    def test_version_counter(self):
+        """add() and incr() behave as the versioned cache expects."""
+        self.assertTrue(self.cache.add('version', 10, None))
+        self.assertFalse(self.cache.add('version', 20, None))
+        self.assertEqual(self.cache.incr('version'), 11)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+
+    def test_pickled_values(self):
+        """Model instances survive the round trip."""
+        category = Category(id=1, name='Cached')
+        self.cache.set('listing', [category])
+        self.assertEqual(self.cache.get('listing')[0].name, 'Cached')
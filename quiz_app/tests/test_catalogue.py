@@ -0,0 +1,67 @@
+"""
+Tests for the cached category catalogue.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from quiz_app.catalogue import get_catalogue
+from quiz_app.forms import QuizSelectionForm
+from quiz_app.models import Category, Question
+
+
+class CategoryCatalogueTests(TestCase):
+    """Tests for quiz_app.catalogue."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.science = Category.objects.create(name='Science')
+        self.empty = Category.objects.create(name='Empty')
+        for difficulty in ['easy', 'easy', 'medium', 'hard', 'hard', 'hard']:
+            Question.objects.create(category=self.science, text='Question', difficulty=difficulty)
+
+    def test_counts_per_difficulty(self):
+        """The catalogue holds categories with questions and their counts."""
+        catalogue = get_catalogue()
+
+        self.assertEqual(catalogue.categories, [self.science])
+        self.assertEqual(catalogue.categories[0].num_questions, 6)
+        self.assertEqual(catalogue.question_count(self.science.id), 6)
+        self.assertEqual(catalogue.question_count(self.science.id, 'hard'), 3)
+        self.assertEqual(catalogue.question_count(self.empty.id), 0)
+        self.assertIsNone(catalogue.get_category(self.empty.id))
+
+    def test_cached_until_questions_change(self):
+        """The catalogue is loaded once and reloaded after a question changes."""
+        get_catalogue()
+        with self.assertNumQueries(0):
+            get_catalogue()
+
+        Question.objects.create(category=self.empty, text='First question', difficulty='easy')
+        catalogue = get_catalogue()
+        self.assertEqual(catalogue.categories, [self.empty, self.science])
+        self.assertEqual(catalogue.question_count(self.empty.id, 'easy'), 1)
+
+    def test_form_reads_catalogue(self):
+        """Building, rendering and validating the quiz form runs no queries once cached."""
+        get_catalogue()
+        with self.assertNumQueries(0):
+            form = QuizSelectionForm(data={
+                'category': self.science.id,
+                'num_questions': 5,
+                'time_limit': 0,
+            })
+            form.as_p()
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['category'], self.science)
+
+    def test_form_checks_available_questions(self):
+        """Asking for more questions than the category has is rejected."""
+        form = QuizSelectionForm(data={
+            'category': self.science.id,
+            'num_questions': 7,
+            'time_limit': 0,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('num_questions', form.errors)
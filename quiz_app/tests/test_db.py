@@ -0,0 +1,25 @@
+"""
+Tests for the database connection tuning.
+"""
+
+import unittest
+
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'SQLite pragmas')
+class SQLitePragmaTests(SimpleTestCase):
+    """Tests for quiz_app.db."""
+
+    databases = {'default'}
+
+    def test_new_connections_are_tuned(self):
+        """QUIZ_SQLITE_PRAGMAS are applied when a connection is opened."""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], settings.QUIZ_SQLITE_PRAGMAS['busy_timeout'])
+            cursor.execute('PRAGMA synchronous')
+            # 1 is NORMAL
+            self.assertEqual(cursor.fetchone()[0], 1)
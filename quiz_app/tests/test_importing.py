@@ -0,0 +1,234 @@
+"""
+Tests for the bulk question importer and the seeding commands that use it.
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import TestCase
+
+from quiz_app.catalogue import get_catalogue
+from quiz_app.importing import QuestionImporter
+from quiz_app.models import Category, Choice, Question
+from quiz_app.sampling import build_question_index, get_question_index
+
+
+class QuestionImporterTests(TestCase):
+    """Tests for quiz_app.importing."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.category = Category.objects.create(name='Science')
+
+    def test_batches_and_links_correct_choices(self):
+        """Questions are written in batches with their correct choice linked."""
+        importer = QuestionImporter(batch_size=10)
+        for i in range(20):
+            importer.add(
+                self.category,
+                f'Question {i}',
+                [(f'Wrong {i}', False), (f'Right {i}', True), {'text': f'Other {i}', 'is_correct': False}],
+                difficulty='hard',
+            )
+
+        # Each batch is three statements (questions, choices, correct-choice UPDATE)
+        # inside a savepoint, and nothing is left to write when finishing
+        with self.assertNumQueries(0):
+            importer.finish()
+        self.assertEqual(importer.questions_created, 20)
+        self.assertEqual(importer.choices_created, 60)
+        self.assertIn('20 questions and 60 choices', importer.summary())
+
+        for question in Question.objects.select_related('correct_choice'):
+            self.assertEqual(question.difficulty, 'hard')
+            self.assertEqual(question.correct_choice.text, question.text.replace('Question', 'Right'))
+        self.assertEqual(Choice.objects.filter(is_correct=True).count(), 20)
+
+    def test_batch_query_count(self):
+        """A batch costs a constant number of queries, whatever its size."""
+        importer = QuestionImporter(batch_size=100)
+        for i in range(50):
+            importer.add(self.category, f'Question {i}', [('Right', True), ('Wrong', False)])
+
+        with self.assertNumQueries(5):
+            importer.flush()
+
+    def test_finish_invalidates_caches(self):
+        """Finishing drops the cached question index and category catalogue."""
+        self.assertEqual(len(build_question_index(self.category.id)), 0)
+        self.assertEqual(get_catalogue().categories, [])
+
+        importer = QuestionImporter()
+        importer.add(self.category, 'Question', [('Right', True), ('Wrong', False)])
+        with self.captureOnCommitCallbacks(execute=True):
+            importer.finish()
+
+        self.assertIsNone(get_question_index(self.category.id))
+        self.assertEqual(get_catalogue().question_count(self.category.id), 1)
+
+    def test_caches_invalidated_on_commit(self):
+        """Inside a transaction, the caches are only invalidated once it commits."""
+        build_question_index(self.category.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                importer = QuestionImporter()
+                importer.add(self.category, 'Question', [('Right', True), ('Wrong', False)])
+                importer.finish()
+                self.assertIsNotNone(get_question_index(self.category.id))
+
+        self.assertIsNone(get_question_index(self.category.id))
+
+
+class SeedingCommandTests(TestCase):
+    """Tests for the question seeding management commands."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+
+    def test_load_sample_data(self):
+        """load_sample_data creates questions with their correct choice linked."""
+        out = StringIO()
+        call_command('load_sample_data', stdout=out)
+
+        self.assertTrue(Question.objects.exists())
+        self.assertFalse(Question.objects.filter(correct_choice__isnull=True).exists())
+        self.assertIn('rows/s', out.getvalue())
+
+    def test_populate_questions(self):
+        """populate_questions adds the requested questions to every category."""
+        Category.objects.create(name='Science')
+        Category.objects.create(name='History')
+
+        out = StringIO()
+        call_command(
+            'populate_questions', questions_per_category=7, choices_per_question=4,
+            batch_size=3, stdout=out
+        )
+
+        self.assertEqual(Question.objects.count(), 14)
+        self.assertEqual(Choice.objects.count(), 56)
+        self.assertFalse(Question.objects.filter(correct_choice__isnull=True).exists())
+        self.assertIn('Imported 14 questions and 56 choices', out.getvalue())
+
+
+class QuestionBankCommandTests(TestCase):
+    """Tests for the import_questions and export_questions commands."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        importer = QuestionImporter()
+        for name in ['Science', 'History']:
+            category = Category.objects.create(name=name)
+            for i in range(5):
+                importer.add(
+                    category,
+                    f'{name} question {i}, with "quotes"\nand a second line',
+                    [(f'Wrong {i}', False), (f'Right {i}', True), ('Other, with a comma', False)],
+                    difficulty='easy' if i % 2 else 'hard',
+                    explanation=f'Explanation {i}',
+                )
+        importer.finish()
+
+    def path(self, name):
+        """Return the path of a file in the temporary directory."""
+        return os.path.join(self.tmp.name, name)
+
+    def bank(self):
+        """Return the questions in the database as comparable tuples."""
+        return sorted(
+            (
+                question.category.name, question.difficulty, question.text, question.explanation,
+                question.correct_choice.text,
+                tuple(question.choice_set.order_by('pk').values_list('text', 'is_correct')),
+            )
+            for question in Question.objects.select_related('category', 'correct_choice')
+        )
+
+    def test_round_trip(self):
+        """Exporting and importing a bank recreates the same questions."""
+        expected = self.bank()
+        for name in ['bank.jsonl', 'bank.csv']:
+            with self.subTest(name=name):
+                path = self.path(name)
+                call_command('export_questions', path, chunk_size=3, stdout=StringIO())
+                Category.objects.all().delete()
+
+                out = StringIO()
+                call_command('import_questions', path, batch_size=4, stdout=out)
+
+                self.assertEqual(self.bank(), expected)
+                self.assertIn('Imported 10 questions and 30 choices', out.getvalue())
+                self.assertFalse(os.path.exists(f'{path}.checkpoint'))
+
+    def test_export_category(self):
+        """Only the requested categories are exported."""
+        path = self.path('science.jsonl')
+        call_command('export_questions', path, category=['Science'], stdout=StringIO())
+
+        with open(path, encoding='utf-8') as stream:
+            records = [json.loads(line) for line in stream]
+        self.assertEqual(len(records), 5)
+        self.assertEqual({record['category'] for record in records}, {'Science'})
+
+    def test_malformed_record(self):
+        """Records that cannot be parsed or hold malformed choices are reported by number."""
+        path = self.path('bank.jsonl')
+        call_command('export_questions', path, stdout=StringIO())
+        with open(path, encoding='utf-8') as stream:
+            lines = stream.readlines()
+        record = json.loads(lines[2])
+
+        for name, line in [
+            ('invalid JSON', '{"category": "Science",\n'),
+            ('choice not an object', json.dumps(record | {'choices': ['Yes', 'No']}) + '\n'),
+            ('choice without text', json.dumps(record | {'choices': [{'is_correct': True}, {}]}) + '\n'),
+        ]:
+            with self.subTest(name):
+                with open(path, 'w', encoding='utf-8') as stream:
+                    stream.writelines(lines[:2] + [line] + lines[3:])
+
+                with self.assertRaisesMessage(CommandError, f'Record 3 of {path}'):
+                    call_command('import_questions', path, stdout=StringIO())
+
+    def test_resume_after_invalid_record(self):
+        """An import stopped by an invalid record resumes after the committed batches."""
+        path = self.path('bank.jsonl')
+        call_command('export_questions', path, stdout=StringIO())
+        with open(path, encoding='utf-8') as stream:
+            lines = stream.readlines()
+        broken = json.loads(lines[6])
+        broken['choices'] = broken['choices'][:1]
+        lines[6] = json.dumps(broken) + '\n'
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.writelines(lines)
+        Category.objects.all().delete()
+
+        with self.assertRaisesMessage(CommandError, 'Record 7'):
+            call_command('import_questions', path, batch_size=3, stdout=StringIO())
+        # Records 1-6 were committed in two batches
+        self.assertEqual(Question.objects.count(), 6)
+
+        # Without --resume the checkpoint is not silently ignored
+        with self.assertRaisesMessage(CommandError, '--resume'):
+            call_command('import_questions', path, batch_size=3, stdout=StringIO())
+
+        lines[6] = json.dumps(json.loads(lines[5]) | {'text': 'Fixed question'}) + '\n'
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.writelines(lines)
+        call_command('import_questions', path, batch_size=3, resume=True, stdout=StringIO())
+
+        self.assertEqual(Question.objects.count(), 10)
+        self.assertTrue(Question.objects.filter(text='Fixed question').exists())
+        self.assertFalse(os.path.exists(f'{path}.checkpoint'))
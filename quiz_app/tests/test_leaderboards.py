@@ -0,0 +1,188 @@
+"""
+Tests for the materialized leaderboards and their views.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from quiz_app.models import (
+    Category, LeaderboardBucket, LeaderboardEntry, Question, QuizAttempt, Standing
+)
+
+
+class LeaderboardTestMixin:
+    """Helpers to complete quiz attempts and read leaderboards back."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.now = timezone.now()
+        self.math = Category.objects.create(name='Math')
+        self.science = Category.objects.create(name='Science')
+        for category in (self.math, self.science):
+            Question.objects.create(category=category, text=f'{category.name} question')
+
+    def complete(self, username, category, score, ago=timedelta(0)):
+        """Complete an attempt with the given score for a user, created on first use."""
+        user, _ = User.objects.get_or_create(username=username)
+        return QuizAttempt.objects.create(
+            user=user, category=category, score=score, total_questions=10,
+            started_at=self.now - ago, completed_at=self.now - ago
+        )
+
+    def snapshot(self):
+        """Return the leaderboard entries and non-empty buckets as comparable sets."""
+        entries = set(LeaderboardEntry.objects.values_list(
+            'user__username', 'period', 'category_id', 'points', 'updated_at'
+        ))
+        buckets = set(LeaderboardBucket.objects.exclude(users=0).values_list(
+            'period', 'category_id', 'points', 'users'
+        ))
+        return entries, buckets
+
+
+class LeaderboardEntryTests(LeaderboardTestMixin, TestCase):
+    """Tests for the incremental leaderboard updates and lookups."""
+
+    def test_ranks(self):
+        """Users are ranked by points; ties share a rank and are listed by who got there first."""
+        self.complete('alice', self.math, 5, ago=timedelta(minutes=3))
+        self.complete('bob', self.science, 8, ago=timedelta(minutes=2))
+        self.complete('carol', self.math, 8, ago=timedelta(minutes=1))
+        self.complete('alice', self.science, 4)
+
+        top = LeaderboardEntry.top()
+        self.assertEqual(
+            [(entry.rank, entry.user.username, entry.points) for entry in top],
+            [(1, 'alice', 9), (2, 'bob', 8), (2, 'carol', 8)]
+        )
+        carol = User.objects.get(username='carol')
+        self.assertEqual(LeaderboardEntry.standing(carol.pk), Standing(2, 8, 3))
+        self.assertEqual(LeaderboardEntry.standing(carol.pk, category_id=self.math.pk), Standing(1, 8, 2))
+        self.assertIsNone(LeaderboardEntry.standing(carol.pk, category_id=self.science.pk))
+
+    def test_weekly_leaderboard(self):
+        """Attempts count towards the leaderboard of the week they were completed in."""
+        self.complete('alice', self.math, 5, ago=timedelta(days=8))
+        self.complete('bob', self.math, 3)
+
+        week = LeaderboardEntry.week_period(self.now)
+        self.assertEqual([entry.user.username for entry in LeaderboardEntry.top(week)], ['bob'])
+        self.assertEqual(
+            [entry.user.username for entry in LeaderboardEntry.top(LeaderboardEntry.ALL_TIME)],
+            ['alice', 'bob']
+        )
+
+    def test_rebuild_matches_incremental_updates(self):
+        """Rebuilding from attempts gives the entries and buckets kept up incrementally."""
+        self.complete('alice', self.math, 5, ago=timedelta(days=8))
+        self.complete('alice', self.science, 0)
+        self.complete('bob', self.math, 3, ago=timedelta(hours=1))
+        self.complete('bob', self.math, 2)
+        self.complete('carol', self.science, 5)
+        incremental = self.snapshot()
+
+        LeaderboardEntry.rebuild(list(User.objects.values_list('pk', flat=True)))
+
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_close_expired_updates_leaderboards(self):
+        """Attempts closed by the expiry sweeper are added to the leaderboards."""
+        user = User.objects.create_user(username='alice')
+        QuizAttempt.objects.create(
+            user=user, category=self.math, score=4, time_limit=60,
+            started_at=self.now - timedelta(minutes=5)
+        )
+
+        QuizAttempt.close_expired()
+
+        self.assertEqual(LeaderboardEntry.standing(user.pk), Standing(1, 4, 1))
+
+    def test_backfill_command(self):
+        """The backfill command rebuilds every user's entries."""
+        self.complete('alice', self.math, 5)
+        self.complete('bob', self.science, 3)
+        expected = self.snapshot()
+        LeaderboardEntry.objects.filter(user__username='alice').delete()
+        LeaderboardBucket.objects.update(users=0)
+
+        out = StringIO()
+        call_command('backfill_leaderboards', chunk_size=1, stdout=out)
+
+        self.assertIn('for 2 users', out.getvalue())
+        self.assertEqual(self.snapshot(), expected)
+        self.assertFalse(LeaderboardBucket.objects.filter(users=0).exists())
+
+
+class LeaderboardViewTests(LeaderboardTestMixin, TestCase):
+    """Tests for the leaderboard page and JSON API."""
+
+    def test_api(self):
+        """The API returns the top entries and the user's standing."""
+        for i in range(5):
+            self.complete(f'user{i}', self.math, i)
+        self.client.force_login(User.objects.get(username='user1'))
+
+        response = self.client.get(reverse('quiz:leaderboard_api'), {'limit': 2})
+
+        self.assertEqual(response.json(), {
+            'period': 'all',
+            'category': None,
+            'entries': [
+                {'rank': 1, 'username': 'user4', 'points': 4},
+                {'rank': 2, 'username': 'user3', 'points': 3},
+            ],
+            'me': {'rank': 4, 'points': 1, 'players': 5},
+        })
+
+    def test_api_filters(self):
+        """The API selects the weekly and per-category leaderboards, and rejects unknown ones."""
+        self.complete('alice', self.math, 5)
+        self.complete('bob', self.science, 3)
+        url = reverse('quiz:leaderboard_api')
+
+        data = self.client.get(url, {'period': 'week', 'category': self.science.pk}).json()
+
+        self.assertEqual(data['period'], LeaderboardEntry.week_period(timezone.now()))
+        self.assertEqual(data['category'], self.science.pk)
+        self.assertEqual([entry['username'] for entry in data['entries']], ['bob'])
+        self.assertIsNone(data['me'])
+        self.assertEqual(self.client.get(url, {'period': 'month'}).status_code, 404)
+        self.assertEqual(self.client.get(url, {'category': 'x'}).status_code, 404)
+
+    def test_query_count_independent_of_users(self):
+        """Leaderboard lookups run a fixed number of queries however many users are ranked."""
+        self.complete('alice', self.math, 5)
+        self.client.force_login(User.objects.get(username='alice'))
+        url = reverse('quiz:leaderboard_api')
+        self.client.get(url)  # Fill the category catalogue cache
+
+        def queries():
+            with CaptureQueriesContext(connection) as captured:
+                self.client.get(url, {'category': self.math.pk})
+            return len(captured)
+
+        before = queries()
+        for i in range(20):
+            self.complete(f'user{i}', self.math, i % 7)
+        self.assertEqual(queries(), before)
+
+    def test_page(self):
+        """The page lists the top players and the logged-in user's rank."""
+        self.complete('alice', self.math, 5)
+        self.complete('bob', self.math, 3)
+        self.client.force_login(User.objects.get(username='bob'))
+
+        response = self.client.get(reverse('quiz:leaderboard'))
+
+        self.assertContains(response, 'alice')
+        self.assertContains(response, '<strong>#2</strong> of 2', html=False)
@@ -7,12 +7,19 @@ This module contains tests for the models used in the quiz application:
 - Choice
 - QuizAttempt
 - QuizResponse
+- UserStats
 """
 
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.contrib.auth.models import User
-from quiz_app.models import Category, Question, Choice, QuizAttempt, QuizResponse
+from quiz_app.models import (
+    Category, Question, Choice, QuizAttempt, QuizResponse, UserStats, LeaderboardEntry
+)
 
 
 class CategoryModelTests(TestCase):
@@ -90,8 +97,46 @@ class QuestionModelTests(TestCase):
         self.assertEqual(str(self.question), "What is the answer to this question?")
     
     def test_correct_choice(self):
-        """Test the correct_choice method."""
-        self.assertEqual(self.question.correct_choice(), self.correct_choice)
+        """Test the correct_choice pointer."""
+        self.assertEqual(self.question.correct_choice, self.correct_choice)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.correct_choice_id, self.correct_choice.id)
+    
+    def test_correct_choice_follows_choice_updates(self):
+        """Marking another choice correct moves the pointer; unmarking clears it."""
+        self.incorrect_choice.is_correct = True
+        self.incorrect_choice.save()
+        
+        self.question.refresh_from_db()
+        self.correct_choice.refresh_from_db()
+        self.assertEqual(self.question.correct_choice_id, self.incorrect_choice.id)
+        self.assertFalse(self.correct_choice.is_correct)
+        
+        self.incorrect_choice.is_correct = False
+        self.incorrect_choice.save()
+        self.question.refresh_from_db()
+        self.assertIsNone(self.question.correct_choice_id)
+    
+    def test_saving_incorrect_choice_does_not_update_siblings(self):
+        """Saving a choice that stays incorrect runs no extra UPDATE."""
+        with CaptureQueriesContext(connection) as queries:
+            self.incorrect_choice.text = "Still wrong"
+            self.incorrect_choice.save()
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+    
+    def test_link_correct_choices(self):
+        """Bulk-created choices are linked to their questions in one UPDATE."""
+        question = Question.objects.create(category=self.category, text="Bulk question")
+        choices = Choice.objects.bulk_create([
+            Choice(question=question, text="Wrong"),
+            Choice(question=question, text="Right", is_correct=True),
+        ])
+        
+        with self.assertNumQueries(1):
+            Question.link_correct_choices(Question.objects.filter(pk=question.pk))
+        question.refresh_from_db()
+        self.assertEqual(question.correct_choice_id, choices[1].id)
 
 
 class ChoiceModelTests(TestCase):
@@ -135,6 +180,24 @@ class ChoiceModelTests(TestCase):
         self.choice.refresh_from_db()
         self.assertFalse(self.choice.is_correct)
         self.assertTrue(new_choice.is_correct)
+    
+    def test_unique_correct_choice_without_pointer(self):
+        """Choices bulk-created without a linked pointer are still unmarked."""
+        question = Question.objects.create(category=self.category, text="Bulk question")
+        bulk_choice = Choice.objects.bulk_create([
+            Choice(question=question, text="Bulk Right", is_correct=True),
+        ])[0]
+        
+        new_choice = Choice.objects.create(
+            question=question,
+            text="New Right",
+            is_correct=True
+        )
+        
+        bulk_choice.refresh_from_db()
+        question.refresh_from_db()
+        self.assertFalse(bulk_choice.is_correct)
+        self.assertEqual(question.correct_choice_id, new_choice.id)
 
 
 class QuizAttemptModelTests(TestCase):
@@ -211,6 +274,134 @@ class QuizAttemptModelTests(TestCase):
         self.assertEqual(score, 1)
         self.assertEqual(self.quiz_attempt.score, 1)
     
+    def test_responses_update_counters(self):
+        """Recording a response increments the score and answered count."""
+        question = Question.objects.create(category=self.category, text="Question 1")
+        correct_choice = Choice.objects.create(question=question, text="Right", is_correct=True)
+        other_question = Question.objects.create(category=self.category, text="Question 2")
+        wrong_choice = Choice.objects.create(question=other_question, text="Wrong", is_correct=False)
+        
+        QuizResponse.objects.create(
+            quiz_attempt=self.quiz_attempt, question=question, selected_choice=correct_choice
+        )
+        QuizResponse.objects.create(
+            quiz_attempt=self.quiz_attempt, question=other_question, selected_choice=wrong_choice
+        )
+        
+        self.quiz_attempt.refresh_from_db()
+        self.assertEqual(self.quiz_attempt.score, 1)
+        self.assertEqual(self.quiz_attempt.answered_count, 2)
+    
+    def test_complete_is_a_single_update(self):
+        """Completing an attempt needs no aggregate query and one UPDATE of the attempt."""
+        with CaptureQueriesContext(connection) as queries:
+            self.quiz_attempt.complete()
+        self.assertTrue(self.quiz_attempt.is_complete())
+        
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertFalse([sql for sql in statements if 'COUNT(' in sql])
+        self.assertEqual(
+            len([sql for sql in statements if sql.startswith('UPDATE "quiz_app_quizattempt"')]), 1
+        )
+    
+    def test_rebuild_attempt_counters_command(self):
+        """The consistency check repairs counters that drifted from the responses."""
+        question = Question.objects.create(category=self.category, text="Question")
+        choice = Choice.objects.create(question=question, text="Right", is_correct=True)
+        QuizResponse.objects.create(
+            quiz_attempt=self.quiz_attempt, question=question, selected_choice=choice
+        )
+        QuizAttempt.objects.filter(pk=self.quiz_attempt.pk).update(score=5, answered_count=0)
+        
+        out = StringIO()
+        call_command('rebuild_attempt_counters', stdout=out)
+        
+        self.quiz_attempt.refresh_from_db()
+        self.assertEqual(self.quiz_attempt.score, 1)
+        self.assertEqual(self.quiz_attempt.answered_count, 1)
+        self.assertIn('Repaired 1 quiz attempts', out.getvalue())
+    
+    def test_rebuild_attempt_counters_rebuilds_stats(self):
+        """Repairing a completed attempt also rebuilds its user's statistics and leaderboards."""
+        self.quiz_attempt.complete()
+        QuizAttempt.objects.filter(pk=self.quiz_attempt.pk).update(score=5, answered_count=5)
+        UserStats.rebuild([self.user.id])
+        LeaderboardEntry.rebuild([self.user.id])
+        
+        call_command('rebuild_attempt_counters', stdout=StringIO())
+        
+        stats = UserStats.objects.get(user=self.user, category__isnull=True)
+        self.assertEqual(stats.best_percentage, 0.0)
+        self.assertEqual(LeaderboardEntry.standing(self.user.id).points, 0)
+    
+    def test_counters_follow_response_updates_and_deletes(self):
+        """Regrading or deleting a stored response adjusts the attempt's counters."""
+        question = Question.objects.create(category=self.category, text="Question")
+        wrong = Choice.objects.create(question=question, text="Wrong", is_correct=False)
+        right = Choice.objects.create(question=question, text="Right", is_correct=True)
+        QuizResponse.objects.create(
+            quiz_attempt=self.quiz_attempt, question=question, selected_choice=wrong
+        )
+        
+        response = QuizResponse.objects.get(quiz_attempt=self.quiz_attempt)
+        response.selected_choice = right
+        response.save()
+        self.quiz_attempt.refresh_from_db()
+        self.assertEqual((self.quiz_attempt.score, self.quiz_attempt.answered_count), (1, 1))
+        
+        response.delete()
+        self.quiz_attempt.refresh_from_db()
+        self.assertEqual((self.quiz_attempt.score, self.quiz_attempt.answered_count), (0, 0))
+    
+    def test_counters_of_completed_attempt(self):
+        """Responses stored, regraded or deleted on a completed attempt update its counters and stats."""
+        self.quiz_attempt.total_questions = 1
+        self.quiz_attempt.save()
+        self.quiz_attempt.complete()
+        question = Question.objects.create(category=self.category, text="Question")
+        wrong = Choice.objects.create(question=question, text="Wrong", is_correct=False)
+        right = Choice.objects.create(question=question, text="Right", is_correct=True)
+        
+        def assert_counted(score, answered, best_percentage, points):
+            self.quiz_attempt.refresh_from_db()
+            self.assertEqual((self.quiz_attempt.score, self.quiz_attempt.answered_count), (score, answered))
+            stats = UserStats.objects.get(user=self.user, category__isnull=True)
+            self.assertEqual(stats.attempts, 1)
+            self.assertEqual(stats.best_percentage, best_percentage)
+            self.assertEqual(LeaderboardEntry.standing(self.user.id).points, points)
+        
+        response = QuizResponse.objects.create(
+            quiz_attempt=self.quiz_attempt, question=question, selected_choice=right
+        )
+        assert_counted(1, 1, 100.0, 1)
+        
+        response.selected_choice = wrong
+        response.save()
+        assert_counted(0, 1, 0.0, 0)
+        
+        response.delete()
+        assert_counted(0, 0, 0.0, 0)
+    
+    def test_deleting_attempt_does_not_load_responses(self):
+        """Responses are deleted with their attempt without per-response queries."""
+        query_counts = {}
+        for num_responses in (5, 20):
+            attempt = QuizAttempt.objects.create(
+                user=self.user, category=self.category, total_questions=num_responses
+            )
+            for i in range(num_responses):
+                question = Question.objects.create(category=self.category, text=f"Q{num_responses}-{i}")
+                choice = Choice.objects.create(question=question, text="Right", is_correct=True)
+                QuizResponse.objects.create(
+                    quiz_attempt=attempt, question=question, selected_choice=choice
+                )
+            with CaptureQueriesContext(connection) as queries:
+                attempt.delete()
+            query_counts[num_responses] = len(queries.captured_queries)
+            self.assertFalse(QuizResponse.objects.filter(quiz_attempt_id=attempt.id).exists())
+        
+        self.assertEqual(query_counts[5], query_counts[20])
+    
     def test_score_percentage(self):
         """Test the score_percentage method."""
         # Set the score
@@ -292,4 +483,76 @@ class QuizResponseModelTests(TestCase):
         )
         
         expected_str = f"Response to {self.question} in {self.quiz_attempt}"
-        self.assertEqual(str(response), expected_str) 
\ No newline at end of file
+        self.assertEqual(str(response), expected_str)
+
+
+class UserStatsModelTests(TestCase):
+    """Tests for the UserStats model."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.category1 = Category.objects.create(name="Category 1")
+        self.category2 = Category.objects.create(name="Category 2")
+    
+    def complete_attempt(self, category, score, total=5):
+        """Create an attempt and complete it the way QuestionView does."""
+        attempt = QuizAttempt.objects.create(
+            user=self.user, category=category, total_questions=total, score=score
+        )
+        attempt.complete()
+        return attempt
+    
+    def test_stats_updated_when_attempt_completes(self):
+        """Completing attempts updates the overall and per-category rows."""
+        self.complete_attempt(self.category1, 5)
+        self.complete_attempt(self.category1, 3)
+        self.complete_attempt(self.category2, 1)
+        
+        overall = UserStats.objects.get(user=self.user, category__isnull=True)
+        self.assertEqual(overall.attempts, 3)
+        self.assertAlmostEqual(overall.average_percentage(), 60.0)
+        self.assertEqual(overall.best_percentage, 100.0)
+        self.assertEqual(overall.worst_percentage, 20.0)
+        self.assertEqual(overall.perfect_count, 1)
+        
+        category1 = UserStats.objects.get(user=self.user, category=self.category1)
+        self.assertEqual(category1.attempts, 2)
+        self.assertAlmostEqual(category1.average_percentage(), 80.0)
+        
+        profile = User.objects.get(pk=self.user.pk).profile
+        with self.assertNumQueries(1):
+            self.assertEqual(profile.total_quizzes_taken(), 3)
+            self.assertAlmostEqual(profile.average_score(), 60.0)
+    
+    def test_saving_completed_attempt_again_is_not_recounted(self):
+        """Only the transition to completed is recorded."""
+        attempt = self.complete_attempt(self.category1, 4)
+        attempt.save()
+        QuizAttempt.objects.get(pk=attempt.pk).save()
+        
+        self.assertEqual(UserStats.objects.get(user=self.user, category__isnull=True).attempts, 1)
+    
+    def test_open_attempts_are_not_recorded(self):
+        """Attempts that are not completed do not count."""
+        QuizAttempt.objects.create(user=self.user, category=self.category1, total_questions=5)
+        self.assertFalse(UserStats.objects.exists())
+    
+    def test_backfill_matches_incremental_stats(self):
+        """The backfill command rebuilds the same rows the incremental updates produce."""
+        self.complete_attempt(self.category1, 5)
+        self.complete_attempt(self.category1, 2)
+        self.complete_attempt(self.category2, 4)
+        fields = ['category_id', 'attempts', 'percentage_sum', 'best_percentage',
+                  'worst_percentage', 'perfect_count', 'last_attempt_at']
+        expected = sorted(UserStats.objects.values_list(*fields), key=str)
+        
+        UserStats.objects.all().delete()
+        call_command('backfill_user_stats', chunk_size=1, stdout=StringIO())
+        
+        rebuilt = sorted(UserStats.objects.values_list(*fields), key=str)
+        self.assertEqual(len(rebuilt), 3)
+        for expected_row, rebuilt_row in zip(expected, rebuilt):
+            self.assertEqual(expected_row[:2], rebuilt_row[:2])
+            self.assertAlmostEqual(expected_row[2], rebuilt_row[2])
+            self.assertEqual(expected_row[3:], rebuilt_row[3:])
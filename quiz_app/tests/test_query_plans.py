@@ -0,0 +1,157 @@
+"""
+Query plan tests for the Quiz application.
+
+These tests play through the main views on a seeded dataset, record every
+SELECT they run and check with EXPLAIN QUERY PLAN that none of them reads
+a whole quiz, question, choice or response table. They also check that
+the hot query shapes are served by the indexes declared for them.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from quiz_app.models import Category, Choice, Question, QuizAttempt, QuizResponse
+
+# Tables that grow with usage and must only be read through an index
+HOT_TABLES = (
+    'quiz_app_question',
+    'quiz_app_choice',
+    'quiz_app_quizattempt',
+    'quiz_app_quizresponse',
+)
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Query plans are checked on SQLite')
+@override_settings(QUIZ_CHART_WORKERS=0)
+class QueryPlanTests(TestCase):
+    """Check the query plans of the main views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed categories, questions, completed attempts and responses."""
+        cls.user = User.objects.create_user(username='planner', password='testpassword')
+        other = User.objects.create_user(username='other', password='testpassword')
+
+        cls.categories = [Category.objects.create(name=f'Category {i}') for i in range(3)]
+        questions = Question.objects.bulk_create([
+            Question(category=category, text=f'Question {i}', difficulty='medium')
+            for category in cls.categories for i in range(30)
+        ])
+        Choice.objects.bulk_create([
+            Choice(question=question, text=f'Choice {i}', is_correct=(i == 0))
+            for question in questions for i in range(4)
+        ])
+        correct = {choice.question_id: choice for choice in Choice.objects.filter(is_correct=True)}
+
+        for user in (cls.user, other):
+            for n in range(10):
+                category = cls.categories[n % len(cls.categories)]
+                attempt = QuizAttempt.objects.create(
+                    user=user, category=category, total_questions=5
+                )
+                category_questions = [q for q in questions if q.category_id == category.id][:5]
+                QuizResponse.objects.bulk_create([
+                    QuizResponse(
+                        quiz_attempt=attempt,
+                        question=question,
+                        selected_choice=correct[question.id],
+                        is_correct=True,
+                    )
+                    for question in category_questions
+                ])
+                attempt.calculate_score()
+                attempt.completed_at = timezone.now()
+                attempt.save()
+        cls.attempt = attempt
+
+    def setUp(self):
+        """Start from an empty cache so every view hits the database."""
+        cache.clear()
+        self.client.login(username='planner', password='testpassword')
+
+    def tearDown(self):
+        """Clear cached data created by the views."""
+        cache.clear()
+
+    def record_selects(self, func):
+        """Call func and return the (sql, params) of every SELECT it ran."""
+        selects = []
+
+        def recorder(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                selects.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(recorder):
+            func()
+        return selects
+
+    def full_scans(self, selects):
+        """Return the plan lines of the recorded queries that scan a hot table."""
+        scans = []
+        with connection.cursor() as cursor:
+            for sql, params in selects:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    if any(detail.startswith(f'SCAN {table}') for table in HOT_TABLES):
+                        scans.append(f'{detail}\n    in: {sql}')
+        return scans
+
+    def play_views(self):
+        """Take a quiz and visit the result and statistics pages."""
+        category = self.categories[0]
+        self.client.post(reverse('quiz:start'), {
+            'category': category.id,
+            'num_questions': 5,
+            'time_limit': 0,
+        })
+        question_ids = self.client.session['quiz_questions']
+        for question_id in question_ids:
+            self.client.get(reverse('quiz:question'))
+            choice = Choice.objects.filter(question_id=question_id).first()
+            self.client.post(reverse('quiz:question'), {'choice': choice.id})
+        self.client.get(reverse('quiz:question'))
+
+        self.client.get(reverse('quiz:results', args=[self.attempt.id]))
+        self.client.get(reverse('quiz:results_chart', args=[self.attempt.id]))
+        self.client.get(reverse('quiz:user_stats'))
+        self.client.get(reverse('quiz:user_stats_chart', args=['category']))
+        self.client.get(reverse('quiz:profile'))
+
+    @patch('quiz_app.analytics.STATS_CHARTS', {'category': lambda data: b'png'})
+    @patch('quiz_app.analytics.render_results_chart', return_value=b'png')
+    def test_main_views_use_indexes(self, render_results_chart):
+        """No query run by the main views does a full scan of a hot table."""
+        selects = self.record_selects(self.play_views)
+
+        self.assertTrue(selects)
+        self.assertTrue(render_results_chart.called)
+        scans = self.full_scans(selects)
+        self.assertEqual(scans, [], 'Full table scans:\n' + '\n'.join(scans))
+
+    def test_hot_queries_use_composite_indexes(self):
+        """The hot query shapes are served by the indexes declared for them."""
+        attempt = self.attempt
+        question = attempt.quizresponse_set.first().question
+        plans = {
+            'attempt_user_completed_idx': QuizAttempt.objects.filter(
+                user=self.user, completed_at__isnull=False
+            ).explain(),
+            'response_correct_idx': QuizResponse.objects.filter(
+                quiz_attempt=attempt, is_correct=True
+            ).order_by().explain(),
+            'choice_correct_idx': Choice.objects.filter(
+                question=question, is_correct=True
+            ).explain(),
+        }
+        for index, plan in plans.items():
+            with self.subTest(index=index):
+                self.assertIn(index, plan)
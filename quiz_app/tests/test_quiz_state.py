@@ -0,0 +1,61 @@
+"""
+Tests for the quiz state store.
+"""
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from quiz_app.quiz_state import CacheStore, LRUStore, get_state_store
+
+
+class LRUStoreTests(SimpleTestCase):
+    """Tests for quiz_app.quiz_state.LRUStore."""
+
+    def test_evicts_least_recently_used(self):
+        """A full store forgets the entry that was used longest ago."""
+        store = LRUStore(max_entries=2)
+        store.set('a', 1)
+        store.set('b', 2)
+        store.get('a')
+        store.set('c', 3)
+
+        self.assertEqual(store.get('a'), 1)
+        self.assertIsNone(store.get('b'))
+        self.assertEqual(store.get('c'), 3)
+
+    def test_delete(self):
+        """Deleted and unknown keys read as None."""
+        store = LRUStore(max_entries=2)
+        store.set('a', 1)
+        store.delete('a')
+        store.delete('missing')
+        self.assertIsNone(store.get('a'))
+
+
+class StateStoreSettingsTests(SimpleTestCase):
+    """Tests for selecting the store with QUIZ_STATE_BACKEND."""
+
+    @override_settings(QUIZ_STATE_BACKEND='session')
+    def test_session_backend_has_no_store(self):
+        self.assertIsNone(get_state_store())
+
+    def test_session_is_the_default(self):
+        with self.settings():
+            del settings.QUIZ_STATE_BACKEND
+            self.assertIsNone(get_state_store())
+
+    @override_settings(QUIZ_STATE_BACKEND='cache', QUIZ_STATE_CACHE='default')
+    def test_cache_backend(self):
+        self.assertIsInstance(get_state_store(), CacheStore)
+
+    @override_settings(QUIZ_STATE_BACKEND='lru', QUIZ_STATE_LRU_SIZE=5)
+    def test_lru_backend_is_shared(self):
+        store = get_state_store()
+        self.assertIsInstance(store, LRUStore)
+        self.assertIs(get_state_store(), store)
+        self.assertEqual(store.max_entries, 5)
+
+    @override_settings(QUIZ_STATE_BACKEND='redis')
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_state_store()
@@ -0,0 +1,76 @@
+"""
+Tests for the random question sampling engine.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from quiz_app.models import Category, Question
+from quiz_app.sampling import (
+    build_question_index, get_question_index, sample_question_ids
+)
+
+
+class QuestionSamplingTests(TestCase):
+    """Tests for quiz_app.sampling."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.category = Category.objects.create(name='Test Category')
+        self.other_category = Category.objects.create(name='Other Category')
+        self.question_ids = [
+            Question.objects.create(category=self.category, text=f'Question {i}').id
+            for i in range(30)
+        ]
+        Question.objects.create(category=self.other_category, text='Elsewhere')
+
+    def test_missing_index_is_built_and_sampled(self):
+        """Without an index, one query builds it and the sample is drawn from it."""
+        self.assertIsNone(get_question_index(self.category.id))
+
+        with self.assertNumQueries(1):
+            ids = sample_question_ids(self.category.id, 10)
+
+        self.assertEqual(len(ids), 10)
+        self.assertEqual(len(set(ids)), 10)
+        self.assertTrue(set(ids) <= set(self.question_ids))
+        self.assertEqual(list(get_question_index(self.category.id)), sorted(self.question_ids))
+
+    def test_indexed_sampling_runs_no_queries(self):
+        """Once the index is cached, sampling does not touch the database."""
+        build_question_index(self.category.id)
+
+        with self.assertNumQueries(0):
+            ids = sample_question_ids(self.category.id, 10)
+
+        self.assertEqual(len(set(ids)), 10)
+        self.assertTrue(set(ids) <= set(self.question_ids))
+
+    def test_small_category_returns_every_question(self):
+        """A category with fewer questions than requested returns all of them."""
+        ids = sample_question_ids(self.other_category.id, 5)
+        self.assertEqual(len(ids), 1)
+
+    def test_index_invalidated_when_questions_change(self):
+        """Adding or deleting a question drops the category's index."""
+        build_question_index(self.category.id)
+        question = Question.objects.create(category=self.category, text='New question')
+        self.assertIsNone(get_question_index(self.category.id))
+
+        build_question_index(self.category.id)
+        question.delete()
+        self.assertIsNone(get_question_index(self.category.id))
+
+    def test_index_invalidated_when_question_moves(self):
+        """Moving a question drops the index of both its old and new category."""
+        build_question_index(self.category.id)
+        build_question_index(self.other_category.id)
+
+        question = Question.objects.get(pk=self.question_ids[0])
+        question.category = self.other_category
+        question.save()
+
+        self.assertIsNone(get_question_index(self.category.id))
+        self.assertIsNone(get_question_index(self.other_category.id))
+        self.assertNotIn(question.id, sample_question_ids(self.category.id, 50))
@@ -3,11 +3,16 @@ Tests for the quiz timer functionality.
 """
 
 from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.utils import timezone
 from django.contrib.auth.models import User
-from quiz_app.models import Category, Question, Choice, QuizAttempt, QuizResponse
+from quiz_app.models import (
+    Category, Question, Choice, QuizAttempt, QuizResponse, UserStats, LeaderboardEntry
+)
 
 class QuizTimerTests(TestCase):
     """Test cases for the quiz timer feature."""
@@ -153,4 +158,166 @@ class QuizTimerTests(TestCase):
         
         # Check that the timer is not displayed
         self.assertNotContains(response, 'Time Remaining:')
-        self.assertNotContains(response, 'id="timer"') 
\ No newline at end of file
+        self.assertNotContains(response, 'id="timer"') 
+    
+    def test_question_view_after_attempt_closed_elsewhere(self):
+        """A quiz closed by the expiry sweeper ends when the user comes back."""
+        self.client.login(username='testuser', password='testpassword123')
+        self.client.post(reverse('quiz:start'), {
+            'category': self.category.id,
+            'num_questions': 5,
+            'time_limit': 60
+        })
+        quiz_attempt = QuizAttempt.objects.get()
+        quiz_attempt.started_at = timezone.now() - timedelta(minutes=2)
+        quiz_attempt.save(update_fields=['started_at'])
+        QuizAttempt.close_expired()
+        
+        response = self.client.get(reverse('quiz:question'))
+        
+        self.assertRedirects(response, reverse('quiz:results', kwargs={'quiz_id': quiz_attempt.id}))
+        self.assertNotIn('quiz_attempt_id', self.client.session)
+    
+    def test_answer_after_attempt_closed_elsewhere(self):
+        """Answers to a quiz closed by the expiry sweeper are rejected and the quiz ends."""
+        self.client.login(username='testuser', password='testpassword123')
+        self.client.post(reverse('quiz:start'), {
+            'category': self.category.id,
+            'num_questions': 5,
+            'time_limit': 60
+        })
+        self.client.get(reverse('quiz:question'))
+        quiz_attempt = QuizAttempt.objects.get()
+        quiz_attempt.started_at = timezone.now() - timedelta(minutes=2)
+        quiz_attempt.save(update_fields=['started_at'])
+        QuizAttempt.close_expired()
+        
+        question_id = self.client.session['quiz_questions'][0]
+        correct_choice = Choice.objects.get(question_id=question_id, is_correct=True)
+        response = self.client.post(reverse('quiz:question'), {'choice': correct_choice.id}, follow=True)
+        
+        self.assertRedirects(response, reverse('quiz:results', kwargs={'quiz_id': quiz_attempt.id}))
+        self.assertNotIn('quiz_attempt_id', self.client.session)
+        self.assertFalse(QuizResponse.objects.exists())
+        quiz_attempt.refresh_from_db()
+        self.assertEqual((quiz_attempt.score, quiz_attempt.answered_count), (0, 0))
+        self.assertEqual(quiz_attempt.completed_at, quiz_attempt.deadline_at)
+
+
+class QuizAttemptExpiryTests(TestCase):
+    """Test cases for closing expired timed attempts in bulk."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(username='testuser', password='testpassword123')
+        self.category = Category.objects.create(name='Test Category')
+        self.now = timezone.now()
+    
+    def create_attempt(self, time_limit, started_ago, completed=False, user=None):
+        """Create an attempt started started_ago seconds before now."""
+        return QuizAttempt.objects.create(
+            user=user,
+            category=self.category,
+            total_questions=5,
+            score=2,
+            answered_count=3,
+            time_limit=time_limit,
+            started_at=self.now - timedelta(seconds=started_ago),
+            completed_at=self.now if completed else None,
+        )
+    
+    def test_close_expired(self):
+        """Only open timed attempts past their deadline are closed, at the deadline."""
+        expired = [
+            self.create_attempt(60, 61, user=self.user),
+            self.create_attempt(60, 3600),
+            self.create_attempt(300, 301, user=self.user),
+        ]
+        running = self.create_attempt(300, 200)
+        untimed = self.create_attempt(0, 3600)
+        done = self.create_attempt(60, 3600, completed=True)
+        
+        closed = QuizAttempt.close_expired(now=self.now, batch_size=1)
+        
+        self.assertEqual(closed, 3)
+        for attempt in expired:
+            attempt.refresh_from_db()
+            self.assertEqual(
+                attempt.completed_at, attempt.started_at + timedelta(seconds=attempt.time_limit)
+            )
+            self.assertEqual(attempt.score, 2)
+        for attempt in [running, untimed]:
+            attempt.refresh_from_db()
+            self.assertIsNone(attempt.completed_at)
+        done.refresh_from_db()
+        self.assertEqual(done.completed_at, self.now)
+        
+        # Closed attempts count in their users' statistics
+        overall = UserStats.objects.get(user=self.user, category=None)
+        self.assertEqual(overall.attempts, 2)
+        self.assertAlmostEqual(overall.best_percentage, 40.0)
+    
+    def test_completed_once(self):
+        """An attempt closed by the sweeper is not completed again from a stale copy."""
+        for method in ['complete', 'save']:
+            with self.subTest(method=method):
+                UserStats.objects.all().delete()
+                LeaderboardEntry.objects.all().delete()
+                stale = self.create_attempt(60, 120, user=self.user)
+                stale = QuizAttempt.objects.get(pk=stale.pk)
+                QuizAttempt.close_expired()
+                
+                stale.completed_at = timezone.now()
+                getattr(stale, method)()
+                
+                stale.refresh_from_db()
+                self.assertEqual(stale.completed_at, stale.deadline_at)
+                self.assertEqual(UserStats.objects.get(user=self.user, category=None).attempts, 1)
+                self.assertEqual(LeaderboardEntry.standing(self.user.pk).points, 2)
+                stale.delete()
+    
+    def test_command(self):
+        """The command reports how many attempts it closed."""
+        self.create_attempt(60, 120)
+        self.create_attempt(60, 120)
+        
+        out = StringIO()
+        call_command('expire_quiz_attempts', stdout=out)
+        
+        self.assertIn('Closed 2 expired quiz attempts', out.getvalue())
+        self.assertFalse(QuizAttempt.objects.filter(completed_at__isnull=True).exists())
+    
+    def test_expired_query_uses_index(self):
+        """Expired attempts are found through the open timed attempt index."""
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plans are checked on SQLite')
+        plans = [
+            QuizAttempt.expired(self.now).values_list('pk', 'user_id').explain(),
+            QuizAttempt.expiring(timedelta(minutes=1), self.now).explain(),
+        ]
+        
+        for plan in plans:
+            self.assertIn('attempt_open_deadline_idx', plan)
+    
+    def test_deadline_stored(self):
+        """deadline_at follows started_at and time_limit, and is null without a limit."""
+        attempt = self.create_attempt(60, 10)
+        self.assertEqual(attempt.deadline_at, attempt.started_at + timedelta(seconds=60))
+        self.assertIsNone(self.create_attempt(0, 10).deadline_at)
+        
+        attempt.time_limit = 300
+        attempt.save(update_fields=['time_limit'])
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.deadline_at, attempt.started_at + timedelta(seconds=300))
+        self.assertEqual(attempt.time_remaining(), 290)
+    
+    def test_expiring(self):
+        """Open attempts can be selected by how soon they expire."""
+        soon = self.create_attempt(60, 30)
+        self.create_attempt(600, 30)
+        self.create_attempt(60, 120)
+        self.create_attempt(60, 30, completed=True)
+        
+        expiring = QuizAttempt.expiring(timedelta(minutes=1), now=self.now)
+        
+        self.assertEqual(list(expiring), [soon])
@@ -6,6 +6,7 @@ This module contains tests for the views used in the quiz application:
 - CategoryListView
 - QuizStartView
 - QuestionView
+- SubmitAnswersView
 - ResultsView
 - UserStatsView
 """
@@ -14,13 +15,21 @@ from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.db import IntegrityError
 import json
+from datetime import timedelta
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from unittest.mock import patch, MagicMock
 from django.contrib.messages import get_messages
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from quiz_app.models import Category, Question, Choice, QuizAttempt, QuizResponse, UserProfile
 from quiz_app.forms import QuizSelectionForm
+from quiz_app.bundles import build_quiz_bundle
+from quiz_app.quiz_state import get_quiz_state
+from quiz_app.charts import load_attempt_frame
+from quiz_app.chart_worker import shutdown_executor
 import uuid
 import os
 from django.db.models.signals import post_save
@@ -348,6 +357,24 @@ class IndexViewTests(TestCase):
         self.assertTemplateUsed(response, 'quiz_app/index.html')
         self.assertQuerysetEqual(response.context['categories'], [self.category])
         self.assertContains(response, self.category.name)
+    
+    def test_index_view_is_served_from_cache(self):
+        """Once the category listing is cached the landing page runs no queries."""
+        self.client.get(self.url)
+        
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, f'<option value="{self.category.id}">')
+    
+    def test_index_view_sees_new_questions(self):
+        """Adding a question invalidates the cached category listing."""
+        self.client.get(self.url)
+        other = Category.objects.create(name="Other Category")
+        Question.objects.create(category=other, text="Another Question")
+        
+        response = self.client.get(self.url)
+        
+        self.assertQuerysetEqual(response.context['categories'], [other, self.category])
 
 
 class CategoryListViewTests(TestCase):
@@ -566,8 +593,117 @@ class QuestionViewTests(TestCase):
         self.assertTrue(quiz_response.is_correct)
         
         # The current question index should have been incremented
-        session = self.client.session
-        self.assertEqual(session['current_question_index'], 1)
+        self.assertEqual(get_quiz_state(self.client.session).index, 1)
+    
+    @override_settings(QUIZ_STATE_BACKEND='session')
+    def test_question_view_post_session_backend(self):
+        """With the session backend the index is kept in the session, as before."""
+        correct_choice = self.questions[0].choice_set.get(is_correct=True)
+        
+        self.client.post(self.url, {'choice': correct_choice.id})
+        
+        self.assertEqual(self.client.session['current_question_index'], 1)
+    
+    @override_settings(QUIZ_STATE_BACKEND='lru')
+    def test_question_view_lru_backend(self):
+        """With the in-process backend the index survives between requests."""
+        for question in self.questions[:2]:
+            correct_choice = question.choice_set.get(is_correct=True)
+            self.client.post(self.url, {'choice': correct_choice.id})
+        
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['question'], self.questions[2])
+        self.assertEqual(self.client.session['current_question_index'], 0)
+    
+    @override_settings(QUIZ_STATE_BACKEND='cache')
+    def test_question_view_post_after_lost_state(self):
+        """If the stored index is lost, an answer is graded against the question actually shown."""
+        for question in self.questions[:2]:
+            self.assertEqual(self.client.get(self.url).context['question'], question)
+            # Another process, with nothing cached, receives the answer
+            cache.clear()
+            correct_choice = question.choice_set.get(is_correct=True)
+            response = self.client.post(self.url, {'choice': correct_choice.id})
+            self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        
+        self.assertEqual(
+            list(QuizResponse.objects.order_by('id').values_list('question_id', 'is_correct')),
+            [(self.questions[0].id, True), (self.questions[1].id, True)]
+        )
+        self.quiz_attempt.refresh_from_db()
+        self.assertEqual(self.quiz_attempt.score, 2)
+    
+    @override_settings(QUIZ_STATE_BACKEND='cache')
+    def test_question_view_recovers_lost_state(self):
+        """If the stored index is lost, it is recovered from the answered count."""
+        correct_choice = self.questions[0].choice_set.get(is_correct=True)
+        self.client.post(self.url, {'choice': correct_choice.id})
+        cache.clear()
+        
+        response = self.client.get(self.url)
+        
+        self.assertEqual(response.context['question'], self.questions[1])
+        self.assertEqual(get_quiz_state(self.client.session).index, 1)
+    
+    @override_settings(QUIZ_STATE_BACKEND='cache')
+    def test_question_view_served_from_bundle(self):
+        """Question pages and answers read questions and choices from the quiz bundle."""
+        build_quiz_bundle(self.quiz_attempt.id, [q.id for q in self.questions])
+        
+        # Session and quiz attempt only
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['choices']), 2)
+        
+        correct_choice = self.questions[0].choice_set.get(is_correct=True)
+        # Session read, then the response insert plus score increment in a
+        # savepoint; the answer is graded from the cached answer key and the
+        # question index is kept in the quiz state store, so no question,
+        # choice or attempt row is read and the session is not written
+        with self.assertNumQueries(5):
+            self.client.post(self.url, {'choice': correct_choice.id})
+        self.assertEqual(QuizResponse.objects.count(), 1)
+        self.assertTrue(QuizResponse.objects.get().is_correct)
+    
+    def test_question_view_post_reloads_missing_answer_key(self):
+        """Without a cached answer key, answers are graded from a freshly loaded one."""
+        cache.clear()
+        wrong_choice = self.questions[0].choice_set.get(is_correct=False)
+        
+        response = self.client.post(self.url, {'choice': wrong_choice.id})
+        
+        self.assertRedirects(response, self.url)
+        quiz_response = QuizResponse.objects.get()
+        self.assertFalse(quiz_response.is_correct)
+        self.quiz_attempt.refresh_from_db()
+        self.assertEqual(self.quiz_attempt.answered_count, 1)
+        self.assertEqual(self.quiz_attempt.score, 0)
+    
+    def test_question_view_post_ignores_resubmitted_answer(self):
+        """Answering an already answered question does not fail or record it twice."""
+        correct_choice = self.questions[0].choice_set.get(is_correct=True)
+        QuizResponse.objects.create(
+            quiz_attempt=self.quiz_attempt,
+            question=self.questions[0],
+            selected_choice=correct_choice
+        )
+        
+        response = self.client.post(self.url, {'choice': correct_choice.id})
+        
+        self.assertRedirects(response, self.url)
+        self.assertEqual(QuizResponse.objects.count(), 1)
+        # The stale index is moved on to the first unanswered question
+        self.assertEqual(get_quiz_state(self.client.session).index, 1)
+    
+    def test_question_view_post_rejects_foreign_choice(self):
+        """A choice belonging to a different question is rejected."""
+        other_choice = self.questions[1].choice_set.first()
+        
+        response = self.client.post(self.url, {'choice': other_choice.id})
+        
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(QuizResponse.objects.count(), 0)
     
     def test_question_view_last_question(self):
         """Test answering the last question."""
@@ -602,6 +738,148 @@ class QuestionViewTests(TestCase):
         self.assertRedirects(response, reverse('quiz:index'))
 
 
+class SubmitAnswersViewTests(TestCase):
+    """Tests for the SubmitAnswersView batch endpoint."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.category = Category.objects.create(name="Test Category")
+        
+        self.questions = []
+        self.correct_choices = []
+        self.wrong_choices = []
+        for i in range(3):
+            question = Question.objects.create(
+                category=self.category,
+                text=f"Test Question {i+1}",
+                difficulty="medium"
+            )
+            self.questions.append(question)
+            self.correct_choices.append(
+                Choice.objects.create(question=question, text="Correct Answer", is_correct=True)
+            )
+            self.wrong_choices.append(
+                Choice.objects.create(question=question, text="Incorrect Answer", is_correct=False)
+            )
+        
+        self.quiz_attempt = QuizAttempt.objects.create(
+            category=self.category,
+            total_questions=3
+        )
+        session = self.client.session
+        session['quiz_questions'] = [q.id for q in self.questions]
+        session['current_question_index'] = 0
+        session['quiz_attempt_id'] = self.quiz_attempt.id
+        session.save()
+        
+        self.url = reverse('quiz:submit_answers', args=[self.quiz_attempt.id])
+    
+    def submit(self, answers):
+        """POST a list of (question, choice) pairs as JSON."""
+        return self.client.post(
+            self.url,
+            json.dumps({'answers': [{'question': q.id, 'choice': c.id} for q, c in answers]}),
+            content_type='application/json'
+        )
+    
+    def test_submit_all_answers(self):
+        """All answers are stored, scored and the attempt is completed."""
+        response = self.submit([
+            (self.questions[0], self.correct_choices[0]),
+            (self.questions[1], self.correct_choices[1]),
+            (self.questions[2], self.wrong_choices[2]),
+        ])
+        
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload['score'], 2)
+        self.assertEqual(payload['total_questions'], 3)
+        self.assertEqual(payload['results_url'], reverse('quiz:results', args=[self.quiz_attempt.id]))
+        self.assertEqual(payload['responses'][2]['correct_choice'], self.correct_choices[2].id)
+        self.assertFalse(payload['responses'][2]['is_correct'])
+        
+        self.quiz_attempt.refresh_from_db()
+        self.assertEqual(self.quiz_attempt.score, 2)
+        self.assertIsNotNone(self.quiz_attempt.completed_at)
+        self.assertEqual(QuizResponse.objects.filter(quiz_attempt=self.quiz_attempt).count(), 3)
+        self.assertNotIn('quiz_attempt_id', self.client.session)
+    
+    def test_rejects_choice_of_another_question(self):
+        """A choice that belongs to a different question rejects the whole batch."""
+        response = self.submit([
+            (self.questions[0], self.correct_choices[0]),
+            (self.questions[1], self.correct_choices[0]),
+        ])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(QuizResponse.objects.count(), 0)
+        self.quiz_attempt.refresh_from_db()
+        self.assertIsNone(self.quiz_attempt.completed_at)
+    
+    def test_rejects_question_outside_quiz(self):
+        """Questions that are not part of the attempt are rejected."""
+        other = Question.objects.create(category=self.category, text="Not in quiz")
+        other_choice = Choice.objects.create(question=other, text="Answer", is_correct=True)
+        
+        response = self.submit([(other, other_choice)])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(QuizResponse.objects.count(), 0)
+    
+    def test_rejects_attempt_not_in_session(self):
+        """Only the session that started the quiz can submit its answers."""
+        other_attempt = QuizAttempt.objects.create(category=self.category, total_questions=3)
+        
+        response = self.client.post(
+            reverse('quiz:submit_answers', args=[other_attempt.id]),
+            json.dumps({'answers': []}),
+            content_type='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 404)
+    
+    def test_rejects_malformed_payload(self):
+        """A body that is not a valid answers payload is rejected."""
+        response = self.client.post(self.url, 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_conflict_with_concurrent_answer(self):
+        """An answer recorded concurrently through the question page is a conflict, not an error."""
+        with patch.object(
+            QuizResponse.objects, 'bulk_create',
+            side_effect=IntegrityError('UNIQUE constraint failed')
+        ):
+            response = self.submit([(self.questions[0], self.correct_choices[0])])
+        
+        self.assertEqual(response.status_code, 409)
+        self.quiz_attempt.refresh_from_db()
+        self.assertIsNone(self.quiz_attempt.completed_at)
+        self.assertEqual(self.quiz_attempt.answered_count, 0)
+        self.assertIn('quiz_attempt_id', self.client.session)
+    
+    def test_deadline_passed_after_expiry_check(self):
+        """An attempt whose time runs out during the submission is closed as expired."""
+        started_at = timezone.now() - timedelta(seconds=120)
+        QuizAttempt.objects.filter(pk=self.quiz_attempt.pk).update(
+            time_limit=60, started_at=started_at,
+            deadline_at=started_at + timedelta(seconds=60)
+        )
+        
+        # The expiry check still sees time left, the answers arrive too late
+        with patch.object(QuizAttempt, 'time_remaining', return_value=1):
+            response = self.submit([(self.questions[0], self.correct_choices[0])])
+        
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertTrue(payload['expired'])
+        self.assertEqual(payload['score'], 0)
+        self.assertEqual(payload['responses'], [])
+        self.quiz_attempt.refresh_from_db()
+        self.assertIsNotNone(self.quiz_attempt.completed_at)
+        self.assertEqual(QuizResponse.objects.count(), 0)
+
+
 class ResultsViewTests(TestCase):
     """Tests for the ResultsView."""
     
@@ -675,6 +953,61 @@ class ResultsViewTests(TestCase):
         
         # Check that the performance chart is in the context
         self.assertIn('performance_chart', response.context)
+    
+    def create_answered_attempt(self, num_questions):
+        """Create a completed attempt with num_questions, every other one answered wrongly."""
+        quiz_attempt = QuizAttempt.objects.create(
+            category=self.category,
+            total_questions=num_questions,
+            completed_at=timezone.now()
+        )
+        for i in range(num_questions):
+            question = Question.objects.create(
+                category=self.category,
+                text=f"Question {num_questions}-{i}",
+                difficulty="medium"
+            )
+            correct = Choice.objects.create(question=question, text=f"Right {i}", is_correct=True)
+            wrong = Choice.objects.create(question=question, text=f"Wrong {i}", is_correct=False)
+            QuizResponse.objects.create(
+                quiz_attempt=quiz_attempt,
+                question=question,
+                selected_choice=correct if i % 2 else wrong
+            )
+        return quiz_attempt
+    
+    def test_results_view_query_count_is_constant(self):
+        """The results page runs the same number of queries whatever the quiz length."""
+        for num_questions in (5, 20):
+            quiz_attempt = self.create_answered_attempt(num_questions)
+            # The attempt (with its category) and the responses
+            with self.assertNumQueries(2):
+                response = self.client.get(reverse('quiz:results', args=[quiz_attempt.id]))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['responses']), num_questions)
+            self.assertContains(response, f"Right {num_questions - 2}")
+    
+    def test_results_chart_rendered_once_and_revalidated(self):
+        """The chart image is rendered once, cached, and supports ETag revalidation."""
+        cache.clear()
+        chart_url = reverse('quiz:results_chart', args=[self.quiz_attempt.id])
+        
+        with patch('quiz_app.analytics.render_results_chart', return_value=b'png-bytes') as render:
+            response = self.client.get(chart_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'image/png')
+            self.assertEqual(response.content, b'png-bytes')
+            etag = response['ETag']
+            
+            response = self.client.get(chart_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(render.call_count, 1)
+    
+    def test_results_chart_is_png(self):
+        """The chart service produces a PNG image."""
+        cache.clear()
+        response = self.client.get(reverse('quiz:results_chart', args=[self.quiz_attempt.id]))
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
 
 
 class UserStatsViewTests(TestCase):
@@ -737,4 +1070,77 @@ class UserStatsViewTests(TestCase):
         
         # Should redirect to the login page
         login_url = reverse('login')
-        self.assertRedirects(response, f'{login_url}?next={self.url}') 
\ No newline at end of file
+        self.assertRedirects(response, f'{login_url}?next={self.url}') 
+    
+    @override_settings(QUIZ_CHART_WORKERS=0)
+    def test_user_stats_charts_rendered_in_thread(self):
+        """Without a worker pool, each chart endpoint renders its PNG directly."""
+        cache.clear()
+        self.client.login(username="testuser", password="testpassword")
+        
+        for chart in ['time', 'category', 'question_dist']:
+            response = self.client.get(reverse('quiz:user_stats_chart', args=[chart]))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'image/png')
+            self.assertTrue(response.content.startswith(b'\x89PNG'))
+    
+    @override_settings(QUIZ_CHART_WORKERS=1)
+    def test_user_stats_charts_rendered_in_worker_pool(self):
+        """The stats page links placeholders and the chart endpoint renders in the pool."""
+        cache.clear()
+        self.addCleanup(shutdown_executor)
+        self.client.login(username="testuser", password="testpassword")
+        
+        response = self.client.get(self.url)
+        self.assertContains(response, 'chart-placeholder')
+        
+        response = self.client.get(response.context['time_chart'])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+        
+        # The finished image is cached and revalidated by ETag
+        response = self.client.get(
+            reverse('quiz:user_stats_chart', args=['time']),
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+    
+    def test_user_stats_chart_timeout(self):
+        """A chart that is not ready in time answers 504."""
+        self.client.login(username="testuser", password="testpassword")
+        
+        with patch('quiz_app.views.get_chart', side_effect=FuturesTimeoutError):
+            response = self.client.get(reverse('quiz:user_stats_chart', args=['time']))
+        
+        self.assertEqual(response.status_code, 504)
+    
+    @override_settings(QUIZ_CHART_WORKERS=0)
+    def test_user_stats_chart_render_failure(self):
+        """A failing chart renderer answers a plain 500 instead of raising."""
+        cache.clear()
+        self.client.login(username="testuser", password="testpassword")
+        
+        with patch('quiz_app.chart_worker.render_stats_chart', side_effect=ValueError("bad data")):
+            response = self.client.get(reverse('quiz:user_stats_chart', args=['time']))
+        
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.content, b"Chart rendering failed")
+    
+    @override_settings(QUIZ_CHART_WORKERS=0)
+    def test_user_stats_charts_load_attempts_once(self):
+        """The chart requests of one stats page share the loaded attempt data."""
+        cache.clear()
+        self.client.login(username="testuser", password="testpassword")
+        
+        with patch('quiz_app.views.load_attempt_frame', wraps=load_attempt_frame) as load:
+            for chart in ['time', 'category', 'question_dist']:
+                response = self.client.get(reverse('quiz:user_stats_chart', args=[chart]))
+                self.assertEqual(response.status_code, 200)
+        
+        self.assertEqual(load.call_count, 1)
+    
+    def test_user_stats_unknown_chart(self):
+        """Unknown chart names are not found."""
+        self.client.login(username="testuser", password="testpassword")
+        response = self.client.get(reverse('quiz:user_stats_chart', args=['unknown']))
+        self.assertEqual(response.status_code, 404)
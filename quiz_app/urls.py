@@ -23,12 +23,27 @@ urlpatterns = [
     # Answer quiz questions
     path('question/', views.QuestionView.as_view(), name='question'),
     
+    # Submit all answers of a quiz attempt in one JSON request
+    path('attempts/<int:quiz_id>/answers/', views.SubmitAnswersView.as_view(), name='submit_answers'),
+    
     # View quiz results
     path('results/<int:quiz_id>/', views.ResultsView.as_view(), name='results'),
     
+    # Performance chart image for quiz results
+    path('results/<int:quiz_id>/chart.png', views.ResultsChartView.as_view(), name='results_chart'),
+    
     # User statistics dashboard
     path('stats/', views.UserStatsView.as_view(), name='user_stats'),
     
+    # User statistics chart images
+    path('stats/charts/<str:chart>.png', views.UserStatsChartView.as_view(), name='user_stats_chart'),
+    
+    # All-time and weekly leaderboards, overall or per category
+    path('leaderboard/', views.LeaderboardView.as_view(), name='leaderboard'),
+    
+    # Leaderboards as JSON
+    path('api/leaderboard/', views.LeaderboardAPIView.as_view(), name='leaderboard_api'),
+    
     # User profile page
     path('profile/', views.UserProfileView.as_view(), name='profile'),
 ] 
\ No newline at end of file
@@ -5,24 +5,39 @@ This module defines the view functions and classes that handle HTTP requests
 and return appropriate responses for the quiz application.
 """
 
-import random
+import json
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views import View
 from django.views.generic import ListView, DetailView, TemplateView, UpdateView, CreateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils import timezone
-from django.db.models import Count, Avg, Max, Min
-from django.http import JsonResponse
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Max, Min
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.urls import reverse_lazy, reverse
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from io import BytesIO
-import base64
 from django.contrib import messages
 
-from .models import Category, Question, Choice, QuizAttempt, QuizResponse, UserProfile
+from .models import (
+    Category, QuizAttempt, QuizResponse, UserProfile, UserStats, LeaderboardEntry, AttemptClosed
+)
 from .forms import QuizSelectionForm, UserRegistrationForm
+from .sampling import sample_question_ids
+from .catalogue import get_catalogue
+from .bundles import build_quiz_bundle, get_quiz_bundle, get_answer_key, discard_quiz_bundle
+from .quiz_state import (
+    clear_quiz_state, get_quiz_state, save_quiz_state, start_quiz_state, sync_quiz_state
+)
+from .charts import CHART_TIMEOUT, STATS_CHART_NAMES, get_results_chart, load_attempt_frame
+from .chart_worker import ChartRenderError, get_chart, get_stats_frame
+
+
+def end_quiz_session(request, quiz_attempt, state=None):
+    """Clear the finished quiz from the session and drop its cached bundle."""
+    discard_quiz_bundle(quiz_attempt.id)
+    clear_quiz_state(request.session, state)
 
 
 class IndexView(TemplateView):
@@ -36,13 +51,9 @@ class IndexView(TemplateView):
     def get_context_data(self, **kwargs):
         """Add categories to the context."""
         context = super().get_context_data(**kwargs)
-        # Get all categories with their question counts
-        categories = Category.objects.annotate(
-            num_questions=Count('question')
-        ).filter(num_questions__gt=0)
-        
+        # Get all categories with their question counts (cached)
         context.update({
-            'categories': categories,
+            'categories': get_catalogue().categories,
             'form': QuizSelectionForm(),
         })
         return context
@@ -57,10 +68,8 @@ class CategoryListView(ListView):
     context_object_name = 'categories'
     
     def get_queryset(self):
-        """Return only categories that have questions."""
-        return Category.objects.annotate(
-            num_questions=Count('question')
-        ).filter(num_questions__gt=0)
+        """Return only categories that have questions (cached)."""
+        return get_catalogue().categories
 
 
 class QuizStartView(View):
@@ -87,26 +96,21 @@ class QuizStartView(View):
             quiz_attempt.save()
             
             # Select random questions from the category
-            questions = list(Question.objects.filter(category=category))
-            if len(questions) > num_questions:
-                questions = random.sample(questions, num_questions)
+            question_ids = sample_question_ids(category.id, num_questions)
             
-            # Store the question IDs in the session
-            request.session['quiz_questions'] = [q.id for q in questions]
-            request.session['current_question_index'] = 0
-            request.session['quiz_attempt_id'] = quiz_attempt.id
+            # Store the quiz state (the question IDs go in the session)
+            start_quiz_state(request.session, quiz_attempt.id, question_ids)
+            
+            # Load all questions and choices of the quiz up front
+            build_quiz_bundle(quiz_attempt.id, question_ids)
             
             # Redirect to the first question
             return redirect('quiz:question')
         else:
             # If form is invalid, add error messages and render index page with the form errors
-            categories = Category.objects.annotate(
-                num_questions=Count('question')
-            ).filter(num_questions__gt=0)
-            
             return render(request, 'quiz_app/index.html', {
                 'form': form, 
-                'categories': categories,
+                'categories': form.catalogue.categories,
                 'form_errors': True
             })
 
@@ -117,53 +121,61 @@ class QuestionView(View):
     """
     template_name = 'quiz_app/question.html'
     
+    def get_quiz_attempt(self, state):
+        """Return the quiz attempt of the active quiz, with its category."""
+        return get_object_or_404(
+            QuizAttempt.objects.select_related('category'),
+            id=state.attempt_id
+        )
+    
+    def complete_quiz(self, request, quiz_attempt, state):
+        """Mark the quiz attempt complete and clear the quiz from the session."""
+        quiz_attempt.complete()
+        end_quiz_session(request, quiz_attempt, state)
+    
     def get(self, request):
         """Handle GET request to display a question."""
         # Check if there's an active quiz
-        if 'quiz_questions' not in request.session:
+        state = get_quiz_state(request.session)
+        if state is None:
             return redirect('quiz:index')
         
         # Get the current question index and quiz attempt
-        current_index = request.session.get('current_question_index', 0)
-        quiz_attempt_id = request.session.get('quiz_attempt_id')
-        quiz_attempt = get_object_or_404(QuizAttempt, id=quiz_attempt_id)
+        quiz_attempt = self.get_quiz_attempt(state)
+        sync_quiz_state(request.session, state, quiz_attempt.answered_count)
+        current_index = state.index
         
+        # The attempt may have been closed elsewhere (e.g. by expire_quiz_attempts)
+        if quiz_attempt.is_complete():
+            end_quiz_session(request, quiz_attempt, state)
+            if quiz_attempt.time_limit > 0:
+                messages.warning(request, "Time's up! Your quiz has been submitted.")
+            return redirect('quiz:results', quiz_id=quiz_attempt.id)
+
         # Check if time limit has expired
         time_remaining = quiz_attempt.time_remaining()
         if quiz_attempt.time_limit > 0 and time_remaining <= 0 and not quiz_attempt.is_complete():
             # Time's up - complete the quiz
-            quiz_attempt.completed_at = timezone.now()
-            quiz_attempt.calculate_score()
-            quiz_attempt.save()
-            
-            # Clear session data
-            for key in ['quiz_questions', 'current_question_index', 'quiz_attempt_id']:
-                if key in request.session:
-                    del request.session[key]
+            self.complete_quiz(request, quiz_attempt, state)
             
             # Add a message
             messages.warning(request, "Time's up! Your quiz has been submitted.")
             return redirect('quiz:results', quiz_id=quiz_attempt.id)
         
         # Check if we've reached the end of the quiz
-        question_ids = request.session.get('quiz_questions', [])
+        question_ids = state.question_ids
         if current_index >= len(question_ids):
             # Complete the quiz and redirect to results
-            quiz_attempt.completed_at = timezone.now()
-            quiz_attempt.calculate_score()
-            quiz_attempt.save()
-            
-            # Clear session data
-            for key in ['quiz_questions', 'current_question_index', 'quiz_attempt_id']:
-                if key in request.session:
-                    del request.session[key]
-            
+            self.complete_quiz(request, quiz_attempt, state)
             return redirect('quiz:results', quiz_id=quiz_attempt.id)
         
-        # Get the current question
+        # Get the current question from the prefetched quiz bundle
+        bundle = get_quiz_bundle(quiz_attempt.id, question_ids)
         question_id = question_ids[current_index]
-        question = get_object_or_404(Question, id=question_id)
-        choices = question.choice_set.all()
+        question = bundle.get_question(question_id)
+        if question is None:
+            raise Http404("Question not found")
+        choices = bundle.get_choices(question_id)
         
         # Prepare context for the template
         context = {
@@ -182,43 +194,169 @@ class QuestionView(View):
     def post(self, request):
         """Handle POST request with answer submission."""
         # Check if there's an active quiz
-        if 'quiz_questions' not in request.session:
+        state = get_quiz_state(request.session)
+        if state is None:
             return redirect('quiz:index')
         
-        # Get the current question index and quiz attempt
-        current_index = request.session.get('current_question_index', 0)
-        quiz_attempt_id = request.session.get('quiz_attempt_id')
-        quiz_attempt = get_object_or_404(QuizAttempt, id=quiz_attempt_id)
+        # The index was missing from the state store (e.g. another process
+        # served the previous answer): take it from the attempt's answered
+        # count, so the answer is graded against the right question
+        if not state.synced:
+            answered_count = QuizAttempt.objects.filter(
+                id=state.attempt_id
+            ).values_list('answered_count', flat=True).first()
+            if answered_count is None:
+                clear_quiz_state(request.session, state)
+                return redirect('quiz:index')
+            sync_quiz_state(request.session, state, answered_count)
         
         # Get the current question
-        question_ids = request.session.get('quiz_questions', [])
-        question_id = question_ids[current_index]
-        question = get_object_or_404(Question, id=question_id)
+        question_id = state.current_question_id()
+        if question_id is None:
+            return redirect('quiz:question')
         
         # Process the submitted answer
         choice_id = request.POST.get('choice')
         if choice_id:
-            choice = get_object_or_404(Choice, id=choice_id)
+            # Grade the answer against the cached answer key of this quiz
+            answer_key = get_answer_key(state.attempt_id, state.question_ids)
+            is_correct = answer_key.grade(question_id, choice_id)
+            if is_correct is None:
+                raise Http404("Choice not found")
             
             # Record the response
             response = QuizResponse(
-                quiz_attempt=quiz_attempt,
-                question=question,
-                selected_choice=choice,
+                quiz_attempt_id=state.attempt_id,
+                question_id=question_id,
+                selected_choice_id=int(choice_id),
+                is_correct=is_correct,
             )
-            response.save()
+            try:
+                response.save(graded=True)
+            except AttemptClosed:
+                # Completed elsewhere (e.g. by expire_quiz_attempts) or out of
+                # time: the question page closes the quiz and shows the results
+                return redirect('quiz:question')
+            except IntegrityError:
+                # Already answered (e.g. a resubmitted form, or a stale
+                # question index) or the attempt is gone
+                answered_count = QuizAttempt.objects.filter(
+                    id=state.attempt_id
+                ).values_list('answered_count', flat=True).first()
+                if answered_count is not None:
+                    sync_quiz_state(request.session, state, answered_count)
+                return redirect('quiz:question')
             
             # Move to the next question
-            request.session['current_question_index'] = current_index + 1
+            state.index += 1
+            save_quiz_state(request.session, state)
         
         return redirect('quiz:question')
 
 
+class SubmitAnswersView(View):
+    """
+    JSON endpoint that submits all answers of a quiz attempt at once.
+    
+    Expects a body of the form ``{"answers": [{"question": <id>, "choice": <id>}, ...]}``
+    for the quiz attempt in progress in the current session. The answers are
+    validated against the attempt's question list, stored with one bulk
+    insert, and the attempt is scored and completed in the same transaction.
+    Questions left unanswered count as incorrect.
+    
+    Responds with the results payload, or ``{"error": ...}`` and a 4xx status
+    if the submission is rejected.
+    """
+    
+    def post(self, request, quiz_id):
+        """Handle the batch answer submission."""
+        state = get_quiz_state(request.session)
+        if state is None or state.attempt_id != quiz_id:
+            return JsonResponse({'error': 'No active quiz with this id in the session.'}, status=404)
+        
+        quiz_attempt = get_object_or_404(QuizAttempt, id=quiz_id)
+        if quiz_attempt.is_complete():
+            return JsonResponse({'error': 'This quiz has already been completed.'}, status=409)
+        
+        try:
+            answers = json.loads(request.body).get('answers', [])
+            answers = [(int(a['question']), int(a['choice'])) for a in answers]
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return JsonResponse({'error': 'Malformed answers payload.'}, status=400)
+        
+        answer_key = get_answer_key(quiz_attempt.id, state.question_ids)
+        
+        # An expired timed quiz is closed with the answers recorded so far
+        expired = quiz_attempt.time_limit > 0 and quiz_attempt.time_remaining() <= 0
+        
+        responses = []
+        if not expired:
+            answered = set(quiz_attempt.quizresponse_set.values_list('question_id', flat=True))
+            for question_id, choice_id in answers:
+                if question_id not in answer_key.choice_ids:
+                    return JsonResponse({'error': f'Question {question_id} is not part of this quiz.'}, status=400)
+                if question_id in answered:
+                    return JsonResponse({'error': f'Question {question_id} was answered twice.'}, status=400)
+                is_correct = answer_key.grade(question_id, choice_id)
+                if is_correct is None:
+                    return JsonResponse({'error': f'Choice {choice_id} does not belong to question {question_id}.'}, status=400)
+                answered.add(question_id)
+                responses.append(QuizResponse(
+                    quiz_attempt=quiz_attempt,
+                    question_id=question_id,
+                    selected_choice_id=choice_id,
+                    is_correct=is_correct,
+                ))
+        
+        try:
+            with transaction.atomic():
+                QuizResponse.objects.bulk_create(responses)
+                recorded = quiz_attempt.record_responses(
+                    len(responses),
+                    sum(1 for response in responses if response.is_correct)
+                )
+                if responses and not recorded:
+                    raise AttemptClosed(f"Quiz attempt {quiz_attempt.id} is closed")
+                quiz_attempt.complete()
+        except IntegrityError:
+            # A question was answered through QuestionView since the check above
+            return JsonResponse({'error': 'Some of these questions have already been answered.'}, status=409)
+        except AttemptClosed:
+            quiz_attempt.refresh_from_db()
+            if quiz_attempt.is_complete():
+                # Closed by expire_quiz_attempts since it was loaded
+                end_quiz_session(request, quiz_attempt, state)
+                return JsonResponse({'error': 'This quiz has already been completed.'}, status=409)
+            # The time limit ran out since the expiry check
+            expired, responses = True, []
+            quiz_attempt.complete()
+        end_quiz_session(request, quiz_attempt, state)
+        
+        return JsonResponse({
+            'quiz_id': quiz_attempt.id,
+            'expired': expired,
+            'score': quiz_attempt.score,
+            'total_questions': quiz_attempt.total_questions,
+            'score_percentage': quiz_attempt.score_percentage(),
+            'completed_at': quiz_attempt.completed_at.isoformat(),
+            'results_url': reverse('quiz:results', args=[quiz_attempt.id]),
+            'responses': [
+                {
+                    'question': response.question_id,
+                    'selected_choice': response.selected_choice_id,
+                    'is_correct': response.is_correct,
+                    'correct_choice': answer_key.correct.get(response.question_id),
+                }
+                for response in responses
+            ],
+        })
+
+
 class ResultsView(DetailView):
     """
     View to display the results of a completed quiz.
     """
-    model = QuizAttempt
+    queryset = QuizAttempt.objects.select_related('category')
     template_name = 'quiz_app/results.html'
     context_object_name = 'quiz_attempt'
     pk_url_kwarg = 'quiz_id'
@@ -228,45 +366,44 @@ class ResultsView(DetailView):
         context = super().get_context_data(**kwargs)
         quiz_attempt = self.object
         
-        # Get all responses for this attempt
-        responses = QuizResponse.objects.filter(quiz_attempt=quiz_attempt)
-        
-        # Create a DataFrame for analysis
-        if responses.exists():
-            data = {
-                'question': [r.question.text for r in responses],
-                'is_correct': [r.is_correct for r in responses],
-                'difficulty': [r.question.difficulty for r in responses]
-            }
-            df = pd.DataFrame(data)
-            
-            # Generate performance by difficulty chart
-            difficulty_performance = df.groupby('difficulty')['is_correct'].mean() * 100
-            
-            # Create a bar chart
-            plt.figure(figsize=(8, 4))
-            sns.barplot(x=difficulty_performance.index, y=difficulty_performance.values)
-            plt.title('Performance by Question Difficulty')
-            plt.xlabel('Difficulty Level')
-            plt.ylabel('Correct Answers (%)')
-            plt.ylim(0, 100)
-            
-            # Save the plot to a base64 encoded string
-            buffer = BytesIO()
-            plt.savefig(buffer, format='png', bbox_inches='tight')
-            buffer.seek(0)
-            image_png = buffer.getvalue()
-            buffer.close()
-            
-            chart = base64.b64encode(image_png).decode('utf-8')
-            
-            # Add to context
-            context['performance_chart'] = chart
+        # All responses with their questions and answers, in a single query
+        responses = list(quiz_attempt.results())
+        
+        if responses:
+            # The chart itself is served (and cached) by ResultsChartView
+            context['performance_chart'] = reverse('quiz:results_chart', args=[quiz_attempt.id])
             context['responses'] = responses
         
         return context
 
 
+class ResultsChartView(View):
+    """
+    View serving the performance chart of a quiz attempt as a PNG image.
+    
+    The image is rendered once per attempt state by the chart service and
+    served with an ETag, so browsers revalidate instead of downloading it
+    again. Charts of completed attempts never change and may be cached.
+    """
+    
+    def get(self, request, quiz_id):
+        """Return the chart image, or 304 if the client already has it."""
+        quiz_attempt = get_object_or_404(QuizAttempt, id=quiz_id)
+        chart = get_results_chart(quiz_attempt)
+        if chart is None:
+            raise Http404("This quiz attempt has no responses")
+        
+        etag = quote_etag(chart.etag)
+        not_modified = get_conditional_response(request, etag=etag)
+        response = not_modified or HttpResponse(chart.png, content_type='image/png')
+        response['ETag'] = etag
+        if quiz_attempt.is_complete():
+            patch_cache_control(response, public=True, max_age=CHART_TIMEOUT)
+        else:
+            patch_cache_control(response, no_cache=True)
+        return response
+
+
 class UserStatsView(LoginRequiredMixin, TemplateView):
     """
     View to display statistics and analytics for a user's quiz history.
@@ -281,9 +418,9 @@ class UserStatsView(LoginRequiredMixin, TemplateView):
     - Summary Statistics: Key metrics on quiz performance
     
     Implementation Notes:
-    - Uses pandas for data organization and analysis
-    - Uses matplotlib and seaborn for visualization creation
-    - All charts are encoded as base64 for embedding in HTML
+    - Summary statistics are read from the user's materialized UserStats rows
+    - Charts are rendered off-request by the chart worker pool and served
+      by UserStatsChartView; the page only contains placeholders for them
     """
     template_name = 'quiz_app/user_stats.html'
     
@@ -292,171 +429,187 @@ class UserStatsView(LoginRequiredMixin, TemplateView):
         Add user statistics to the context.
         
         This method:
-        1. Retrieves the user's completed quiz attempts
-        2. Processes the data using pandas DataFrame
-        3. Generates three distinct visualization charts
-        4. Calculates summary statistics
-        5. Adds all data to the template context
+        1. Reads the user's overall and per-category UserStats rows
+        2. Links the three charts, which the browser loads separately
+        3. Adds the summary statistics to the template context
         """
         context = super().get_context_data(**kwargs)
-        user = self.request.user
-        
-        # Get all completed quiz attempts by this user
-        quiz_attempts = QuizAttempt.objects.filter(
-            user=user,
-            completed_at__isnull=False
-        ).select_related('category')
+        stats_rows = list(UserStats.objects.filter(
+            user=self.request.user
+        ).select_related('category'))
+        overall = next((row for row in stats_rows if row.category_id is None), None)
+        category_rows = [row for row in stats_rows if row.category_id is not None]
         
-        if quiz_attempts.exists():
-            # Create a DataFrame for analysis
-            # This converts database records into a format suitable for data science processing
-            data = {
-                'date': [attempt.completed_at for attempt in quiz_attempts],
-                'category': [attempt.category.name for attempt in quiz_attempts],
-                'score_percentage': [attempt.score_percentage() for attempt in quiz_attempts],
-                'total_questions': [attempt.total_questions for attempt in quiz_attempts]
-            }
-            df = pd.DataFrame(data)
-            
-            # Set the style for all charts - makes the charts visually consistent and attractive
-            sns.set_style("whitegrid")
-            plt.rcParams.update({
-                'font.size': 12,
-                'axes.labelsize': 14,
-                'axes.titlesize': 16,
-                'xtick.labelsize': 12,
-                'ytick.labelsize': 12,
-                'legend.fontsize': 12,
-                'figure.titlesize': 18
-            })
-            
-            # 1. Performance over time chart
-            # This chart shows how scores change over time, helping users track their learning progress
-            plt.figure(figsize=(12, 6))
-            
-            # Sort by date to ensure correct chronological order in the chart
-            df = df.sort_values('date')
-            
-            # Create line plot - each line represents a different category
-            ax = sns.lineplot(data=df, x='date', y='score_percentage', hue='category', marker='o', linewidth=2.5)
+        if overall and overall.attempts:
+            context['time_chart'] = reverse('quiz:user_stats_chart', args=['time'])
+            context['category_chart'] = reverse('quiz:user_stats_chart', args=['category'])
+            context['question_dist_chart'] = reverse('quiz:user_stats_chart', args=['question_dist'])
             
-            # Improve plot styling
-            plt.title('Quiz Performance Over Time', fontweight='bold', pad=20)
-            plt.xlabel('Date', fontweight='bold')
-            plt.ylabel('Score (%)', fontweight='bold')
-            plt.ylim(0, 100)
-            
-            # Format x-axis dates nicely
-            from matplotlib.dates import DateFormatter
-            date_form = DateFormatter("%Y-%m-%d")
-            ax.xaxis.set_major_formatter(date_form)
-            
-            # Rotate and align the tick labels for better readability
-            plt.xticks(rotation=45, ha='right')
-            
-            # Add grid lines for better readability
-            plt.grid(True, alpha=0.3)
-            
-            # Add legend with a title - explains what each line color represents
-            plt.legend(title='Category', title_fontsize=12, loc='upper left', bbox_to_anchor=(1, 1))
-            
-            # Tight layout to prevent cutting off labels
-            plt.tight_layout()
-            
-            # Save to buffer and encode as base64 for embedding in HTML
-            # This allows the chart to be displayed without saving it as a separate file
-            buffer = BytesIO()
-            plt.savefig(buffer, format='png', bbox_inches='tight', dpi=100)
-            buffer.seek(0)
-            time_chart = base64.b64encode(buffer.getvalue()).decode('utf-8')
-            buffer.close()
-            plt.close()
-            
-            # 2. Performance by category chart
-            # This bar chart helps users identify their strengths and weaknesses across topics
-            plt.figure(figsize=(10, 6))
-            
-            # Calculate average scores by category and sort from highest to lowest
-            if not df.empty:
-                category_perf = df.groupby('category')['score_percentage'].mean().sort_values(ascending=False)
-                
-                # Create bar chart with better styling
-                ax = sns.barplot(x=category_perf.index, y=category_perf.values, palette='viridis')
-                
-                # Add value labels on top of each bar for precise score information
-                for i, v in enumerate(category_perf.values):
-                    ax.text(i, v + 2, f"{v:.1f}%", ha='center', fontweight='bold')
-                
-                # Improve styling
-                plt.title('Average Performance by Category', fontweight='bold', pad=20)
-                plt.xlabel('Category', fontweight='bold')
-                plt.ylabel('Average Score (%)', fontweight='bold')
-                plt.ylim(0, 105)  # Extended to fit value labels
-                
-                # Ensure x labels are visible
-                plt.xticks(rotation=45, ha='right')
-                
-                # Add a horizontal line for the overall average as a reference point
-                overall_avg = df['score_percentage'].mean()
-                plt.axhline(y=overall_avg, color='red', linestyle='--', label=f'Overall Avg: {overall_avg:.1f}%')
-                plt.legend()
-                
-                # Add grid lines for better readability
-                plt.grid(True, axis='y', alpha=0.3)
-                
-                # Ensure everything fits
-                plt.tight_layout()
-                
-                # Save to buffer and encode as base64 for HTML embedding
-                buffer = BytesIO()
-                plt.savefig(buffer, format='png', bbox_inches='tight', dpi=100)
-                buffer.seek(0)
-                category_chart = base64.b64encode(buffer.getvalue()).decode('utf-8')
-                buffer.close()
-                plt.close()
-                
-                context['category_chart'] = category_chart
-            
-            # 3. Question distribution chart (pie chart)
-            # This chart shows what quiz lengths the user tends to select
-            plt.figure(figsize=(8, 6))
-            
-            # Count quizzes by total questions
-            question_counts = df['total_questions'].value_counts().sort_index()
-            
-            # Create pie chart with percentage labels
-            plt.pie(question_counts, labels=[f"{count} questions" for count in question_counts.index], 
-                    autopct='%1.1f%%', startangle=90, shadow=True, 
-                    wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
-                    textprops={'fontsize': 12, 'fontweight': 'bold'})
-            
-            plt.title('Quiz Length Distribution', fontweight='bold', pad=20)
-            plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-            
-            # Save to buffer and encode for HTML embedding
-            buffer = BytesIO()
-            plt.savefig(buffer, format='png', bbox_inches='tight', dpi=100)
-            buffer.seek(0)
-            question_dist_chart = base64.b64encode(buffer.getvalue()).decode('utf-8')
-            buffer.close()
-            plt.close()
-            
-            # Add charts to context for use in the template
-            context['time_chart'] = time_chart
-            context['question_dist_chart'] = question_dist_chart
+            # The category with the highest average score
+            best = max(category_rows, key=lambda row: row.average_percentage(), default=None)
             
             # Add summary statistics - these provide an overall picture of performance
-            context['total_quizzes'] = len(quiz_attempts)
-            context['avg_score'] = df['score_percentage'].mean()
-            context['categories_attempted'] = df['category'].nunique()
-            context['best_category'] = category_perf.index[0] if not category_perf.empty else None
-            context['highest_score'] = df['score_percentage'].max()
-            context['lowest_score'] = df['score_percentage'].min()
-            context['perfect_score_count'] = len(df[df['score_percentage'] == 100])
+            context['total_quizzes'] = overall.attempts
+            context['avg_score'] = overall.average_percentage()
+            context['categories_attempted'] = len(category_rows)
+            context['best_category'] = best.category.name if best else None
+            context['highest_score'] = overall.best_percentage
+            context['lowest_score'] = overall.worst_percentage
+            context['perfect_score_count'] = overall.perfect_count
             
         return context
 
 
+class UserStatsChartView(LoginRequiredMixin, View):
+    """
+    View serving one of the user statistics charts as a PNG image.
+    
+    Waits for the chart worker pool to finish the chart (up to
+    QUIZ_CHART_TIMEOUT seconds) and answers 504 if it does not, or 500 if
+    the renderer fails. The user's attempt data is shared by the chart
+    requests of a stats page through get_stats_frame(), keyed by the
+    user's overall UserStats row.
+    """
+    
+    def get(self, request, chart):
+        """Return the chart image, or 304 if the client already has it."""
+        if chart not in STATS_CHART_NAMES:
+            raise Http404("Unknown chart")
+        stats = UserStats.objects.filter(
+            user=request.user, category__isnull=True
+        ).values_list('attempts', 'percentage_sum', 'last_attempt_at').first()
+        if not stats or not stats[0]:
+            raise Http404("No completed quizzes to chart")
+        
+        data = get_stats_frame(
+            request.user.pk,
+            stats,
+            lambda: load_attempt_frame(QuizAttempt.objects.filter(
+                user=request.user,
+                completed_at__isnull=False
+            ))
+        )
+        if data.empty:
+            raise Http404("No completed quizzes to chart")
+        
+        try:
+            rendered = get_chart(chart, data)
+        except FuturesTimeoutError:
+            return HttpResponse("Chart rendering timed out", status=504)
+        except ChartRenderError:
+            return HttpResponse("Chart rendering failed", status=500)
+        
+        etag = quote_etag(rendered.etag)
+        response = get_conditional_response(request, etag=etag) or HttpResponse(
+            rendered.png, content_type='image/png'
+        )
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class LeaderboardMixin:
+    """
+    Reads the leaderboard selected by the request's query parameters.
+    
+    Query parameters:
+    - period: 'all' (default) or 'week' for the current ISO week
+    - category: a category ID (default: all categories)
+    - limit: number of top entries (API only, at most max_limit)
+    """
+    periods = ['all', 'week']
+    default_limit = 10
+    max_limit = 100
+    
+    def get_limit(self):
+        """Return the number of top entries to show."""
+        return self.default_limit
+    
+    def get_leaderboard(self):
+        """
+        Return the selected leaderboard's top entries and the user's standing.
+        
+        Both are read from the materialized LeaderboardEntry and
+        LeaderboardBucket rows, so the number of users does not matter.
+        """
+        period_name = self.request.GET.get('period', 'all')
+        if period_name not in self.periods:
+            raise Http404("Unknown leaderboard period")
+        period = (
+            LeaderboardEntry.week_period(timezone.now()) if period_name == 'week'
+            else LeaderboardEntry.ALL_TIME
+        )
+        
+        categories = get_catalogue().categories
+        category = None
+        category_param = self.request.GET.get('category')
+        if category_param:
+            category = next((c for c in categories if str(c.pk) == category_param), None)
+            if category is None:
+                raise Http404("Unknown category")
+        category_id = category.pk if category else None
+        
+        user = self.request.user
+        standing = None
+        if user.is_authenticated:
+            standing = LeaderboardEntry.standing(user.pk, period, category_id)
+        return {
+            'period_name': period_name,
+            'period': period,
+            'category': category,
+            'categories': categories,
+            'entries': LeaderboardEntry.top(period, category_id, limit=self.get_limit()),
+            'standing': standing,
+        }
+
+
+class LeaderboardView(LeaderboardMixin, TemplateView):
+    """
+    View to display the all-time and weekly leaderboards, overall or per category.
+    
+    Shows the top players and, for a logged-in user, their own rank.
+    """
+    template_name = 'quiz_app/leaderboard.html'
+    
+    def get_context_data(self, **kwargs):
+        """Add the selected leaderboard to the context."""
+        context = super().get_context_data(**kwargs)
+        context.update(self.get_leaderboard())
+        return context
+
+
+class LeaderboardAPIView(LeaderboardMixin, View):
+    """
+    JSON API for the leaderboards.
+    
+    Takes the same query parameters as LeaderboardView, plus limit, and
+    returns the top entries and the logged-in user's standing ('me', null
+    for anonymous or unranked users).
+    """
+    
+    def get_limit(self):
+        """Return the limit query parameter, clamped to 1..max_limit."""
+        try:
+            limit = int(self.request.GET.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        return max(1, min(limit, self.max_limit))
+    
+    def get(self, request):
+        """Return the selected leaderboard as JSON."""
+        board = self.get_leaderboard()
+        standing = board['standing']
+        return JsonResponse({
+            'period': board['period'],
+            'category': board['category'].pk if board['category'] else None,
+            'entries': [
+                {'rank': entry.rank, 'username': entry.user.username, 'points': entry.points}
+                for entry in board['entries']
+            ],
+            'me': standing._asdict() if standing else None,
+        })
+
+
 class UserProfileView(LoginRequiredMixin, UpdateView):
     """
     View to display and update user profile information.
@@ -486,7 +639,7 @@ class UserProfileView(LoginRequiredMixin, UpdateView):
         
         context.update({
             'completed_quizzes': completed_quizzes,
-            'quiz_count': completed_quizzes.count(),
+            'quiz_count': self.object.total_quizzes_taken(),
             'recent_quizzes': completed_quizzes[:5],  # Last 5 quizzes
         })
         
@@ -8,6 +8,8 @@ Each setting is documented with explanations of its purpose and potential values
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 # This sets the base directory of the project, making file path handling more robust.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -82,12 +84,82 @@ WSGI_APPLICATION = 'quiz_project.wsgi.application'
 
 # Database configuration
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
-DATABASES = {
+# The database profile is selected with QUIZ_DB_PROFILE:
+#   'sqlite'   - a local SQLite file tuned for concurrent writers (default)
+#   'postgres' - PostgreSQL with persistent, health-checked connections
+#                (requires the psycopg or psycopg2 package)
+QUIZ_DB_PROFILE = os.environ.get('QUIZ_DB_PROFILE', 'sqlite')
+
+# Seconds a database connection is kept open between requests (0 closes it after each request)
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 600))
+
+if QUIZ_DB_PROFILE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',                       # Database engine
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),  # Database file path
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'OPTIONS': {
+                'timeout': 20,                                           # Seconds to wait for the write lock
+            },
+        }
+    }
+elif QUIZ_DB_PROFILE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'quiz'),
+            'USER': os.environ.get('POSTGRES_USER', 'quiz'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,                                  # Re-check reused connections
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unknown QUIZ_DB_PROFILE {QUIZ_DB_PROFILE!r}")
+
+# Cache configuration
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The backend is selected with QUIZ_CACHE_BACKEND:
+#   'locmem' - per-process memory (default; fine for a single process)
+#   'file'   - files in QUIZ_CACHE_LOCATION, shared by processes on one host
+#   'redis'  - a Redis-protocol server at QUIZ_CACHE_LOCATION, shared by all
+#              hosts (requires the redis package)
+# Cached data is invalidated by deleting keys and bumping namespace versions
+# (see quiz_app/caching.py) in the process that changed the data. With
+# 'locmem' the other processes never see that, and keep serving stale
+# category listings and question indexes until the entries expire, so any
+# deployment running more than one process must use 'file' or 'redis'.
+QUIZ_CACHE_BACKEND = os.environ.get('QUIZ_CACHE_BACKEND', 'locmem')
+_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'quiz-app'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', BASE_DIR / '.cache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+if QUIZ_CACHE_BACKEND not in _CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"Unknown QUIZ_CACHE_BACKEND {QUIZ_CACHE_BACKEND!r}")
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',   # Database engine
-        'NAME': BASE_DIR / 'db.sqlite3',          # Database file path
+        'BACKEND': _CACHE_BACKENDS[QUIZ_CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('QUIZ_CACHE_LOCATION', _CACHE_BACKENDS[QUIZ_CACHE_BACKEND][1]),
+        'TIMEOUT': 300,                   # Default timeout in seconds
+        'KEY_PREFIX': 'quiz',
     }
 }
+if QUIZ_CACHE_BACKEND != 'redis':
+    # Quiz bundles, answer keys and charts are cached per attempt
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': 10000}
+
+# Pragmas applied to every new SQLite connection (see quiz_app/db.py)
+QUIZ_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,             # Milliseconds
+    'mmap_size': 128 * 1024 * 1024,    # Bytes
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -134,5 +206,31 @@ INTERNAL_IPS = [
 LOGIN_REDIRECT_URL = 'home'  # After login, redirect to home page
 LOGOUT_REDIRECT_URL = 'home'  # After logout, redirect to home page
 
+# Chart rendering worker pool
+# Number of worker processes rendering the statistics charts (0 renders them in the request thread)
+QUIZ_CHART_WORKERS = int(os.environ.get('QUIZ_CHART_WORKERS', 2))
+# Seconds a chart request waits for its image before answering 504
+QUIZ_CHART_TIMEOUT = int(os.environ.get('QUIZ_CHART_TIMEOUT', 10))
+
+# Quiz state storage (see quiz_app/quiz_state.py)
+# Where the current question index is kept: 'cache', 'lru' (in-process) or 'session'.
+# Only choose 'cache' with a cache shared by every process serving requests
+# (QUIZ_CACHE_BACKEND 'file' or 'redis').
+QUIZ_STATE_BACKEND = os.environ.get('QUIZ_STATE_BACKEND', 'session')
+# Cache alias used by the 'cache' backend
+QUIZ_STATE_CACHE = os.environ.get('QUIZ_STATE_CACHE', 'default')
+# Number of quizzes the 'lru' backend remembers per process
+QUIZ_STATE_LRU_SIZE = int(os.environ.get('QUIZ_STATE_LRU_SIZE', 10000))
+
+# Answer generation API used by fix_placeholder_questions (see quiz_app/answer_api.py)
+# Endpoint URL (empty: the command falls back to its local knowledge base)
+QUIZ_ANSWER_API_URL = os.environ.get('QUIZ_ANSWER_API_URL', '')
+# Bearer token sent with every request (optional)
+QUIZ_ANSWER_API_KEY = os.environ.get('QUIZ_ANSWER_API_KEY', '')
+# Requests per second allowed by the API
+QUIZ_ANSWER_API_RATE = float(os.environ.get('QUIZ_ANSWER_API_RATE', 1.0))
+# Seconds to wait for one response
+QUIZ_ANSWER_API_TIMEOUT = float(os.environ.get('QUIZ_ANSWER_API_TIMEOUT', 10))
+
 # Email settings for password reset (for development)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # Print emails to console in development 
\ No newline at end of file
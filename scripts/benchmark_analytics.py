@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Benchmark loading a user's quiz history for the statistics charts.
+
+Compares the original UserStatsView code (four list comprehensions over a
+select_related queryset, calling attempt.category.name and
+attempt.score_percentage() per row) with quiz_app.analytics.attempt_frame(),
+which loads the columns with values_list() and computes percentages and
+category averages as vectorized operations.
+
+The benchmark runs against a throwaway test database, so the development
+database is never touched.
+
+Usage:
+    python scripts/benchmark_analytics.py
+    python scripts/benchmark_analytics.py --attempts 1000 10000 50000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+import django
+
+# Set up Django environment
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quiz_project.settings')
+django.setup()
+
+import pandas as pd
+from django.contrib.auth.models import User
+from django.db import connection
+from django.utils import timezone
+
+from quiz_app.analytics import attempt_frame
+from quiz_app.models import Category, QuizAttempt
+
+
+def seed_user(num_attempts, categories, batch_size=5000):
+    """Create a user with num_attempts completed quiz attempts."""
+    user = User.objects.create_user(username=f'bench{num_attempts}', password='benchmark')
+    now = timezone.now()
+    for start in range(0, num_attempts, batch_size):
+        attempts = []
+        for i in range(start, min(start + batch_size, num_attempts)):
+            total = random.choice([5, 10, 15, 20])
+            attempts.append(QuizAttempt(
+                user=user,
+                category=random.choice(categories),
+                total_questions=total,
+                score=random.randint(0, total),
+                started_at=now - timedelta(minutes=i),
+                completed_at=now - timedelta(minutes=i) + timedelta(seconds=90),
+            ))
+        # bulk_create skips QuizAttempt.save(), so no UserStats rows are written
+        QuizAttempt.objects.bulk_create(attempts)
+    return user
+
+
+def legacy_load(user):
+    """The original UserStatsView data loading and category grouping."""
+    quiz_attempts = QuizAttempt.objects.filter(
+        user=user,
+        completed_at__isnull=False
+    ).select_related('category')
+    data = {
+        'date': [attempt.completed_at for attempt in quiz_attempts],
+        'category': [attempt.category.name for attempt in quiz_attempts],
+        'score_percentage': [attempt.score_percentage() for attempt in quiz_attempts],
+        'total_questions': [attempt.total_questions for attempt in quiz_attempts]
+    }
+    df = pd.DataFrame(data)
+    return df.groupby('category')['score_percentage'].mean()
+
+
+def vectorized_load(user):
+    """Load and group the same data with the analytics layer."""
+    df = attempt_frame(QuizAttempt.objects.filter(user=user, completed_at__isnull=False))
+    return df.groupby('category')['score_percentage'].mean()
+
+
+def time_call(func, repeat):
+    """Return the median wall time of `repeat` calls to func, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--attempts', type=int, nargs='+', default=[10000],
+                        help='Completed attempts per user to benchmark')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timed repetitions per strategy (median is reported)')
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        categories = [Category.objects.create(name=f'Category {i}') for i in range(8)]
+        print(f"{'attempts':>10} {'legacy ms':>12} {'vectorized ms':>14} {'speedup':>8}")
+        for num_attempts in args.attempts:
+            user = seed_user(num_attempts, categories)
+            legacy = time_call(lambda: legacy_load(user), args.repeat)
+            vectorized = time_call(lambda: vectorized_load(user), args.repeat)
+            print(f'{num_attempts:>10} {legacy:>12.1f} {vectorized:>14.1f} {legacy / vectorized:>7.1f}x')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
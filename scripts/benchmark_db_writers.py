@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Benchmark concurrent quiz submissions against SQLite.
+
+Several worker processes take quizzes at the same time against one SQLite
+file: each answer is recorded the way QuestionView.post records it (a
+response INSERT and a score UPDATE in one transaction), after reading the
+attempt like QuestionView.get does. The script reports the answers per
+second and how many answers failed with "database is locked", once with
+SQLite's default pragmas and once with the tuned QUIZ_SQLITE_PRAGMAS of
+the 'sqlite' database profile.
+
+Every profile runs against a fresh database in a temporary directory, so
+the development database is never touched.
+
+Usage:
+    python scripts/benchmark_db_writers.py
+    python scripts/benchmark_db_writers.py --workers 2 8 --quizzes 20
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# SQLite's behavior without tuning (the sqlite3 module waits 5 s for a lock)
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'busy_timeout': 5000,
+    'mmap_size': 0,
+}
+
+QUESTIONS_PER_QUIZ = 10
+
+
+def setup_django(db_path, pragmas):
+    """Set Django up in this process against db_path with the given pragmas."""
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'quiz_project.settings'
+    os.environ['QUIZ_DB_PROFILE'] = 'sqlite'
+    os.environ['SQLITE_PATH'] = db_path
+
+    import django
+    from django.conf import settings
+    django.setup()
+    settings.QUIZ_SQLITE_PRAGMAS = pragmas
+
+
+def prepare(db_path, pragmas):
+    """Create the schema and one category of questions."""
+    setup_django(db_path, pragmas)
+    from django.core.management import call_command
+    from quiz_app.models import Category, Choice, Question
+
+    call_command('migrate', verbosity=0)
+    category = Category.objects.create(name='Benchmark')
+    questions = Question.objects.bulk_create([
+        Question(category=category, text=f'Question {i}') for i in range(QUESTIONS_PER_QUIZ)
+    ])
+    Choice.objects.bulk_create([
+        Choice(question=question, text=f'Choice {i}', is_correct=(i == 0))
+        for question in questions for i in range(4)
+    ])
+    Question.link_correct_choices()
+
+
+def take_quizzes(db_path, pragmas, num_quizzes, start_event, results):
+    """Worker: take num_quizzes quizzes and report (answers, lock errors)."""
+    setup_django(db_path, pragmas)
+    from django.db import OperationalError, connection
+    from quiz_app.models import Category, Question, QuizAttempt, QuizResponse
+
+    category = Category.objects.get()
+    answer_key = dict(Question.objects.values_list('id', 'correct_choice_id'))
+    connection.ensure_connection()
+    start_event.wait()
+
+    answered = locked = 0
+    for _ in range(num_quizzes):
+        try:
+            attempt = QuizAttempt.objects.create(category=category, total_questions=len(answer_key))
+        except OperationalError:
+            locked += 1
+            continue
+        for question_id, choice_id in answer_key.items():
+            try:
+                QuizAttempt.objects.get(pk=attempt.pk)
+                QuizResponse(
+                    quiz_attempt_id=attempt.pk,
+                    question_id=question_id,
+                    selected_choice_id=choice_id,
+                    is_correct=True,
+                ).save(graded=True)
+                answered += 1
+            except OperationalError:
+                locked += 1
+    results.put((answered, locked))
+
+
+def run_profile(pragmas, workers, num_quizzes):
+    """Run the workers against a fresh database; return (answers/s, lock errors)."""
+    ctx = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.sqlite3')
+        setup = ctx.Process(target=prepare, args=(db_path, pragmas))
+        setup.start()
+        setup.join()
+
+        start_event = ctx.Event()
+        results = ctx.Queue()
+        processes = [
+            ctx.Process(target=take_quizzes, args=(db_path, pragmas, num_quizzes, start_event, results))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        # Give the workers time to import Django before the clock starts
+        time.sleep(3)
+        started = time.perf_counter()
+        start_event.set()
+        totals = [results.get() for _ in processes]
+        elapsed = time.perf_counter() - started
+        for process in processes:
+            process.join()
+
+    answered = sum(a for a, _ in totals)
+    locked = sum(errors for _, errors in totals)
+    return answered / elapsed, locked
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8],
+                        help='Numbers of concurrent writer processes to benchmark')
+    parser.add_argument('--quizzes', type=int, default=20,
+                        help=f'Quizzes ({QUESTIONS_PER_QUIZ} answers each) taken per worker')
+    args = parser.parse_args()
+
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quiz_project.settings')
+    from quiz_project.settings import QUIZ_SQLITE_PRAGMAS
+
+    profiles = [('default', DEFAULT_PRAGMAS), ('tuned', QUIZ_SQLITE_PRAGMAS)]
+    print(f"{'workers':>8} {'profile':<10} {'answers/s':>10} {'locked':>8}")
+    for workers in args.workers:
+        for label, pragmas in profiles:
+            rate, locked = run_profile(pragmas, workers, args.quizzes)
+            print(f'{workers:>8} {label:<10} {rate:>10.1f} {locked:>8}')
+
+
+if __name__ == '__main__':
+    main()
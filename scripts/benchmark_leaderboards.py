@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Benchmark leaderboard lookups against the number of ranked users.
+
+Compares computing the all-time leaderboard from QuizAttempt rows (a
+GROUP BY over every completed attempt per request) with the materialized
+LeaderboardEntry and LeaderboardBucket rows:
+- top: the top 10 users
+- rank: the rank of a user with median points
+- record: adding a completed attempt to the four leaderboards it counts
+  towards (LeaderboardEntry.record_attempt)
+
+The benchmark runs against a throwaway test database, emptied between
+sizes, so the development database is never touched.
+
+Usage:
+    python scripts/benchmark_leaderboards.py
+    python scripts/benchmark_leaderboards.py --sizes 1000 100000 --repeat 3
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import django
+
+# Set up Django environment
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quiz_project.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from quiz_app.models import Category, LeaderboardBucket, LeaderboardEntry, QuizAttempt
+
+
+def seed_users(size, batch_size=10000):
+    """
+    Create `size` users with one completed attempt each, and their all-time leaderboard entries.
+    
+    Points follow a skewed distribution, as real quiz activity does. Returns
+    the category and the median points.
+    """
+    category = Category.objects.create(name='Benchmark')
+    now = timezone.now()
+    rng = random.Random(size)
+    points = sorted(int(rng.paretovariate(1.5) * 10) for _ in range(size))
+    rng.shuffle(points)
+    for start in range(0, size, batch_size):
+        stop = min(start + batch_size, size)
+        users = User.objects.bulk_create([User(username=f'bench{i}') for i in range(start, stop)])
+        QuizAttempt.objects.bulk_create([
+            QuizAttempt(user=user, category=category, score=score, total_questions=score,
+                        started_at=now, completed_at=now)
+            for user, score in zip(users, points[start:stop])
+        ])
+        LeaderboardEntry.objects.bulk_create([
+            LeaderboardEntry(user=user, period=LeaderboardEntry.ALL_TIME, points=score, updated_at=now)
+            for user, score in zip(users, points[start:stop])
+        ])
+    LeaderboardBucket.recount()
+    return category, statistics.median_low(points)
+
+
+def reset():
+    """Empty the tables seed_users fills."""
+    models = [LeaderboardBucket, LeaderboardEntry, QuizAttempt, User, Category]
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(f'DELETE FROM {model._meta.db_table}')
+
+
+def naive_points():
+    """Users' all-time points, aggregated from their attempts."""
+    return QuizAttempt.objects.filter(
+        completed_at__isnull=False, user__isnull=False
+    ).values('user_id').annotate(points=Sum('score')).order_by()
+
+
+def naive_top():
+    """The top 10 users, aggregated from attempts."""
+    return list(naive_points().order_by('-points')[:10])
+
+
+def naive_rank(points):
+    """The rank of a user with `points`, aggregated from attempts."""
+    return naive_points().filter(points__gt=points).count() + 1
+
+
+def time_call(func, repeat):
+    """Return the median wall time of `repeat` calls to func, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def record_one(category):
+    """Complete one more attempt for a random user, rolled back afterwards."""
+    user_id = User.objects.order_by('?').values_list('pk', flat=True).first()
+    attempt = QuizAttempt(user_id=user_id, category=category, score=5, completed_at=timezone.now())
+    with transaction.atomic():
+        start = time.perf_counter()
+        LeaderboardEntry.record_attempt(attempt)
+        elapsed = time.perf_counter() - start
+        transaction.set_rollback(True)
+    return elapsed
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000],
+                        help='Numbers of ranked users to benchmark')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timed repetitions per lookup (median is reported)')
+    args = parser.parse_args()
+
+    print(f"{'users':>10} {'naive top ms':>14} {'naive rank ms':>14} "
+          f"{'top ms':>10} {'rank ms':>10} {'record ms':>10}")
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        for size in args.sizes:
+            reset()
+            category, median = seed_users(size)
+            user_id = LeaderboardEntry.objects.filter(points=median).values_list('user_id', flat=True)[0]
+
+            top_naive = time_call(naive_top, args.repeat)
+            rank_naive = time_call(lambda: naive_rank(median), args.repeat)
+            top = time_call(lambda: LeaderboardEntry.top(limit=10), args.repeat)
+            rank = time_call(lambda: LeaderboardEntry.standing(user_id), args.repeat)
+            record = statistics.median(record_one(category) for _ in range(args.repeat)) * 1000
+
+            print(f'{size:>10} {top_naive:>14.2f} {rank_naive:>14.2f} '
+                  f'{top:>10.3f} {rank:>10.3f} {record:>10.3f}')
+    finally:
+        cache.clear()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
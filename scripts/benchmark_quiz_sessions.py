@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+"""
+Load-test full quiz sessions against a local server.
+
+Starts the quiz site in a separate server process (Django's threaded WSGI
+server, as used by runserver) on a fresh SQLite database in a temporary
+directory, seeded with categories, questions and one user per simulated
+user. The simulated users log in, then take quizzes concurrently over
+HTTP, each session going:
+
+    index -> start -> (question -> answer) x N -> complete -> results -> stats
+
+Every request is timed on the client. The script prints the requests per
+second and the p50/p95/p99 latency of each endpoint, and saves them as
+JSON (with the git commit and the settings of the run), so runs can be
+compared across commits with --compare.
+
+The server runs with DEBUG off, so the debug toolbar and query logging do
+not distort the numbers. The simulated users are threads of this process;
+with many users, run the client on a separate machine or compare runs with
+the same --users. The development database is never touched.
+
+Usage:
+    python scripts/benchmark_quiz_sessions.py
+    python scripts/benchmark_quiz_sessions.py --users 20 --sessions 5
+    python scripts/benchmark_quiz_sessions.py --compare loadtest-1ce674c-20261018-093000.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urlsplit
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, build_opener
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+PASSWORD = 'loadtest-password'
+
+# Timed endpoints in session order, with the status code each should answer with
+ENDPOINTS = {
+    'index': 200,
+    'start': 302,
+    'question': 200,
+    'answer': 302,
+    'complete': 302,
+    'results': 200,
+    'stats': 200,
+}
+
+CHOICE_RE = re.compile(r'name="choice" id="choice_\d+" value="(\d+)"')
+
+
+def serve(db_path, options, ready):
+    """Server process: seed a database at db_path and serve the site on a free port."""
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'quiz_project.settings'
+    os.environ['QUIZ_DB_PROFILE'] = 'sqlite'
+    os.environ['SQLITE_PATH'] = db_path
+
+    import logging
+
+    import django
+    from django.conf import settings
+    django.setup()
+    # Measure the site, not the debug toolbar and DEBUG query logging
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
+
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+
+    from quiz_app.importing import QuestionImporter
+    from quiz_app.models import Category, UserProfile
+
+    call_command('migrate', verbosity=0)
+    importer = QuestionImporter()
+    categories = []
+    for c in range(options['categories']):
+        category = Category.objects.create(name=f'Load test {c}')
+        categories.append(category.pk)
+        for q in range(options['questions_per_category']):
+            importer.add(category, f'Load test question {c}.{q}', [
+                (f'Choice {i}', i == 0) for i in range(4)
+            ])
+    importer.finish()
+
+    # One password hash for everyone; hashing it per user would dominate the setup
+    password = make_password(PASSWORD)
+    users = User.objects.bulk_create([
+        User(username=f'loadtest{i}', password=password) for i in range(options['users'])
+    ])
+    UserProfile.objects.bulk_create([UserProfile(user=user) for user in users])
+
+    class LoadTestServer(ThreadedWSGIServer):
+        # runserver's listen backlog of 10 would refuse bursts of concurrent users
+        request_queue_size = 128
+
+    httpd = LoadTestServer(('127.0.0.1', 0), WSGIRequestHandler)
+    httpd.set_app(get_wsgi_application())
+    # Only log failed requests (get_wsgi_application configures logging again)
+    logging.getLogger('django.server').setLevel(logging.WARNING)
+    ready.put((httpd.server_port, categories))
+    httpd.serve_forever()
+
+
+class NoRedirect(HTTPRedirectHandler):
+    """Return redirects to the caller instead of following them, so each request is timed alone."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class SessionError(Exception):
+    """A simulated user got a response it cannot continue the session from."""
+
+
+class SimulatedUser:
+    """One user with its own cookies (session and CSRF), taking quizzes over HTTP."""
+
+    def __init__(self, base_url, username, record, timeout=30):
+        self.base_url = base_url
+        self.username = username
+        self.record = record
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies), NoRedirect)
+
+    def csrf_token(self):
+        """Return the CSRF cookie set by the last page with a form."""
+        for cookie in self.cookies:
+            if cookie.name == 'csrftoken':
+                return cookie.value
+        return ''
+
+    def fetch(self, path, data=None):
+        """Send one request (a form POST if data is given) and return (status, headers, body)."""
+        body = None
+        if data is not None:
+            body = urlencode({**data, 'csrfmiddlewaretoken': self.csrf_token()}).encode()
+        try:
+            with self.opener.open(self.base_url + path, body, self.timeout) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as error:
+            return error.code, error.headers, error.read()
+
+    def request(self, endpoint, path, data=None):
+        """
+        Send one request to an endpoint, record its latency, and return (location, body).
+
+        Raises SessionError if the status is not the one expected of the endpoint.
+        """
+        started = time.perf_counter()
+        try:
+            status, headers, content = self.fetch(path, data)
+        except (URLError, OSError) as error:
+            self.record(endpoint, time.perf_counter() - started, False)
+            raise SessionError(f'{endpoint}: {error}') from error
+        ok = status == ENDPOINTS[endpoint]
+        self.record(endpoint, time.perf_counter() - started, ok)
+        if not ok:
+            raise SessionError(f'{endpoint}: HTTP {status}')
+        return headers.get('Location'), content.decode('utf-8', 'replace')
+
+    def log_in(self):
+        """Log in through the login form (untimed: password hashing would swamp the results)."""
+        self.fetch('/accounts/login/')
+        status, _, _ = self.fetch('/accounts/login/', {'username': self.username, 'password': PASSWORD})
+        if status != 302:
+            raise SessionError(f'login: HTTP {status}')
+
+    def take_quiz(self, category_id, questions):
+        """Take one quiz, answering every question at random, and look at the results and stats."""
+        self.request('index', '/quiz/')
+        self.request('start', '/quiz/start/', {
+            'category': category_id, 'num_questions': questions, 'time_limit': 0,
+        })
+        for _ in range(questions):
+            _, page = self.request('question', '/quiz/question/')
+            choices = CHOICE_RE.findall(page)
+            if not choices:
+                raise SessionError('question: no choices on the page')
+            self.request('answer', '/quiz/question/', {'choice': random.choice(choices)})
+        location, _ = self.request('complete', '/quiz/question/')
+        self.request('results', urlsplit(location).path)
+        self.request('stats', '/quiz/stats/')
+
+
+def percentile(ordered, p):
+    """Return the p-th percentile (nearest rank) of an ascending list."""
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples, duration):
+    """Return request counts, throughput and latency percentiles (ms) for some samples."""
+    latencies = sorted(seconds * 1000 for seconds, _ in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for _, ok in samples if not ok),
+        'rps': len(samples) / duration if duration else 0,
+        'mean_ms': sum(latencies) / len(latencies) if latencies else None,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+    }
+
+
+def git_commit():
+    """Return the short hash of the checked-out commit, or 'unknown'."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def format_ms(value):
+    """Format a latency in milliseconds for the results table."""
+    return f'{value:>9.1f}' if value is not None else f"{'-':>9}"
+
+
+def print_report(report, baseline=None):
+    """Print the per-endpoint table, with the change against a baseline report if given."""
+    header = f"{'endpoint':<10} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    if baseline:
+        header += f" {'p95 vs ' + baseline['commit']:>16}"
+    print(header)
+    rows = list(report['endpoints'].items()) + [('total', report['total'])]
+    for name, stats in rows:
+        line = (f"{name:<10} {stats['requests']:>9} {stats['errors']:>7} {stats['rps']:>9.1f} "
+                f"{format_ms(stats['p50_ms'])} {format_ms(stats['p95_ms'])} {format_ms(stats['p99_ms'])}")
+        if baseline:
+            old = baseline['endpoints'].get(name, baseline['total'] if name == 'total' else None)
+            if old and old['p95_ms'] and stats['p95_ms'] is not None:
+                line += f" {(stats['p95_ms'] / old['p95_ms'] - 1) * 100:>+15.1f}%"
+        print(line)
+    sessions = report['sessions']
+    print(f"\n{sessions['completed']} sessions completed, {sessions['failed']} failed "
+          f"in {report['duration_s']:.1f}s ({sessions['completed'] / report['duration_s']:.2f} sessions/s)")
+
+
+def main():
+    """Run the load test, print a results table and save it as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=10,
+                        help='Number of concurrent simulated users')
+    parser.add_argument('--sessions', type=int, default=3,
+                        help='Quizzes taken by each user')
+    parser.add_argument('--questions', type=int, default=20,
+                        help='Questions per quiz (5-20)')
+    parser.add_argument('--categories', type=int, default=5,
+                        help='Number of seeded categories')
+    parser.add_argument('--questions-per-category', type=int, default=200,
+                        help='Number of seeded questions per category')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed for the categories and choices picked')
+    parser.add_argument('--output',
+                        help='Results file (default: loadtest-<commit>-<time>.json)')
+    parser.add_argument('--compare',
+                        help='Results file of an earlier run to compare p95 latencies with')
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    ctx = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        ready = ctx.Queue()
+        server = ctx.Process(target=serve, args=(
+            os.path.join(tmp, 'loadtest.sqlite3'),
+            {
+                'users': args.users,
+                'categories': args.categories,
+                'questions_per_category': max(args.questions_per_category, args.questions),
+            },
+            ready,
+        ), daemon=True)
+        server.start()
+        try:
+            port, categories = ready.get(timeout=300)
+            base_url = f'http://127.0.0.1:{port}'
+
+            # Warm the server's caches with one untimed session
+            warmup = SimulatedUser(base_url, 'loadtest0', lambda *sample: None)
+            warmup.log_in()
+            warmup.take_quiz(categories[0], args.questions)
+
+            lock = threading.Lock()
+            samples = {name: [] for name in ENDPOINTS}
+            outcomes = {'completed': 0, 'failed': 0}
+
+            def record(endpoint, seconds, ok):
+                samples[endpoint].append((seconds, ok))
+
+            users = [SimulatedUser(base_url, f'loadtest{i}', record) for i in range(args.users)]
+            with ThreadPoolExecutor(max_workers=args.users) as pool:
+                list(pool.map(SimulatedUser.log_in, users))
+
+            def run_user(user):
+                for _ in range(args.sessions):
+                    try:
+                        user.take_quiz(random.choice(categories), args.questions)
+                        outcome = 'completed'
+                    except SessionError as error:
+                        print(f'{user.username}: {error}', file=sys.stderr)
+                        outcome = 'failed'
+                    with lock:
+                        outcomes[outcome] += 1
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.users) as pool:
+                list(pool.map(run_user, users))
+            duration = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.join()
+
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'users': args.users,
+            'sessions': args.sessions,
+            'questions': args.questions,
+            'categories': args.categories,
+            'questions_per_category': args.questions_per_category,
+            'seed': args.seed,
+        },
+        'duration_s': duration,
+        'sessions': outcomes,
+        'endpoints': {name: summarize(endpoint_samples, duration)
+                      for name, endpoint_samples in samples.items()},
+        'total': summarize([sample for values in samples.values() for sample in values], duration),
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    output = args.output or f"loadtest-{report['commit']}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Results saved to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Benchmark random question sampling for QuizStartView.
+
+Compares the original approach (load every Question row of the category and
+call random.sample) with quiz_app.sampling:
+- miss: a draw with no ID index cached, which builds the index first
+- index: O(k) draws from the cached per-category ID index
+
+The benchmark runs against a throwaway test database, so the development
+database is never touched.
+
+Usage:
+    python scripts/benchmark_sampling.py
+    python scripts/benchmark_sampling.py --sizes 1000 100000 --draws 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import django
+
+# Set up Django environment
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quiz_project.settings')
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection
+
+from quiz_app.models import Category, Question
+from quiz_app.sampling import invalidate_question_index, sample_question_ids
+
+QUESTION_TEXT = 'Which of the following statements about this topic is correct? ' * 2
+EXPLANATION_TEXT = 'The correct answer follows from the definition given in chapter one. ' * 4
+
+
+def seed_category(size, batch_size=5000):
+    """Create a category holding `size` questions with realistic text lengths."""
+    category = Category.objects.create(name=f'Benchmark {size}')
+    for start in range(0, size, batch_size):
+        Question.objects.bulk_create([
+            Question(category=category, text=f'{QUESTION_TEXT}{i}', explanation=EXPLANATION_TEXT)
+            for i in range(start, min(start + batch_size, size))
+        ])
+    return category
+
+
+def legacy_sample(category, num_questions):
+    """The original QuizStartView sampling code."""
+    questions = list(Question.objects.filter(category=category))
+    if len(questions) > num_questions:
+        questions = random.sample(questions, num_questions)
+    return [q.id for q in questions]
+
+
+def sample_cold(category, num_questions):
+    """Draw questions with no ID index cached."""
+    invalidate_question_index(category.id)
+    return sample_question_ids(category.id, num_questions)
+
+
+def time_call(func, repeat):
+    """Return the median wall time of `repeat` calls to func, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000],
+                        help='Category sizes (number of questions) to benchmark')
+    parser.add_argument('--draws', type=int, default=20,
+                        help='Number of questions drawn per quiz')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timed repetitions per strategy (median is reported)')
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f"{'questions':>10} {'legacy ms':>12} {'miss ms':>12} {'index ms':>12}")
+        for size in args.sizes:
+            category = seed_category(size)
+            invalidate_question_index(category.id)
+
+            legacy = time_call(lambda: legacy_sample(category, args.draws), args.repeat)
+            miss = time_call(lambda: sample_cold(category, args.draws), args.repeat)
+            indexed = time_call(lambda: sample_question_ids(category.id, args.draws), args.repeat)
+
+            print(f'{size:>10} {legacy:>12.2f} {miss:>12.2f} {indexed:>12.3f}')
+    finally:
+        cache.clear()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
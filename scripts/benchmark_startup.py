@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Benchmark Django startup time for the Quiz application.
+
+Each run starts a fresh Python process that calls django.setup() and then
+resolves the main quiz URLs (which imports the URLconf and every view
+module), the same work a worker does before serving its first request.
+The script reports the median wall time, the peak memory of the process and
+whether pandas, matplotlib or seaborn were loaded along the way.
+
+Pass --baseline with a git ref (e.g. a commit from before the analytics code
+was made lazy) to measure that tree side by side with the working tree.
+
+Usage:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --baseline HEAD~1 --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Code run in each child process; prints one JSON line of measurements
+PROBE = '''
+import json, os, resource, sys, time
+start = time.perf_counter()
+import django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quiz_project.settings')
+django.setup()
+from django.urls import resolve
+for url in ['/quiz/', '/quiz/question/', '/quiz/results/1/', '/quiz/stats/']:
+    resolve(url)
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'seconds': elapsed,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'heavy_modules': sorted(m for m in ('pandas', 'matplotlib', 'seaborn') if m in sys.modules),
+}))
+'''
+
+
+def measure(project_dir, runs):
+    """Run the startup probe `runs` times in project_dir and summarize it."""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE], cwd=project_dir,
+            capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'median_ms': statistics.median(s['seconds'] for s in samples) * 1000,
+        'max_rss_mb': statistics.median(s['max_rss_mb'] for s in samples),
+        'heavy_modules': samples[0]['heavy_modules'],
+    }
+
+
+def export_ref(ref, target):
+    """Write the tree of git ref into target."""
+    archive = subprocess.run(
+        ['git', 'archive', '--format=tar', ref], cwd=PROJECT_DIR,
+        capture_output=True, check=True
+    ).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(target)
+
+
+def report(label, result):
+    """Print one result row."""
+    modules = ', '.join(result['heavy_modules']) or '-'
+    print(f"{label:<20} {result['median_ms']:>10.1f} {result['max_rss_mb']:>10.1f}   {modules}")
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Fresh processes started per tree (median is reported)')
+    parser.add_argument('--baseline', metavar='REF',
+                        help='Git ref to measure alongside the working tree')
+    args = parser.parse_args()
+
+    print(f"{'tree':<20} {'startup ms':>10} {'rss MB':>10}   heavy modules loaded")
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as baseline_dir:
+            export_ref(args.baseline, baseline_dir)
+            report(args.baseline, measure(baseline_dir, args.runs))
+    report('working tree', measure(PROJECT_DIR, args.runs))
+
+
+if __name__ == '__main__':
+    main()